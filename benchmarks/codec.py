@@ -0,0 +1,74 @@
+"""
+Compares the JSON codecs in `tastytrade_sdk.market_data.codec` on FEED_DATA frames: the time per event to decode a
+frame, and to decode it and build the models, the way a subscription does.
+
+Frames come from a recording made with `FrameRecorder` if a path is given, and are synthesized otherwise.
+
+    poetry run python -m benchmarks.codec [recording]
+"""
+import sys
+import time
+from typing import List
+
+from tastytrade_sdk.market_data.codec import CODECS, available, get_codec
+from tastytrade_sdk.market_data.dxlink import DxLinkProtocol
+from tastytrade_sdk.market_data.recording import read_frames
+from tastytrade_sdk.market_data.replay import IdentityTranslations
+
+SYMBOLS = 500
+EVENTS_PER_FRAME = 100
+FRAMES = 2_000
+REPEAT = 5
+
+
+def _synthetic_frames() -> List[str]:
+    codec = get_codec('ujson')
+    frames = []
+    for frame in range(FRAMES):
+        quotes, trades, greeks = [], [], []
+        for i in range(EVENTS_PER_FRAME // 3):
+            symbol = f'.SPY2401{frame % 20:02d}C{400 + (frame * EVENTS_PER_FRAME + i) % SYMBOLS}'
+            time_ms = 1_700_000_000_000 + frame
+            quotes += ['Quote', symbol, 1.25 + i / 100, 10.0, 'C', 1.3 + i / 100, 12.0, 'X']
+            trades += ['Trade', symbol, time_ms, i, 'Q', 1.27, 0.05, 1.0, False, 19700, 1000.0, 'NaN']
+            greeks += ['Greeks', symbol, time_ms, 1.27, 0.21, 0.45, 0.02, -0.05, 0.01, 0.12]
+        frames.append(codec.dumps({'type': 'FEED_DATA', 'channel': 1,
+                                   'data': ['Quote', quotes, 'Trade', trades, 'Greeks', greeks]}))
+    return frames
+
+
+def _microseconds_per_event(run, frames: List[str], events: int) -> float:
+    best = float('inf')
+    for _ in range(REPEAT):
+        started_at = time.perf_counter()
+        for raw in frames:
+            run(raw)
+        best = min(best, time.perf_counter() - started_at)
+    return best / events * 1e6
+
+
+def main():
+    if len(sys.argv) > 1:
+        frames = [raw for _, raw in read_frames(sys.argv[1]) if '"FEED_DATA"' in raw]
+    else:
+        frames = _synthetic_frames()
+    event_types = ['Profile', 'Quote', 'Summary', 'Trade', 'Greeks']
+    events = sum(len(DxLinkProtocol(IdentityTranslations(), event_types).handle(raw)[1]) for raw in frames)
+    print(f'{len(frames):,} frames, {events:,} events')
+    results = {}
+    for name in filter(available, CODECS):
+        codec = get_codec(name)
+        protocol = DxLinkProtocol(IdentityTranslations(), event_types, codec=codec)
+        results[name] = (_microseconds_per_event(codec.loads, frames, events),
+                         _microseconds_per_event(protocol.handle, frames, events))
+    baseline = results['ujson'][1]
+    print(f'{"codec":<10}{"decode µs/event":>18}{"+ models µs/event":>20}{"vs ujson":>10}')
+    for name, (decode, total) in results.items():
+        print(f'{name:<10}{decode:>18.3f}{total:>20.3f}{baseline / total:>9.2f}x')
+    unavailable = [name for name in CODECS if not available(name)]
+    if unavailable:
+        print(f'Not installed: {", ".join(unavailable)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Compares the slotted event models against the dict-backed dataclasses they replaced: how many events per second can
+be built from decoded feed values, and how much memory each event takes.
+
+    poetry run python -m benchmarks.models
+"""
+import datetime as dt
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from math import isnan
+from typing import Callable, List, Optional
+
+from tastytrade_sdk.market_data.models import Quote, Trade, Greeks, FrozenQuote
+
+EVENTS = 100_000
+
+
+def _legacy_float(value):
+    if isinstance(value, str):
+        return float(value) if value.isnumeric() else None
+    if value is None:
+        return None
+    return None if isnan(value) else value
+
+
+@dataclass
+class LegacyQuote:
+    symbol: str
+    bid_price: Optional[float]
+    bid_size: Optional[float]
+    bid_exchange_code: Optional[str]
+    ask_price: Optional[float]
+    ask_size: Optional[float]
+    ask_exchange_code: Optional[str]
+
+    def __init__(self, symbol, bid_price, bid_size, bid_exchange_code, ask_price, ask_size, ask_exchange_code):
+        self.symbol = symbol
+        self.bid_price = _legacy_float(bid_price)
+        self.bid_size = _legacy_float(bid_size)
+        self.bid_exchange_code = bid_exchange_code
+        self.ask_price = _legacy_float(ask_price)
+        self.ask_size = _legacy_float(ask_size)
+        self.ask_exchange_code = ask_exchange_code
+
+
+@dataclass
+class LegacyTrade:
+    symbol: str
+    eventSymbol: str
+    time: dt.datetime
+    sequence: int
+    exchangeCode: str
+    price: Optional[float]
+    change: Optional[float]
+    size: int
+    extendedTradingHours: bool
+    dayId: int
+    dayVolume: int
+    dayTurnover: Optional[float]
+
+    def __init__(self, symbol, eventSymbol, time, sequence, exchangeCode, price, change, size, extendedTradingHours,
+                 dayId, dayVolume, dayTurnover):
+        self.symbol = symbol
+        self.eventSymbol = eventSymbol
+        self.time = dt.datetime.utcfromtimestamp(time / 1000)
+        self.sequence = sequence
+        self.exchangeCode = exchangeCode
+        self.price = _legacy_float(price)
+        self.change = _legacy_float(change)
+        self.size = size
+        self.extendedTradingHours = extendedTradingHours
+        self.dayId = dayId
+        self.dayVolume = dayVolume
+        self.dayTurnover = _legacy_float(dayTurnover)
+
+
+@dataclass
+class LegacyGreeks:
+    symbol: str
+    time: int
+    price: Optional[float]
+    volatility: Optional[float]
+    delta: Optional[float]
+    gamma: Optional[float]
+    theta: Optional[float]
+    rho: Optional[float]
+    vega: Optional[float]
+
+    def __init__(self, symbol, time, price, volatility, delta, gamma, theta, rho, vega):
+        self.symbol = symbol
+        self.time = time
+        self.price = _legacy_float(price)
+        self.volatility = _legacy_float(volatility)
+        self.delta = _legacy_float(delta)
+        self.gamma = _legacy_float(gamma)
+        self.theta = _legacy_float(theta)
+        self.rho = _legacy_float(rho)
+        self.vega = _legacy_float(vega)
+
+
+QUOTE_ARGS = ['SPY   230630C00255000', 1.25, 10.0, 'C', 1.3, 12.0, 'X']
+TRADE_ARGS = ['SPY', 'SPY', 1688140800000, 0, 'Q', 440.25, 1.5, 100, False, 19538, 1_000_000, 4.4e8]
+GREEKS_ARGS = ['SPY   230630C00255000', 1688140800000, 1.27, 0.21, 0.45, 0.02, -0.05, 0.01, 0.12]
+
+
+def _events_per_second(model: Callable, args: List) -> float:
+    seconds = min(timeit.repeat(lambda: model(*args), number=EVENTS, repeat=5))
+    return EVENTS / seconds
+
+
+def _bytes_per_event(model: Callable, args: List) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    events = [model(*args) for _ in range(EVENTS)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the events costs a pointer per event in both cases, so leave it out
+    return (after - before) / len(events) - 8
+
+
+def main():
+    print(f'{"model":<14}{"events/sec":>14}{"bytes/event":>14}')
+    for name, model, args in (
+            ('LegacyQuote', LegacyQuote, QUOTE_ARGS), ('Quote', Quote, QUOTE_ARGS),
+            ('FrozenQuote', FrozenQuote, QUOTE_ARGS),
+            ('LegacyTrade', LegacyTrade, TRADE_ARGS), ('Trade', Trade, TRADE_ARGS),
+            ('LegacyGreeks', LegacyGreeks, GREEKS_ARGS), ('Greeks', Greeks, GREEKS_ARGS)):
+        print(f'{name:<14}{_events_per_second(model, args):>14,.0f}{_bytes_per_event(model, args):>14,.0f}')
+
+
+if __name__ == '__main__':
+    main()
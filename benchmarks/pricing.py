@@ -0,0 +1,68 @@
+"""
+Times repricing whole option chains with `tastytrade_sdk.option_chains.pricing.ChainPricer`, the way every underlying
+tick does, against pricing their contracts one at a time with the same formulas.
+
+    poetry run python -m benchmarks.pricing
+"""
+import datetime as dt
+import time
+
+import numpy as np
+
+from tastytrade_sdk.market_data.models import Greeks
+from tastytrade_sdk.option_chains.option_chain import OptionChain
+from tastytrade_sdk.option_chains.pricing import ChainPricer, price_options
+
+EXPIRATIONS = (10, 20, 40)
+STRIKES = (50, 200, 500)
+REPEAT = 20
+
+
+def _chain(expirations: int, strikes: int) -> OptionChain:
+    first = dt.date(2030, 1, 4)
+    nested_expirations = []
+    for e in range(expirations):
+        date = first + dt.timedelta(weeks=e)
+        code = date.strftime('%y%m%d')
+        nested_expirations.append({
+            'expiration-date': date.isoformat(), 'days-to-expiration': 7 * (e + 1),
+            'strikes': [{'strike-price': str(400 + s), 'call': f'SPY   {code}C{(400 + s) * 1000:08d}',
+                         'put': f'SPY   {code}P{(400 + s) * 1000:08d}'} for s in range(strikes)]
+        })
+    return OptionChain.from_nested({'underlying-symbol': 'SPY', 'root-symbol': 'SPY',
+                                    'expirations': nested_expirations})
+
+
+def _seconds(run) -> float:
+    best = float('inf')
+    for _ in range(REPEAT):
+        started_at = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def _benchmark(chain: OptionChain, now: dt.datetime):
+    pricer = ChainPricer(chain, rate=0.05)
+    for symbol in pricer.symbols:
+        pricer.update_greeks(Greeks(symbol, 0, None, 0.2, None, None, None, None, None))
+    contracts = len(pricer.symbols)
+    vectorized = _seconds(lambda: pricer.reprice(500.0, now))
+    years = np.linspace(0.02, 1, contracts)
+    sample = range(0, contracts, max(contracts // 200, 1))
+    one_at_a_time = _seconds(lambda: [price_options(500.0, pricer.strikes[i], years[i], 0.2, pricer.is_call[i], 0.05)
+                                      for i in sample]) * contracts / len(sample)
+    return contracts, vectorized, one_at_a_time
+
+
+def main():
+    now = dt.datetime(2030, 1, 1, tzinfo=dt.timezone.utc)
+    print(f'{"contracts":>10}{"chain µs":>12}{"ns/contract":>14}{"one at a time µs":>19}{"speedup":>10}')
+    for expirations, strikes in zip(EXPIRATIONS, STRIKES):
+        contracts, vectorized, one_at_a_time = _benchmark(_chain(expirations, strikes), now)
+        print(f'{contracts:>10,}{vectorized * 1e6:>12.1f}{vectorized / contracts * 1e9:>14.1f}'
+              f'{one_at_a_time * 1e6:>19.1f}{one_at_a_time / vectorized:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
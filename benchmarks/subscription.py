@@ -0,0 +1,124 @@
+"""
+Streams synthetic Quote, Trade and Greeks events from a local stand-in DXLink server (see
+`tests/market_data/dxlink_server.py`) through a `Subscription`, and reports sustained throughput, end-to-end latency
+percentiles, CPU time per event and memory growth.
+
+The server runs in its own process, so that its CPU time and the GIL don't count against the subscription.
+Latency is measured from the `time` the server stamps on Trade and Greeks events to when their handler runs.
+
+    poetry run python -m benchmarks.subscription
+"""
+import multiprocessing
+import os
+import resource
+import time
+from array import array
+from typing import List, NamedTuple, Optional
+
+from tastytrade_sdk import Subscription
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+
+WARMUP_SECONDS = 1
+DURATION_SECONDS = 5
+
+
+class Scenario(NamedTuple):
+    name: str
+    symbols: int
+    rate: Optional[float]
+    """Events per second offered by the server. `None` sends as fast as the subscription can take them."""
+    events_per_frame: int
+
+
+SCENARIOS = [
+    Scenario('steady 10k/s', 500, 10_000, 50),
+    Scenario('steady 50k/s', 2_000, 50_000, 200),
+    Scenario('max, small frames', 500, None, 10),
+    Scenario('max, large frames', 5_000, None, 500),
+]
+
+
+def _serve(rate: Optional[float], events_per_frame: int, urls: multiprocessing.Queue) -> None:
+    # pylint: disable=import-outside-toplevel
+    from tests.market_data.dxlink_server import DxLinkServer
+    server = DxLinkServer(rate=rate, events_per_frame=events_per_frame).start()
+    urls.put(server.url)
+    server.stopped.wait()
+
+
+def _resident_bytes() -> int:
+    try:
+        with open('/proc/self/statm', encoding='utf-8') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # Only the peak is available elsewhere, which still shows growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    return values[min(int(len(values) * percentile), len(values) - 1)] if values else float('nan')
+
+
+class _Counter:
+    def __init__(self):
+        self.events = 0
+        # Doubles rather than a list of floats, so that the measurement itself barely adds to memory growth
+        self.latencies_ms = array('d')
+        self.measuring = False
+
+    def on_quote(self, _) -> None:
+        self.events += 1
+
+    def on_greeks(self, greeks) -> None:
+        self.events += 1
+        if self.measuring:
+            self.latencies_ms.append(time.time() * 1000 - greeks.time)
+
+    def on_trade(self, trade) -> None:
+        self.events += 1
+        if self.measuring:
+            self.latencies_ms.append(time.time() * 1000 - trade.timestamp)
+
+
+def run(scenario: Scenario) -> None:
+    context = multiprocessing.get_context('spawn')
+    urls = context.Queue()
+    server = context.Process(target=_serve, args=(scenario.rate, scenario.events_per_frame, urls), daemon=True)
+    server.start()
+    url = urls.get()
+    counter = _Counter()
+    translations = StreamerSymbolTranslations([(f'SYM{i}', f'SYM{i}') for i in range(scenario.symbols)])
+    handlers = {'Quote': counter.on_quote, 'Trade': counter.on_trade, 'Greeks': counter.on_greeks}
+    subscription = Subscription(url, 'token', translations, handlers).open()
+    try:
+        time.sleep(WARMUP_SECONDS)
+        counter.measuring = True
+        events_before = counter.events
+        cpu_before = time.process_time()
+        memory_before = _resident_bytes()
+        started_at = time.monotonic()
+        time.sleep(DURATION_SECONDS)
+        elapsed = time.monotonic() - started_at
+        events = counter.events - events_before
+        cpu = time.process_time() - cpu_before
+        memory_growth = _resident_bytes() - memory_before - counter.latencies_ms.itemsize * len(counter.latencies_ms)
+        counter.measuring = False
+    finally:
+        subscription.close()
+        server.terminate()
+    latencies = sorted(counter.latencies_ms)
+    print(f'{scenario.name:<20}{events / elapsed:>12,.0f}'
+          f'{_percentile(latencies, 0.5):>9.2f}{_percentile(latencies, 0.9):>9.2f}'
+          f'{_percentile(latencies, 0.99):>9.2f}{latencies[-1] if latencies else float("nan"):>9.2f}'
+          f'{cpu / max(events, 1) * 1e6:>12.2f}{memory_growth / 1e6:>12.1f}')
+
+
+def main():
+    print(f'{"scenario":<20}{"events/sec":>12}{"p50 ms":>9}{"p90 ms":>9}{"p99 ms":>9}{"max ms":>9}'
+          f'{"CPU µs/ev":>12}{"+RSS MB":>12}')
+    for scenario in SCENARIOS:
+        run(scenario)
+
+
+if __name__ == '__main__':
+    main()
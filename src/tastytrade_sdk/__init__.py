@@ -5,13 +5,24 @@
 
 # Make these classes visible in the auto-generated documentation
 __all__ = [
-    'Tastytrade',
-    'MarketData', 'Subscription', 'Profile', 'Quote', 'Summary', 'Greeks',
-    'Api'
+    'Tastytrade', 'HttpConfig', 'CachePolicy',
+    'MarketData', 'Subscription', 'SubscriptionConfig', 'BatchHandlers', 'CandleConfig', 'AsyncSubscription',
+    'ShardedSubscription', 'LatestValues', 'Profile', 'Quote', 'Summary', 'Greeks', 'Candle', 'DispatchConfig',
+    'OverflowPolicy', 'ReconnectPolicy', 'Gap', 'FrameRecorder', 'ReplaySubscription',
+    'Api', 'AsyncApi'
 ]
 
 from tastytrade_sdk.api import Api, QueryParams
+from tastytrade_sdk.async_api import AsyncApi
+from tastytrade_sdk.config import HttpConfig, CachePolicy, DEFAULT_CACHE_POLICIES
+from tastytrade_sdk.market_data.async_subscription import AsyncSubscription
+from tastytrade_sdk.market_data.dispatch import DispatchConfig, OverflowPolicy
+from tastytrade_sdk.market_data.latest_values import LatestValues
 from tastytrade_sdk.market_data.market_data import MarketData
-from tastytrade_sdk.market_data.models import Profile, Quote, Summary, Trade, Greeks
-from tastytrade_sdk.market_data.subscription import Subscription
+from tastytrade_sdk.market_data.models import Profile, Quote, Summary, Trade, Greeks, Candle
+from tastytrade_sdk.market_data.recording import FrameRecorder
+from tastytrade_sdk.market_data.recovery import ReconnectPolicy, Gap
+from tastytrade_sdk.market_data.replay import ReplaySubscription
+from tastytrade_sdk.market_data.sharded_subscription import ShardedSubscription
+from tastytrade_sdk.market_data.subscription import Subscription, SubscriptionConfig, BatchHandlers, CandleConfig
 from tastytrade_sdk.tastytrade import Tastytrade
@@ -1,23 +1,208 @@
 import logging
-from typing import Optional, Tuple, List, Any, Union, Dict
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, List, Any, Union, Dict, Iterator, Callable
 
 from injector import singleton, inject
-from requests import Session, JSONDecodeError
+from requests import Session, JSONDecodeError, RequestException, Response
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, ConnectTimeout, Timeout
 
 from tastytrade_sdk.config import Config
 from tastytrade_sdk.exceptions import TastytradeSdkException
+from tastytrade_sdk.instrumentation import RequestStats, Stats
+from tastytrade_sdk.response_cache import ResponseCache
 
 QueryParams = Union[Dict[str, Any], List[Tuple[str, Any]]]
 
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+RETRIED_STATUSES = frozenset((502, 503, 504))
+USER_AGENT = 'tastytrade-sdk-python'
+
+
+def base_url(config: Config) -> str:
+    """@private"""
+    return config.api_base_url if '://' in config.api_base_url else f'https://{config.api_base_url}'
+
+
+def query_string(params: Optional[QueryParams]) -> str:
+    """@private"""
+    if not params:
+        return ''
+    if isinstance(params, dict):
+        params = list(params.items())
+    return '?' + '&'.join(f'{p[0]}={p[1]}' for p in params)
+
+
+def check_status(status_code: int) -> None:
+    """@private Raise the exception an unsuccessful response status maps to"""
+    if 200 <= status_code <= 399:
+        return
+    if status_code == 400:
+        raise BadRequest()
+    if status_code == 401:
+        raise Unauthorized()
+    if status_code == 429:
+        raise TooManyRequests()
+    if status_code >= 500:
+        raise ServerError()
+    raise Unknown()
+
 
 @singleton
-class RequestsSession:
-    __session = Session()
-    __user_agent = 'tastytrade-sdk-python'
+class Retries:
+    """
+    @private
+
+    Decides whether and when to retry a request, see `tastytrade_sdk.config.HttpConfig`, and holds off every request
+    after a 429. Shared by `RequestsSession` and `tastytrade_sdk.async_api.AsyncApi`, through `Attempts`.
+    """
 
     @inject
     def __init__(self, config: Config):
-        self.__base_url = f'https://{config.api_base_url}'
+        self.__http = config.http
+        self.__throttled_until = 0.0
+        self.__lock = threading.Lock()
+
+    def after_response(self, method: str, status_code: int, retry_after: Optional[str],
+                       attempts: int) -> Optional[float]:
+        """:return: How long to wait before retrying, or `None` to not retry"""
+        if attempts > self.__http.max_retries:
+            return None
+        if status_code == 429:
+            delay = self.__retry_after(retry_after, attempts)
+            if delay is not None:
+                with self.__lock:
+                    self.__throttled_until = max(self.__throttled_until, time.monotonic() + delay)
+            return delay
+        if method in IDEMPOTENT_METHODS and status_code in RETRIED_STATUSES:
+            return self.__backoff(attempts)
+        return None
+
+    def after_error(self, method: str, sent: bool, attempts: int) -> Optional[float]:
+        """
+        :param sent: Whether the request may have reached the server, i.e. it's only safe to resend it if it's
+        idempotent
+        :return: How long to wait before retrying, or `None` to not retry
+        """
+        if attempts > self.__http.max_retries or (sent and method not in IDEMPOTENT_METHODS):
+            return None
+        return self.__backoff(attempts)
+
+    def throttled_for(self) -> float:
+        """How long to hold off before sending a request, after a 429"""
+        return max(self.__throttled_until - time.monotonic(), 0.0)
+
+    def __backoff(self, retry: int) -> float:
+        delay = min(self.__http.backoff_seconds * 2 ** (retry - 1), self.__http.max_backoff_seconds)
+        # Equal jitter: at least half the delay, so retries from many clients spread out without retrying right away
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def __retry_after(self, header: Optional[str], retry: int) -> Optional[float]:
+        """The delay the server asks for, or `None` if it's longer than we're willing to wait"""
+        if header is None:
+            delay = self.__backoff(retry)
+        elif header.strip().isdigit():
+            delay = float(header)
+        else:
+            try:
+                delay = parsedate_to_datetime(header).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = self.__backoff(retry)
+        delay = max(delay, 0.0)
+        return delay if delay <= self.__http.max_retry_after_seconds else None
+
+
+class Attempts:
+    """
+    @private
+
+    The attempts at one request, which are where `RequestsSession` and `tastytrade_sdk.async_api.AsyncApi` share
+    their retry loop. Each of them only waits and sends its own way:
+    ```python
+    attempts = Attempts(retries, method, path, observe)
+    while True:
+        time.sleep(attempts.delay())
+        attempts.start()
+        try:
+            response = send()
+        except RetriedError as e:
+            if attempts.failed(e, sent=...):
+                continue
+            raise
+        if attempts.responded(response.status_code, response.headers.get('Retry-After')):
+            return response
+    ```
+    """
+
+    def __init__(self, retries: Retries, method: str, path: str, observe: Callable[[str, str, str, float], None]):
+        """:param observe: Records the latency of an attempt, see `RequestsSession.observe`"""
+        self.__retries = retries
+        self.__method = method
+        self.__path = path
+        self.__observe = observe
+        self.__count = 0
+        self.__retry_delay = 0.0
+        self.__started_at = 0.0
+
+    def delay(self) -> float:
+        """How long to wait before the next attempt, for the retry to be due and for any 429 to have passed"""
+        return max(self.__retry_delay, self.__retries.throttled_for())
+
+    def start(self) -> None:
+        self.__count += 1
+        self.__retry_delay = 0.0
+        self.__started_at = time.perf_counter()
+
+    def failed(self, error: Exception, sent: Optional[bool] = None) -> bool:
+        """
+        :param sent: Whether the request may have reached the server, i.e. it's only safe to resend it if it's
+        idempotent. `None` if the error isn't worth retrying at all.
+        :return: Whether to retry
+        """
+        self.__observe(self.__method, self.__path, 'error', self.__started_at)
+        delay = None if sent is None else self.__retries.after_error(self.__method, sent, self.__count)
+        if delay is None:
+            return False
+        logging.warning('%s %s failed, retrying in %.2fs: %s', self.__method, self.__path, delay, error)
+        self.__retry_delay = delay
+        return True
+
+    def responded(self, status_code: int, retry_after: Optional[str]) -> bool:
+        """:return: Whether the response is final, rather than to be retried"""
+        self.__observe(self.__method, self.__path, str(status_code), self.__started_at)
+        delay = self.__retries.after_response(self.__method, status_code, retry_after, self.__count)
+        if delay is None:
+            return True
+        logging.warning('%s %s returned %s, retrying in %.2fs', self.__method, self.__path, status_code, delay)
+        self.__retry_delay = delay
+        return False
+
+
+@singleton
+class RequestsSession:
+    """One per `Tastytrade` instance, so that several accounts can be logged in side by side"""
+
+    @inject
+    def __init__(self, config: Config, retries: Retries, cache: ResponseCache):
+        self.__base_url = base_url(config)
+        self.__timeout = (config.http.connect_timeout_seconds, config.http.read_timeout_seconds)
+        self.__session = Session()
+        # Every request goes to the same host, so a single pool of up to pool_size connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.http.pool_size)
+        self.__session.mount('https://', adapter)
+        self.__session.mount('http://', adapter)
+        self.__retries = retries
+        self.__cache = cache if cache.enabled else None
+        self.__stats = RequestStats() if config.instrumentation else None
+
+    @property
+    def session_token(self) -> Optional[str]:
+        """@private"""
+        return self.__session.headers.get('Authorization')
 
     def login(self, login: str, password: str=None, remember_token: str=None, remember_me: bool=True) -> None:
         data={'login':login}
@@ -32,37 +217,90 @@ class RequestsSession:
             data=data,
         )['data']
 
+        if response['session-token'] != self.session_token:
+            # Cached responses may belong to another user's session
+            self.clear_cache()
         self.__session.headers['Authorization'] = response['session-token']
         if remember_me:
             # Is RequestsSession.params the best place to keep this?
             self.__session.params['remember-token'] = response['remember-token']
 
+    def logout(self) -> None:
+        self.request('DELETE', '/sessions')
+        self.clear_cache()
+
     def request(self, method: str, path: str, params: Optional[QueryParams] = tuple(),
                 data: Optional[dict] = None) -> Optional[dict]:
-        url = self.__url(path, params)
+        url = f'{self.__base_url}{path}{query_string(params)}'
         logging.debug('%s %s', path, params)
-        response = self.__session.request(method, url, json=data, headers={'User-Agent': self.__user_agent})
-        is_ok = 200 <= response.status_code <= 399
-        if is_ok:
+        if self.__cache and method == 'GET':
+            return self.__cached_get(path, params, url)
+        response = self.__send(method, path, url, data)
+        if self.__cache:
+            self.__cache.invalidate(path)
+        check_status(response.status_code)
+        try:
+            return response.json()
+        except JSONDecodeError:
+            return None
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hits, misses, revalidations, evictions and entries per `CachePolicy` pattern"""
+        return self.__cache.stats() if self.__cache else {}
+
+    def clear_cache(self) -> None:
+        if self.__cache:
+            self.__cache.clear()
+
+    def stats(self) -> Stats:
+        """Request latency per endpoint and status, see `tastytrade_sdk.instrumentation.RequestStats`"""
+        return self.__stats.snapshot() if self.__stats else {}
+
+    def observe(self, method: str, path: str, status: str, started_at: float) -> None:
+        """@private"""
+        if self.__stats:
+            self.__stats.observe(method, path, status, time.perf_counter() - started_at)
+
+    def __cached_get(self, path: str, params: Optional[QueryParams], url: str) -> Optional[dict]:
+        key = f'{path}{query_string(params)}'
+        cached, etag = self.__cache.get(path, key)
+        if cached is not None:
+            return cached
+        response = self.__send('GET', path, url, None, {'If-None-Match': etag} if etag else None)
+        if response.status_code == 304:
+            cached = self.__cache.revalidated(path, key)
+            if cached is not None:
+                return cached
+            # Evicted in the meantime
+            response = self.__send('GET', path, url, None)
+        check_status(response.status_code)
+        try:
+            result = response.json()
+        except JSONDecodeError:
+            return None
+        self.__cache.put(path, key, response.content, response.headers.get('ETag'))
+        return result
+
+    def __send(self, method: str, path: str, url: str, data: Optional[dict],
+               headers: Optional[Dict[str, str]] = None) -> Response:
+        attempts = Attempts(self.__retries, method, path, self.observe)
+        while True:
+            time.sleep(attempts.delay())
+            attempts.start()
             try:
-                return response.json()
-            except JSONDecodeError:
-                return None
-        if response.status_code == 400:
-            raise BadRequest()
-        if response.status_code == 401:
-            raise Unauthorized()
-        if response.status_code >= 500:
-            raise ServerError()
-        raise Unknown()
-
-    def __url(self, path: str, params: Optional[QueryParams] = None) -> str:
-        url = f'{self.__base_url}{path}'
-        if params:
-            if isinstance(params, dict):
-                params = list(params.items())
-            url += '?' + '&'.join(f'{p[0]}={p[1]}' for p in params)
-        return url
+                response = self.__session.request(method, url, json=data,
+                                                  headers={'User-Agent': USER_AGENT, **(headers or {})},
+                                                  timeout=self.__timeout)
+            except (RequestsConnectionError, Timeout) as e:
+                # A connect timeout means the request never reached the server
+                if attempts.failed(e, sent=not isinstance(e, ConnectTimeout)):
+                    continue
+                raise
+            except RequestException as e:
+                attempts.failed(e)
+                raise
+            if attempts.responded(response.status_code, response.headers.get('Retry-After')):
+                return response
 
 
 @singleton
@@ -109,6 +347,66 @@ class Api:
         """Make a DELETE request"""
         return self.__session.request('DELETE', path, params=params)
 
+    def paginate(self, path: str, params: Optional[QueryParams] = None, per_page: int = 250,
+                 prefetch: bool = True) -> Iterator[dict]:
+        """
+        Iterate over the items of a paginated list endpoint, across all of its pages, e.g:
+        ```python
+        for transaction in tasty.api.paginate(f'/accounts/{account_number}/transactions',
+                                              params={'start-date': '2023-01-01'}):
+            ...
+        ```
+        Pages are fetched as they're needed, so no more than two are held in memory at once, however many there are.
+
+        :param params: Query parameters other than `per-page` and `page-offset`, which are set for every page
+        :param per_page: How many items to request per page. The API may cap it.
+        :param prefetch: Fetch the next page in the background while the items of the current one are being consumed
+        """
+        if isinstance(params, dict):
+            params = list(params.items())
+        params = [p for p in params or [] if p[0] not in ('per-page', 'page-offset')] + [('per-page', per_page)]
+
+        def fetch(page_offset: int) -> Optional[dict]:
+            return self.__session.request('GET', path, params=params + [('page-offset', page_offset)])
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='paginate') as executor:
+            page_offset = 0
+            response = fetch(page_offset)
+            while response:
+                items = response['data']['items']
+                pagination = response.get('pagination') or {}
+                has_next = bool(items) and page_offset + 1 < (pagination.get('total-pages') or 0)
+                page_offset += 1
+                next_response = executor.submit(fetch, page_offset) if has_next and prefetch else None
+                try:
+                    yield from items
+                except BaseException:
+                    # e.g. the caller stopped early. Leaving the executor waits for a prefetch that's already running.
+                    if next_response:
+                        next_response.cancel()
+                    raise
+                if not has_next:
+                    return
+                response = next_response.result() if next_response else fetch(page_offset)
+
+    def stats(self) -> Stats:
+        """
+        Latency histograms of the requests made so far, keyed by `'<method> <path>'` and then by response status, or
+        `'error'` if no response was received. Empty if instrumentation is switched off.
+        """
+        return self.__session.stats()
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Hits, misses, revalidations, evictions and current entries of the response cache, per `CachePolicy` pattern.
+        Empty unless caching is enabled, see `Tastytrade`.
+        """
+        return self.__session.cache_stats()
+
+    def clear_cache(self) -> None:
+        """Drop every cached response"""
+        self.__session.clear_cache()
+
 
 class Unauthorized(TastytradeSdkException):
     def __init__(self):
@@ -120,6 +418,11 @@ class BadRequest(TastytradeSdkException):
         super().__init__('Bad Request')
 
 
+class TooManyRequests(TastytradeSdkException):
+    def __init__(self):
+        super().__init__('Too Many Requests')
+
+
 class ServerError(TastytradeSdkException):
     def __init__(self):
         super().__init__('Server Error')
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from typing import Any, Optional, Tuple
+
+from injector import inject, singleton
+
+from tastytrade_sdk.api import Attempts, QueryParams, RequestsSession, Retries, USER_AGENT, base_url, \
+    check_status, query_string
+from tastytrade_sdk.config import Config
+
+
+def _httpx():
+    try:
+        import httpx # pylint: disable=import-outside-toplevel,import-error
+    except ImportError as e:
+        raise ImportError('AsyncApi requires httpx. Install it with `pip install tastytrade-sdk[async]`') from e
+    return httpx
+
+
+@singleton
+class AsyncApi:
+    """
+    The async counterpart of `tastytrade_sdk.Api`, with the same `path` and `params` conventions and errors, for making
+    many requests concurrently:
+    ```python
+    balances = await asyncio.gather(*[
+        tasty.async_api.get(f'/accounts/{account_number}/balances') for account_number in account_numbers
+    ])
+    ```
+
+    Requests share a pool of keep-alive connections, and at most `HttpConfig.max_concurrent_requests` of them are in
+    flight at once, while the rest wait for their turn. They're retried like `Api`'s, and rate limits hold off both.
+
+    Log in with `Tastytrade.login` first. Requires httpx, see the `async` extra.
+    <br/>
+    """
+
+    @inject
+    def __init__(self, config: Config, requests_session: RequestsSession, retries: Retries):
+        """@private"""
+        self.__http = config.http
+        self.__base_url = base_url(config)
+        self.__requests_session = requests_session
+        self.__retries = retries
+        self.__client = None
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get(self, path: str, params: Optional[QueryParams] = None) -> Optional[dict]:
+        """Make a GET request"""
+        return await self.__request('GET', path, params)
+
+    async def post(self, path: str, params: Optional[QueryParams] = None,
+                   data: Optional[dict] = None) -> Optional[dict]:
+        """Make a POST request"""
+        return await self.__request('POST', path, params, data)
+
+    async def put(self, path: str, params: Optional[QueryParams] = None,
+                  data: Optional[dict] = None) -> Optional[dict]:
+        """Make a PUT request"""
+        return await self.__request('PUT', path, params, data)
+
+    async def patch(self, path: str, params: Optional[QueryParams] = None,
+                    data: Optional[dict] = None) -> Optional[dict]:
+        """Make a PATCH request"""
+        return await self.__request('PATCH', path, params, data)
+
+    async def delete(self, path: str, params: Optional[QueryParams] = None) -> Optional[dict]:
+        """Make a DELETE request"""
+        return await self.__request('DELETE', path, params)
+
+    async def aclose(self) -> None:
+        """Close the pooled connections"""
+        client, self.__client = self.__client, None
+        if client:
+            await client.aclose()
+
+    async def __aenter__(self) -> 'AsyncApi':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    async def __request(self, method: str, path: str, params: Optional[QueryParams],
+                        data: Optional[dict] = None) -> Optional[dict]:
+        client, semaphore = await self.__open()
+        url = f'{self.__base_url}{path}{query_string(params)}'
+        logging.debug('%s %s', path, params)
+        async with semaphore:
+            response = await self.__send(client, method, path, url, data)
+        check_status(response.status_code)
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    async def __open(self) -> Tuple[Any, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        stale = None
+        if not self.__client or loop is not self.__loop:
+            # Connections and the semaphore belong to the loop they're created on, e.g. of one `asyncio.run`
+            httpx = _httpx()
+            stale, self.__client = self.__client, httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.__http.max_concurrent_requests,
+                                    max_keepalive_connections=self.__http.pool_size),
+                timeout=httpx.Timeout(self.__http.read_timeout_seconds, connect=self.__http.connect_timeout_seconds),
+                headers={'User-Agent': USER_AGENT}
+            )
+            self.__semaphore = asyncio.Semaphore(self.__http.max_concurrent_requests)
+            self.__loop = loop
+        client, semaphore = self.__client, self.__semaphore
+        if stale:
+            # Left open by an earlier loop, e.g. one that finished without `aclose`
+            await stale.aclose()
+        return client, semaphore
+
+    async def __send(self, client, method: str, path: str, url: str, data: Optional[dict]):
+        httpx = _httpx()
+        attempts = Attempts(self.__retries, method, path, self.__requests_session.observe)
+        while True:
+            await asyncio.sleep(attempts.delay())
+            attempts.start()
+            token = self.__requests_session.session_token
+            try:
+                response = await client.request(method, url, json=data,
+                                                headers={'Authorization': token} if token else None)
+            except (httpx.TimeoutException, httpx.NetworkError) as e:
+                # The request never reached the server if the connection couldn't be established
+                if attempts.failed(e, sent=not isinstance(e, (httpx.ConnectTimeout, httpx.ConnectError))):
+                    continue
+                raise
+            except httpx.TransportError as e:
+                attempts.failed(e)
+                raise
+            if attempts.responded(response.status_code, response.headers.get('Retry-After')):
+                return response
@@ -1,4 +1,53 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class HttpConfig:
+    """
+    How REST requests are made. Each `Tastytrade` instance has its own session and connection pool.
+
+    Requests are retried after connection errors, timeouts and 502, 503 and 504 responses, but only if they're
+    idempotent, i.e. not POST or PATCH. Those are only retried if the connection couldn't be established in the first
+    place. 429 responses are retried for every method, after the `Retry-After` the server asks for, and the whole
+    session holds off new requests until then.
+    """
+    pool_size: int = 10
+    """The maximum number of connections kept open, i.e. of concurrent requests that don't need a new connection"""
+    connect_timeout_seconds: float = 5
+    read_timeout_seconds: float = 30
+    max_retries: int = 3
+    backoff_seconds: float = 0.25
+    """The delay before the first retry, doubled for every one after it, with jitter"""
+    max_backoff_seconds: float = 10
+    max_retry_after_seconds: float = 60
+    """Give up on a 429 rather than wait longer than this for the `Retry-After` it asks for"""
+    max_concurrent_requests: int = 50
+    """How many requests `AsyncApi` has in flight at once. The rest wait for their turn."""
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How the GET responses of the paths matching `pattern` are cached"""
+    pattern: str
+    """A path pattern, with `*` matching any characters including `/`, e.g. `'/option-chains/*'`"""
+    ttl_seconds: float = 5 * 60
+    max_entries: int = 1_000
+    """The least recently used responses are evicted beyond this many, counting every distinct path and query"""
+    revalidate: bool = True
+    """
+    Once a response expires, ask for it again with `If-None-Match`, if the API sent an `ETag` for it, so that an
+    unchanged response doesn't need to be downloaded again
+    """
+
+
+# Endpoints whose responses rarely change within a day
+DEFAULT_CACHE_POLICIES = [
+    CachePolicy('/customers/me/accounts', ttl_seconds=60 * 60, max_entries=10),
+    CachePolicy('/instruments/*', ttl_seconds=60 * 60, max_entries=10_000),
+    CachePolicy('/option-chains/*', ttl_seconds=15 * 60, max_entries=1_000),
+    CachePolicy('/futures-option-chains/*', ttl_seconds=15 * 60, max_entries=1_000)
+]
 
 
 @dataclass
@@ -7,3 +56,14 @@ class Config:
     Global configuration for the SDK
     """
     api_base_url: str
+    """A host name, or a URL including the scheme, e.g. for a local stand-in"""
+    streamer_symbol_cache_ttl_seconds: float = 24 * 60 * 60
+    streamer_symbol_cache_max_size: int = 100_000
+    streamer_symbol_cache_path: Optional[str] = None
+    json_codec: Optional[str] = None
+    """The JSON codec for streamer messages, see `tastytrade_sdk.market_data.codec`. The fastest installed if unset."""
+    http: HttpConfig = field(default_factory=HttpConfig)
+    response_cache: Optional[List[CachePolicy]] = None
+    """Cache the GET responses of the matching paths, the first policy a path matches applies"""
+    instrumentation: bool = True
+    """Collect REST and streaming stats, see `Api.stats` and `Subscription.stats`"""
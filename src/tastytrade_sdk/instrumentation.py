@@ -0,0 +1,135 @@
+import logging
+import re
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional
+
+Stats = Dict[str, Any]
+
+# Upper bounds of the histogram buckets: powers of two from a microsecond to about 16 seconds, then everything beyond
+BUCKET_BOUNDS_SECONDS: List[float] = [2 ** i / 1_000_000 for i in range(25)] + [float('inf')]
+
+# A path segment that names a collection or an action, e.g. `equity-options`, rather than one resource
+_ROUTE_WORD = re.compile(r'[a-z]+(-[a-z]+)*')
+# Collections whose resources are named by their owners, in lowercase words as often as not
+_NAMED_COLLECTIONS = frozenset(('watchlists', 'public-watchlists', 'search'))
+
+
+def route(path: str) -> str:
+    """
+    The route of a request path, with the account numbers, ids and symbols in it replaced by `{id}`, e.g.
+    `/accounts/{id}/orders/{id}` for `/accounts/5WX01234/orders/987`
+    """
+    segments = path.split('?', 1)[0].split('/')
+    routed = []
+    for previous, segment in zip([''] + segments, segments):
+        word = not segment or (_ROUTE_WORD.fullmatch(segment) and previous not in _NAMED_COLLECTIONS)
+        routed.append(segment if word else '{id}')
+    return '/'.join(routed)
+
+
+class Histogram:
+    """
+    Counts durations into fixed, exponentially sized buckets, so that recording one is cheap and takes no memory,
+    no matter how many are recorded. Percentiles are approximate: the upper bound of the bucket they fall in.
+    """
+
+    def __init__(self):
+        self.__counts = [0] * len(BUCKET_BOUNDS_SECONDS)
+        self.__count = 0
+        self.__sum = 0.0
+        self.__max = 0.0
+        self.__lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        seconds = max(seconds, 0.0)
+        bucket = bisect_left(BUCKET_BOUNDS_SECONDS, seconds)
+        with self.__lock:
+            self.__counts[bucket] += 1
+            self.__count += 1
+            self.__sum += seconds
+            self.__max = max(self.__max, seconds)
+
+    def snapshot(self) -> Stats:
+        with self.__lock:
+            counts = list(self.__counts)
+            count, total, maximum = self.__count, self.__sum, self.__max
+        return {
+            'count': count,
+            'sum': total,
+            'max': maximum,
+            'mean': total / count if count else None,
+            'p50': self.__percentile(counts, count, maximum, 0.5),
+            'p90': self.__percentile(counts, count, maximum, 0.9),
+            'p99': self.__percentile(counts, count, maximum, 0.99),
+            'buckets': {bound: c for bound, c in zip(BUCKET_BOUNDS_SECONDS, counts) if c}
+        }
+
+    @staticmethod
+    def __percentile(counts: List[int], count: int, maximum: float, percentile: float) -> Optional[float]:
+        if not count:
+            return None
+        rank = percentile * count
+        seen = 0
+        for bound, bucket_count in zip(BUCKET_BOUNDS_SECONDS, counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bound, maximum)
+        return maximum
+
+
+class RequestStats:
+    """
+    REST request latency per endpoint and response status. Endpoints are keyed by `route`, so that there's one per
+    kind of request rather than one per account, order or symbol.
+    """
+
+    def __init__(self):
+        self.__histograms: Dict[str, Dict[str, Histogram]] = {}
+        self.__lock = threading.Lock()
+
+    def observe(self, method: str, path: str, status: str, seconds: float) -> None:
+        endpoint = f'{method} {route(path)}'
+        by_status = self.__histograms.get(endpoint)
+        histogram = by_status.get(status) if by_status else None
+        if not histogram:
+            with self.__lock:
+                histogram = self.__histograms.setdefault(endpoint, {}).setdefault(status, Histogram())
+        histogram.observe(seconds)
+
+    def snapshot(self) -> Stats:
+        with self.__lock:
+            histograms = {endpoint: dict(by_status) for endpoint, by_status in self.__histograms.items()}
+        return {endpoint: {status: h.snapshot() for status, h in by_status.items()}
+                for endpoint, by_status in histograms.items()}
+
+
+class Exporter:
+    """Periodically hands a stats snapshot to a hook, e.g. to push it to a metrics system"""
+
+    def __init__(self, snapshot: Callable[[], Stats], hook: Callable[[Stats], None], interval_seconds: float):
+        self.__snapshot = snapshot
+        self.__hook = hook
+        self.__interval_seconds = interval_seconds
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+
+    def start(self) -> 'Exporter':
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop, after exporting one last time"""
+        self.__stopped.set()
+        if self.__thread.is_alive() and self.__thread is not threading.current_thread():
+            self.__thread.join()
+
+    def __run(self) -> None:
+        while True:
+            stopped = self.__stopped.wait(self.__interval_seconds)
+            try:
+                self.__hook(self.__snapshot())
+            except Exception: # pylint: disable=broad-except
+                logging.exception('Failed to export stats')
+            if stopped:
+                return
@@ -0,0 +1,361 @@
+import asyncio
+import inspect
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Set, Union, \
+    TYPE_CHECKING
+
+from websockets import connect
+from websockets.exceptions import ConnectionClosed
+
+from tastytrade_sdk.exceptions import TastytradeSdkException, InvalidArgument
+from tastytrade_sdk.market_data import dxlink
+from tastytrade_sdk.market_data.codec import Codec
+from tastytrade_sdk.market_data.dispatch import DEFAULT_MAX_QUEUE_SIZE, OverflowPolicy
+from tastytrade_sdk.market_data.dxlink import DxLinkProtocol, FeedEvent, StreamerDisconnected, StreamerException, \
+    StreamerTimeout, HANDSHAKE_TIMEOUT_SECONDS
+from tastytrade_sdk.market_data.latest_values import LatestValues
+from tastytrade_sdk.market_data.recovery import ReconnectPolicy
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations, \
+    StreamerSymbolTranslationsFactory
+from tastytrade_sdk.market_data.subscription import BatchHandlers, CandleConfig, SubscriptionConfig
+
+if TYPE_CHECKING:
+    from tastytrade_sdk.market_data.batches import SymbolIds
+
+AsyncHandler = Callable[[Any], Union[None, Awaitable[None]]]
+
+# SubscriptionConfig and CandleConfig options that async subscriptions don't support
+_UNSUPPORTED_OPTIONS = ('dispatch', 'on_disconnect', 'on_resync', 'on_gap', 'recorder', 'on_stats')
+_UNSUPPORTED_CANDLE_OPTIONS = ('history', 'on_snapshot')
+
+_CLOSED = object()
+
+
+class AsyncHandshake:
+    """The asyncio counterpart of `tastytrade_sdk.market_data.subscription.Handshake`"""
+
+    def __init__(self):
+        self.__condition = asyncio.Condition()
+        self.__reached: Set[str] = set()
+        self.__error: Optional[TastytradeSdkException] = None
+
+    async def reach(self, state: str) -> None:
+        async with self.__condition:
+            self.__reached.add(state)
+            self.__condition.notify_all()
+
+    async def fail(self, error: TastytradeSdkException) -> None:
+        async with self.__condition:
+            self.__error = error
+            self.__condition.notify_all()
+
+    async def wait_for(self, state: str, timeout_seconds: float) -> None:
+        async with self.__condition:
+            try:
+                await asyncio.wait_for(
+                    self.__condition.wait_for(lambda: state in self.__reached or self.__error),
+                    timeout_seconds
+                )
+            except asyncio.TimeoutError as e:
+                raise StreamerTimeout(state, timeout_seconds) from e
+            # A failure after the state was reached, e.g. the connection closing, is for the receive loop to handle
+            if state not in self.__reached:
+                raise self.__error
+
+
+class _EventQueue:
+    """The events waiting for one `async for` loop over a subscription"""
+
+    def __init__(self, max_size: int, overflow_policy: OverflowPolicy):
+        self.__max_size = max_size
+        self.__overflow_policy = overflow_policy
+        self.__entries: Deque[list] = deque()
+        # Queued entries by conflation key, so they can be replaced in place
+        self.__pending: Dict[Hashable, list] = {}
+        self.__not_empty = asyncio.Event()
+        self.__not_full = asyncio.Event()
+        self.__not_full.set()
+        self.__closed = False
+
+    async def put(self, key: Hashable, event: Any) -> None:
+        if self.__overflow_policy == OverflowPolicy.CONFLATE:
+            entry = self.__pending.get(key)
+            if entry:
+                entry[1] = event
+                return
+        # There is only one producer, the receive loop, so nothing can take the room freed up before it's used
+        while len(self.__entries) >= self.__max_size and not self.__closed:
+            if self.__overflow_policy == OverflowPolicy.DROP_OLDEST:
+                self.__forget(self.__entries.popleft())
+            else:
+                self.__not_full.clear()
+                await self.__not_full.wait()
+        if self.__closed:
+            return
+        entry = [key, event]
+        self.__entries.append(entry)
+        self.__pending[key] = entry
+        self.__not_empty.set()
+
+    def close(self) -> None:
+        """End the iteration once the events already queued are consumed"""
+        if not self.__closed:
+            self.__closed = True
+            self.__entries.append([None, _CLOSED])
+            self.__not_empty.set()
+            self.__not_full.set()
+
+    async def get(self) -> Any:
+        while not self.__entries:
+            self.__not_empty.clear()
+            await self.__not_empty.wait()
+        entry = self.__entries.popleft()
+        self.__forget(entry)
+        self.__not_full.set()
+        return entry[1]
+
+    def __forget(self, entry: list) -> None:
+        if entry[0] is not None and self.__pending.get(entry[0]) is entry:
+            del self.__pending[entry[0]]
+
+
+class AsyncSubscription:
+    """
+    A feed subscription that runs entirely on the caller's asyncio event loop, so that many subscriptions can share
+    one loop without a thread per connection.
+
+    Events can be consumed through handlers, which may be plain functions or coroutine functions, or by iterating:
+    ```python
+    async with await tasty.market_data.subscribe_async(['SPY'], event_types=['Quote']) as subscription:
+        async for quote in subscription:
+            print(quote)
+    ```
+    Unlike `tastytrade_sdk.market_data.subscription.Subscription`, it doesn't reconnect. When the connection drops,
+    the subscription closes, which ends any `async for` loops over it.
+    """
+
+    def __init__(self, url: str, token: str, streamer_symbol_translations: StreamerSymbolTranslations,
+                 handlers: Dict[str, AsyncHandler],
+                 batch_handlers: Optional[BatchHandlers] = None,
+                 event_types: Optional[List[str]] = None,
+                 config: Optional[SubscriptionConfig] = None,
+                 candles: Optional[CandleConfig] = None,
+                 streamer_symbol_translations_factory: Optional[StreamerSymbolTranslationsFactory] = None,
+                 codec: Optional[Codec] = None):
+        """
+        @private
+
+        :param handlers: Event handlers by event type, e.g. `{'Quote': on_quote}`
+        :param codec: The JSON codec for streamer messages, the fastest one installed by default
+        """
+        config = config or SubscriptionConfig()
+        candles = candles or CandleConfig()
+        unsupported = [option for option in _UNSUPPORTED_OPTIONS if getattr(config, option)]
+        # The default policy can't be told apart from one left unset, so only other policies are rejected
+        if config.reconnect not in (None, ReconnectPolicy()):
+            unsupported.append('reconnect')
+        unsupported += [option for option in _UNSUPPORTED_CANDLE_OPTIONS if getattr(candles, option)]
+        if unsupported:
+            raise InvalidArgument(f'Not supported by async subscriptions: {", ".join(unsupported)}')
+        self.__handlers = {t: h for t, h in handlers.items() if h}
+        self.__batch_handlers = (batch_handlers or BatchHandlers()).by_event_type()
+        subscribed_types = dxlink.subscribed_event_types(self.__handlers, event_types)
+        if not (subscribed_types or self.__batch_handlers):
+            raise InvalidArgument('At least one feed event handler or event type must be provided')
+
+        self.__url = url
+        self.__token = token
+        self.__protocol = DxLinkProtocol(streamer_symbol_translations, subscribed_types, config.frozen_events,
+                                         list(self.__batch_handlers), codec, candles.period, candles.from_time)
+        self.__streamer_symbol_translations_factory = streamer_symbol_translations_factory
+        self.__latest_values = LatestValues() if config.latest_values else None
+        self.__config = config
+        self.__websocket = None
+        self.__handshake: Optional[AsyncHandshake] = None
+        self.__tasks: List[asyncio.Task] = []
+        self.__queues: List[_EventQueue] = []
+        self.__closed = False
+
+    async def open(self, timeout_seconds: float = HANDSHAKE_TIMEOUT_SECONDS) -> 'AsyncSubscription':
+        """
+        Start listening for feed events
+
+        :param timeout_seconds: How long to wait for each step of the DXLink handshake before giving up
+        """
+        self.__handshake = AsyncHandshake()
+        self.__websocket = await connect(self.__url)
+        self.__tasks.append(asyncio.ensure_future(self.__receive()))
+        try:
+            await self.__websocket.send(self.__protocol.setup())
+            await self.__handshake.wait_for(dxlink.SETUP, timeout_seconds)
+            self.__tasks.append(asyncio.ensure_future(self.__keepalive()))
+            await self.__websocket.send(self.__protocol.auth(self.__token))
+            await self.__handshake.wait_for(dxlink.AUTHORIZED, timeout_seconds)
+            await self.__websocket.send(self.__protocol.channel_request())
+            await self.__handshake.wait_for(dxlink.CHANNEL_OPENED, timeout_seconds)
+        except TastytradeSdkException:
+            await self.close()
+            raise
+        await self.__websocket.send(self.__protocol.feed_setup())
+        await self.__subscribe_all()
+        return self
+
+    async def close(self) -> None:
+        """Close the stream connection"""
+        self.__closed = True
+        current_task = asyncio.current_task()
+        for task in self.__tasks:
+            if task is not current_task:
+                task.cancel()
+        if self.__websocket:
+            await self.__websocket.close()
+        self.__end_iterators()
+
+    @property
+    def latest_values(self) -> Optional[LatestValues]:
+        """
+        The latest event per symbol and event type. `None` unless the subscription was created with
+        `SubscriptionConfig(latest_values=True)`.
+        """
+        return self.__latest_values
+
+    @property
+    def symbol_ids(self) -> Optional['SymbolIds']:
+        """Maps the `symbol_id` column of batches back to symbols. `None` unless batch handlers were provided."""
+        return self.__protocol.symbol_ids
+
+    async def add_symbols(self, symbols: List[str], event_types: Optional[List[str]] = None) -> None:
+        """
+        Subscribe to more symbols without reconnecting. Only symbols that haven't been seen by this subscription
+        before are looked up.
+        :param symbols: Symbols to add. Can be across multiple instrument types.
+        :param event_types: The event types to add them for, e.g. `['Quote']`. Defaults to every event type this
+        subscription was created with.
+        """
+        self.__protocol.validate_event_types(event_types)
+        translations = self.__protocol.streamer_symbol_translations
+        unknown = [s for s in symbols if translations.get_streamer_symbol(s) is None]
+        if unknown and not self.__streamer_symbol_translations_factory:
+            raise InvalidArgument(f'Unknown symbols: {", ".join(unknown)}')
+        if unknown:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.__streamer_symbol_translations_factory.extend, translations, unknown)
+        streamer_symbols = [x for x in (translations.get_streamer_symbol(s) for s in symbols) if x is not None]
+        await self.__send(self.__protocol.add_subscriptions(streamer_symbols, event_types))
+
+    async def remove_symbols(self, symbols: List[str], event_types: Optional[List[str]] = None) -> None:
+        """
+        Unsubscribe from symbols without reconnecting. Events already in flight may still be delivered.
+        :param symbols: Symbols to remove
+        :param event_types: The event types to remove them for, e.g. `['Quote']`. Defaults to every event type this
+        subscription was created with.
+        """
+        translations = self.__protocol.streamer_symbol_translations
+        streamer_symbols = [x for x in (translations.get_streamer_symbol(s) for s in symbols) if x is not None]
+        await self.__send(self.__protocol.remove_subscriptions(streamer_symbols, event_types))
+
+    async def __aenter__(self) -> 'AsyncSubscription':
+        if not self.__websocket:
+            await self.open()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def __aiter__(self) -> AsyncIterator[FeedEvent]:
+        """Iterate over feed events as they arrive, until the subscription is closed. Same as `events()`."""
+        return self.events()
+
+    async def events(self, max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+                     overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK) -> AsyncIterator[FeedEvent]:
+        """
+        Iterate over feed events as they arrive, until the subscription is closed. Events wait in a queue of their own
+        for each iteration, until the loop body gets to them.
+        :param max_queue_size: The maximum number of events waiting for this iteration
+        :param overflow_policy: What to do with a new event when the queue is full. `OverflowPolicy.BLOCK` stops
+        reading the socket, and so delivering events to handlers and other iterations, until this one catches up.
+        `OverflowPolicy.DROP_OLDEST` discards the oldest waiting event. `OverflowPolicy.CONFLATE` always replaces a
+        waiting event of the same type and symbol, at its place in the queue, and blocks if the queue is full of
+        distinct ones.
+        """
+        if self.__closed:
+            return
+        queue = _EventQueue(max_queue_size, overflow_policy)
+        self.__queues.append(queue)
+        try:
+            while True:
+                event = await queue.get()
+                if event is _CLOSED:
+                    return
+                yield event
+        finally:
+            self.__queues.remove(queue)
+            # Don't leave the receive loop waiting for room in a queue nobody reads anymore
+            queue.close()
+
+    async def __receive(self) -> None:
+        try:
+            async for raw in self.__websocket:
+                try:
+                    state, events, batches = self.__protocol.handle(raw)
+                except StreamerException as e:
+                    # Raising here would only surface as an unretrieved task exception, so hand it to whoever is
+                    # waiting on the handshake and carry on until the server closes the connection
+                    logging.error('%s', e)
+                    await self.__handshake.fail(e)
+                    continue
+                if state:
+                    await self.__handshake.reach(state)
+                if self.__latest_values and events:
+                    self.__latest_values.update(events)
+                for event_type, event in events:
+                    handler = self.__handlers.get(event_type)
+                    if handler:
+                        result = handler(event)
+                        if inspect.isawaitable(result):
+                            await result
+                    for queue in list(self.__queues):
+                        await queue.put((event_type, event.symbol), event)
+                for event_type, batch in batches:
+                    result = self.__batch_handlers[event_type](batch)
+                    if inspect.isawaitable(result):
+                        await result
+        except ConnectionClosed:
+            pass
+        finally:
+            self.__closed = True
+            self.__end_iterators()
+        # Iterating ends quietly when the server closes the connection normally, so this is reached either way. It
+        # unblocks `open` with the reason, if the connection closed before the handshake completed.
+        websocket = self.__websocket
+        await self.__handshake.fail(StreamerDisconnected(websocket.close_reason or f'code {websocket.close_code}'))
+
+    async def __keepalive(self) -> None:
+        try:
+            while not self.__closed:
+                await self.__websocket.send(self.__protocol.keepalive())
+                await asyncio.sleep(self.__protocol.keepalive_interval)
+        except ConnectionClosed:
+            pass
+
+    async def __subscribe_all(self) -> None:
+        chunk_size = self.__config.subscription_chunk_size
+        if not chunk_size:
+            await self.__send(self.__protocol.feed_subscription())
+            return
+        for i, message in enumerate(self.__protocol.feed_subscriptions(chunk_size)):
+            # Spaced out, so that the streamer isn't flooded with a large subscription all at once
+            if i:
+                await asyncio.sleep(self.__config.subscription_pace_seconds)
+            await self.__send(message)
+
+    async def __send(self, message: Optional[str]) -> None:
+        # Until the subscription is opened, changes are only tracked, and get sent along with the initial subscription
+        if not message or not self.__websocket or self.__closed:
+            return
+        await self.__websocket.send(message)
+
+    def __end_iterators(self) -> None:
+        for queue in self.__queues:
+            queue.close()
@@ -0,0 +1,200 @@
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError('Bars require numpy. Install it with `pip install tastytrade-sdk[numpy]`') from e
+
+from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.models import Trade
+
+_FIELDS = ('start', 'open', 'high', 'low', 'close', 'volume', 'trades')
+
+
+class Bar(NamedTuple):
+    symbol: str
+    interval_seconds: int
+    start: int
+    """Epoch milliseconds"""
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    trades: int
+
+
+class Bars(NamedTuple):
+    """Closed bars of one symbol and interval as arrays, oldest first"""
+    start: np.ndarray
+    """Epoch milliseconds"""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    trades: np.ndarray
+
+
+class _Series:
+    """
+    The closed bars of one symbol and interval in a ring buffer, plus the bar being built. Every bar is written twice,
+    `capacity` slots apart, so that the last N bars are always contiguous and can be viewed without copying.
+    """
+    __slots__ = ('capacity', 'data', 'size', 'next', 'start', 'open', 'high', 'low', 'close', 'volume', 'trades')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.data = np.zeros((2 * capacity, len(_FIELDS)))
+        self.size = 0
+        self.next = 0
+        self.start: Optional[int] = None
+        self.open = self.high = self.low = self.close = self.volume = 0.0
+        self.trades = 0
+
+    def close_bar(self) -> None:
+        values = (self.start, self.open, self.high, self.low, self.close, self.volume, self.trades)
+        self.data[self.next] = values
+        self.data[self.next + self.capacity] = values
+        self.next = (self.next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.start = None
+
+    def last(self, n: int) -> Bars:
+        end = (self.next - 1) % self.capacity + self.capacity + 1
+        return Bars(*self.data[end - min(n, self.size):end].T)
+
+
+class BarBuilder:
+    """
+    Builds OHLCV bars from trades, e.g. as a subscription's `on_trade` handler:
+    ```python
+    bars = BarBuilder(intervals_seconds=(60, 300), on_bar=print)
+    subscription = tasty.market_data.subscribe(['SPY', 'QQQ'], on_trade=bars.update)
+    subscription.open()
+    ...
+    closes = bars.bars('SPY', 60, n=20).close
+    ```
+
+    Each symbol and interval keeps its last `capacity` closed bars in preallocated NumPy arrays, about
+    `112 * capacity` bytes, so memory stays flat however long the subscription runs. A trade costs the same however
+    many bars there are. Intervals without trades produce no bars, and trades older than the bar being built are
+    dropped and counted in `late_trades`.
+
+    A bar closes when a trade of a later interval arrives, or when `close_due` finds its interval over, e.g. from a
+    timer for symbols that trade rarely. `on_bar` is called with each closed bar. Thread-safe.
+    """
+
+    def __init__(self, intervals_seconds: Sequence[int] = (60,), capacity: int = 390,
+                 on_bar: Optional[Callable[[Bar], None]] = None):
+        """
+        :param capacity: The number of closed bars kept per symbol and interval, by default a regular session's worth of
+        1-minute bars
+        """
+        if not intervals_seconds or min(intervals_seconds) <= 0:
+            raise InvalidArgument('Intervals must be positive')
+        if capacity <= 0:
+            raise InvalidArgument('capacity must be positive')
+        self.intervals_seconds = tuple(intervals_seconds)
+        self.late_trades = 0
+        self.__intervals_ms = [i * 1000 for i in self.intervals_seconds]
+        self.__capacity = capacity
+        self.__on_bar = on_bar
+        self.__lock = threading.Lock()
+        self.__series: Dict[str, List[_Series]] = {}
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.__series)
+
+    def update(self, trade: Trade) -> None:
+        """Add a trade to the bars of its symbol"""
+        price = trade.price
+        timestamp = trade.timestamp
+        if price is None or timestamp is None:
+            return
+        size = trade.size or 0
+        closed = []
+        with self.__lock:
+            series = self.__series.get(trade.symbol)
+            if series is None:
+                series = self.__series[trade.symbol] = [_Series(self.__capacity) for _ in self.__intervals_ms]
+            for interval, bars in zip(self.__intervals_ms, series):
+                start = timestamp - timestamp % interval
+                if bars.start is not None and start != bars.start:
+                    if start < bars.start:
+                        self.late_trades += 1
+                        continue
+                    closed.append(self.__close(trade.symbol, interval, bars))
+                if bars.start is None:
+                    bars.start = start
+                    bars.open = bars.high = bars.low = price
+                    bars.volume = 0.0
+                    bars.trades = 0
+                elif price > bars.high:
+                    bars.high = price
+                elif price < bars.low:
+                    bars.low = price
+                bars.close = price
+                bars.volume += size
+                bars.trades += 1
+        self.__notify(closed)
+
+    def close_due(self, now_ms: Optional[int] = None) -> List[Bar]:
+        """
+        Close the bars whose interval is over, without waiting for a trade of the next one
+
+        :param now_ms: Epoch milliseconds, defaulting to now
+        """
+        now_ms = round(time.time() * 1000) if now_ms is None else now_ms
+        closed = []
+        with self.__lock:
+            for symbol, series in self.__series.items():
+                for interval, bars in zip(self.__intervals_ms, series):
+                    if bars.start is not None and bars.start + interval <= now_ms:
+                        closed.append(self.__close(symbol, interval, bars))
+        self.__notify(closed)
+        return closed
+
+    def bars(self, symbol: str, interval_seconds: int, n: Optional[int] = None) -> Bars:
+        """
+        The last `n` closed bars, or all of them, as views of the ring buffer. They're overwritten once `capacity`
+        more bars close, so copy them to keep them longer.
+        """
+        with self.__lock:
+            series = self.__series.get(symbol)
+            bars = series[self.__index(interval_seconds)] if series else None
+            if bars is None:
+                return Bars(*np.zeros((len(_FIELDS), 0)))
+            return bars.last(bars.size if n is None else n)
+
+    def open_bar(self, symbol: str, interval_seconds: int) -> Optional[Bar]:
+        """The bar being built, if there's been a trade in its interval"""
+        with self.__lock:
+            series = self.__series.get(symbol)
+            bars = series[self.__index(interval_seconds)] if series else None
+            if bars is None or bars.start is None:
+                return None
+            return Bar(symbol, interval_seconds, bars.start, bars.open, bars.high, bars.low, bars.close, bars.volume,
+                       bars.trades)
+
+    def __index(self, interval_seconds: int) -> int:
+        try:
+            return self.intervals_seconds.index(interval_seconds)
+        except ValueError:
+            raise InvalidArgument(f'No {interval_seconds}s bars are built') from None
+
+    @staticmethod
+    def __close(symbol: str, interval_ms: int, bars: _Series) -> Bar:
+        closed_bar = Bar(symbol, interval_ms // 1000, bars.start, bars.open, bars.high, bars.low, bars.close,
+                         bars.volume, bars.trades)
+        bars.close_bar()
+        return closed_bar
+
+    def __notify(self, closed: List[Bar]) -> None:
+        # Outside the lock, so that handlers can read bars
+        if self.__on_bar:
+            for closed_bar in closed:
+                self.__on_bar(closed_bar)
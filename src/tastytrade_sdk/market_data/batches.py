@@ -0,0 +1,133 @@
+import threading
+from typing import Callable, Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError('Batch handlers require numpy. Install it with `pip install tastytrade-sdk[numpy]`') from e
+
+from tastytrade_sdk.market_data.models import _float
+
+# Columns of the structured arrays passed to batch handlers, named after the model attributes. Symbols are replaced
+# by `symbol_id`, see `SymbolIds`. Missing integers are -1 and missing floats are NaN.
+BATCH_DTYPES = {
+    'Quote': np.dtype([
+        ('symbol_id', 'i4'), ('bid_price', 'f8'), ('bid_size', 'f8'), ('bid_exchange_code', 'U1'),
+        ('ask_price', 'f8'), ('ask_size', 'f8'), ('ask_exchange_code', 'U1')
+    ]),
+    'Summary': np.dtype([
+        ('symbol_id', 'i4'), ('dayId', 'i4'), ('dayOpen', 'f8'), ('dayHigh', 'f8'), ('dayLow', 'f8'),
+        ('dayClose', 'f8'), ('prevDayId', 'i4'), ('prevClose', 'f8'), ('prevDayVolume', 'f8'), ('openInterest', 'f8')
+    ]),
+    'Trade': np.dtype([
+        ('symbol_id', 'i4'), ('time', 'i8'), ('sequence', 'i8'), ('exchangeCode', 'U1'), ('price', 'f8'),
+        ('change', 'f8'), ('size', 'f8'), ('extendedTradingHours', '?'), ('dayId', 'i4'), ('dayVolume', 'f8'),
+        ('dayTurnover', 'f8')
+    ]),
+    'Greeks': np.dtype([
+        ('symbol_id', 'i4'), ('time', 'i8'), ('price', 'f8'), ('volatility', 'f8'), ('delta', 'f8'), ('gamma', 'f8'),
+        ('theta', 'f8'), ('rho', 'f8'), ('vega', 'f8')
+    ]),
+    'Candle': np.dtype([
+        ('symbol_id', 'i4'), ('eventFlags', 'i4'), ('index', 'i8'), ('time', 'i8'), ('count', 'f8'), ('open', 'f8'),
+        ('high', 'f8'), ('low', 'f8'), ('close', 'f8'), ('volume', 'f8'), ('vwap', 'f8'), ('impVolatility', 'f8'),
+        ('openInterest', 'f8')
+    ])
+}
+
+# The wire field behind each column
+BATCH_FIELDS = {
+    'Quote': ('bidPrice', 'bidSize', 'bidExchangeCode', 'askPrice', 'askSize', 'askExchangeCode'),
+    'Summary': ('dayId', 'dayOpenPrice', 'dayHighPrice', 'dayLowPrice', 'dayClosePrice', 'prevDayId',
+                'prevDayClosePrice', 'prevDayVolume', 'openInterest'),
+    'Trade': ('time', 'sequence', 'exchangeCode', 'price', 'change', 'size', 'extendedTradingHours', 'dayId',
+              'dayVolume', 'dayTurnover'),
+    'Greeks': ('time', 'price', 'volatility', 'delta', 'gamma', 'theta', 'rho', 'vega'),
+    'Candle': ('eventFlags', 'index', 'time', 'count', 'open', 'high', 'low', 'close', 'volume', 'vwap',
+               'impVolatility', 'openInterest')
+}
+
+
+class SymbolIds:
+    """
+    Assigns each symbol a small, stable integer id, so that batches can carry symbols in a numeric column. Ids are
+    handed out in the order symbols are first seen, starting at 0, and are never reused.
+    """
+
+    def __init__(self):
+        self.__ids: Dict[str, int] = {}
+        self.__symbols: List[str] = []
+        self.__lock = threading.Lock()
+
+    def id(self, symbol: str) -> int:
+        _id = self.__ids.get(symbol)
+        if _id is None:
+            with self.__lock:
+                _id = self.__ids.get(symbol)
+                if _id is None:
+                    _id = len(self.__symbols)
+                    self.__symbols.append(symbol)
+                    self.__ids[symbol] = _id
+        return _id
+
+    def symbol(self, _id: int) -> str:
+        return self.__symbols[_id]
+
+    @property
+    def symbols(self) -> 'np.ndarray':
+        """An array of symbols indexed by id, e.g. `symbol_ids.symbols[batch['symbol_id']]`"""
+        return np.array(self.__symbols, dtype=object)
+
+
+class BatchDecoder:
+    """Builds one structured array per FEED_DATA frame for one event type, without creating a model per event"""
+
+    def __init__(self, event_type: str, symbol_ids: SymbolIds):
+        self.__dtype = BATCH_DTYPES[event_type]
+        self.__fields = BATCH_FIELDS[event_type]
+        self.__symbol_ids = symbol_ids
+        self.configure(['eventType', 'eventSymbol'] + list(self.__fields))
+
+    def configure(self, wire_fields: List[str]) -> None:
+        positions = {f: i for i, f in enumerate(wire_fields)}
+        self.__width = len(wire_fields)
+        self.__symbol_index = positions['eventSymbol']
+        self.__indices = [positions.get(f) for f in self.__fields]
+
+    def from_values(self, translate: Callable[[str], str], values: list) -> 'np.ndarray':
+        width = self.__width
+        count = len(values) // width
+        columns = [values[i::width] if i is not None else [None] * count for i in self.__indices]
+        return self.__build(translate, values[self.__symbol_index::width], columns)
+
+    def from_dicts(self, translate: Callable[[str], str], events: List[dict]) -> 'np.ndarray':
+        return self.__build(translate, [e['eventSymbol'] for e in events],
+                            [[e.get(f) for e in events] for f in self.__fields])
+
+    def __build(self, translate: Callable[[str], str], streamer_symbols: list, columns: List[list]) -> 'np.ndarray':
+        batch = np.empty(len(streamer_symbols), dtype=self.__dtype)
+        symbol_id = self.__symbol_ids.id
+        batch['symbol_id'] = [symbol_id(translate(s)) for s in streamer_symbols]
+        for name, column in zip(self.__dtype.names[1:], columns):
+            batch[name] = _column(column, self.__dtype[name])
+        return batch
+
+
+def _column(values: list, dtype: 'np.dtype') -> 'np.ndarray':
+    kind = dtype.kind
+    if kind == 'U':
+        return np.array([v or '' for v in values], dtype=dtype)
+    if kind == 'b':
+        return np.array([bool(v) for v in values], dtype=dtype)
+    try:
+        # numpy parses numeric strings like 'NaN' by itself, and turns None into NaN for floats
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        floats = np.array([_float(v) for v in values], dtype='f8')
+        if kind == 'f':
+            return floats
+        return np.where(np.isnan(floats), -1, floats).astype(dtype)
+
+
+BatchHandler = Callable[['np.ndarray'], None]
+Batch = Tuple[str, 'np.ndarray']
@@ -0,0 +1,191 @@
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError('Candle history requires numpy. Install it with `pip install tastytrade-sdk[numpy]`') from e
+
+from tastytrade_sdk.market_data.batches import SymbolIds
+from tastytrade_sdk.market_data.models import REMOVE_EVENT, SNAPSHOT_BEGIN, SNAPSHOT_END, SNAPSHOT_SNIP
+
+_COLUMNS = ('time', 'open', 'high', 'low', 'close', 'volume', 'vwap', 'count', 'impVolatility', 'openInterest')
+_INITIAL_CAPACITY = 64
+
+
+class Candles(NamedTuple):
+    """The candles of one symbol as arrays, oldest first"""
+    # The same OHLCV columns as `tastytrade_sdk.market_data.bars.Bars`, which are built from trades instead
+    # pylint: disable=duplicate-code
+    time: np.ndarray
+    """Epoch milliseconds of the start of each candle"""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    vwap: np.ndarray
+    count: np.ndarray
+    impVolatility: np.ndarray
+    openInterest: np.ndarray
+
+
+class _History:
+    """The candles of one symbol in growable columns, plus the pieces of a snapshot that's still arriving"""
+
+    def __init__(self):
+        self.columns = {c: np.zeros(_INITIAL_CAPACITY, dtype=np.int64 if c == 'time' else np.float64)
+                        for c in _COLUMNS}
+        self.size = 0
+        self.pending: Optional[List[np.ndarray]] = None
+        self.complete = False
+
+    def replace(self, rows: np.ndarray) -> None:
+        rows = rows[(rows['eventFlags'] & REMOVE_EVENT) == 0]
+        # Snapshots arrive newest first
+        rows = rows[np.argsort(rows['time'], kind='stable')]
+        self.size = 0
+        self.__reserve(len(rows))
+        for c in _COLUMNS:
+            self.columns[c][:len(rows)] = rows[c]
+        self.size = len(rows)
+
+    def apply(self, row: np.void) -> None:
+        times = self.columns['time'][:self.size]
+        candle_time = row['time']
+        index = self.size - 1 if self.size and times[-1] == candle_time else int(np.searchsorted(times, candle_time))
+        exists = index < self.size and times[index] == candle_time
+        if row['eventFlags'] & REMOVE_EVENT:
+            if exists:
+                for column in self.columns.values():
+                    column[index:self.size - 1] = column[index + 1:self.size]
+                self.size -= 1
+            return
+        if not exists:
+            # Usually a new candle at the end, but a correction may land anywhere
+            self.__reserve(self.size + 1)
+            for column in self.columns.values():
+                column[index + 1:self.size + 1] = column[index:self.size]
+            self.size += 1
+        for c in _COLUMNS:
+            self.columns[c][index] = row[c]
+
+    def view(self) -> Candles:
+        return Candles(*(self.columns[c][:self.size] for c in _COLUMNS))
+
+    def __reserve(self, size: int) -> None:
+        capacity = len(self.columns['time'])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for c, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[c] = grown
+
+
+class CandleHistory:
+    """
+    The candles of every symbol of a subscription opened with `CandleConfig(history=True)`, in NumPy arrays. The
+    snapshot of history that `CandleConfig.from_time` asks for is collected straight from the feed's batches into the
+    arrays, without a Python object per candle, and live candles update them from then on:
+    ```python
+    candles = CandleConfig(period='5m', from_time=dt.datetime(2024, 1, 2), history=True)
+    subscription = tasty.market_data.subscribe(['SPY', 'QQQ'], candles=candles)
+    subscription.open()
+    if subscription.candle_history.wait_for_snapshot(['SPY', 'QQQ'], timeout=30):
+        closes = subscription.candle_history.candles('SPY').close
+    ```
+
+    After a reconnect, the streamer sends the snapshot again, and it replaces the candles collected so far. Thread-safe.
+    """
+
+    def __init__(self, symbol_ids: SymbolIds, on_snapshot: Optional[Callable[[str, Candles], None]] = None):
+        """
+        @private
+
+        :param on_snapshot: Called with a symbol and its candles once the snapshot of its history is complete
+        """
+        self.__symbol_ids = symbol_ids
+        self.__on_snapshot = on_snapshot
+        self.__condition = threading.Condition()
+        self.__histories: Dict[str, _History] = {}
+
+    def update(self, batch: np.ndarray) -> None:
+        """@private Apply the Candle batch of a FEED_DATA frame"""
+        ids = batch['symbol_id']
+        completed = []
+        with self.__condition:
+            for symbol_id in np.unique(ids):
+                symbol = self.__symbol_ids.symbol(int(symbol_id))
+                history = self.__histories.get(symbol)
+                if history is None:
+                    history = self.__histories[symbol] = _History()
+                # Symbols can be interleaved within a frame, so their rows are picked out wherever they are
+                if self.__apply(history, batch[ids == symbol_id]):
+                    completed.append((symbol, history.view()))
+            if completed:
+                self.__condition.notify_all()
+        if self.__on_snapshot:
+            for symbol, candles in completed:
+                self.__on_snapshot(symbol, candles)
+
+    def candles(self, symbol: str) -> Candles:
+        """
+        The candles of a symbol so far, as views of its arrays. They stay valid until more candles arrive, so copy
+        them to keep them longer.
+        """
+        with self.__condition:
+            history = self.__histories.get(symbol)
+            return history.view() if history else Candles(*(np.zeros(0) for _ in _COLUMNS))
+
+    def snapshot_complete(self, symbol: str) -> bool:
+        with self.__condition:
+            return self.__complete(symbol)
+
+    def wait_for_snapshot(self, symbols: List[str], timeout: Optional[float] = None) -> bool:
+        """
+        Block until the snapshots of all of `symbols` are complete
+
+        :return: Whether they completed before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__condition:
+            while not all(self.__complete(s) for s in symbols):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.__condition.wait(remaining)
+            return True
+
+    def __complete(self, symbol: str) -> bool:
+        history = self.__histories.get(symbol)
+        return bool(history and history.complete)
+
+    @staticmethod
+    def __apply(history: _History, rows: np.ndarray) -> bool:
+        """:return: Whether the rows completed a snapshot"""
+        flags = rows['eventFlags']
+        begins = np.flatnonzero(flags & SNAPSHOT_BEGIN)
+        if begins.size:
+            # A new snapshot replaces whatever came before it
+            history.pending = []
+            history.complete = False
+            rows = rows[begins[-1]:]
+            flags = flags[begins[-1]:]
+        completed = False
+        if history.pending is not None:
+            ends = np.flatnonzero(flags & (SNAPSHOT_END | SNAPSHOT_SNIP))
+            if ends.size == 0:
+                history.pending.append(rows)
+                return False
+            history.pending.append(rows[:ends[0] + 1])
+            history.replace(np.concatenate(history.pending))
+            history.pending = None
+            history.complete = completed = True
+            rows = rows[ends[0] + 1:]
+        for row in rows:
+            history.apply(row)
+        return completed
@@ -0,0 +1,84 @@
+"""
+The JSON codecs streamer messages can be decoded and encoded with. The fastest one installed is used by default:
+orjson, then msgspec, then ujson, which is always installed. The standard library's json is available too, mostly for
+comparison.
+
+Feed data is negotiated in the COMPACT format, whose events arrive as flat value arrays. Those are turned into models
+positionally, straight from the decoded list, so the decode is the only full pass over a message that a faster codec
+can speed up.
+"""
+import json
+from typing import Any, Callable, Dict, Optional, Union
+
+import ujson
+
+from tastytrade_sdk.exceptions import InvalidArgument
+
+
+class Codec:
+    def __init__(self, name: str, loads: Callable[[Union[str, bytes]], Any], dumps: Callable[[Any], str]):
+        """
+        :param loads: Decodes a whole message, given either text or bytes
+        :param dumps: Encodes a message as text, since DXLink messages go out as text frames
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self) -> str:
+        return f'Codec({self.name!r})'
+
+
+def _orjson() -> Codec:
+    import orjson # pylint: disable=import-outside-toplevel
+    # orjson is a compiled extension whose members pylint can't see
+    return Codec('orjson', orjson.loads, lambda message: orjson.dumps(message).decode())  # pylint: disable=no-member
+
+
+def _msgspec() -> Codec:
+    import msgspec # pylint: disable=import-outside-toplevel,import-error
+    # Reusing a decoder and encoder skips per-call setup
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+    return Codec('msgspec', decoder.decode, lambda message: encoder.encode(message).decode())
+
+
+def _ujson() -> Codec:
+    return Codec('ujson', ujson.loads, ujson.dumps)
+
+
+def _json() -> Codec:
+    return Codec('json', json.loads, lambda message: json.dumps(message, separators=(',', ':')))
+
+
+# In order of preference
+CODECS: Dict[str, Callable[[], Codec]] = {'orjson': _orjson, 'msgspec': _msgspec, 'ujson': _ujson, 'json': _json}
+
+_codecs: Dict[str, Codec] = {}
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """
+    :param name: One of `CODECS`, or `None` for the fastest one installed
+    """
+    if name is None:
+        for candidate in CODECS:
+            if available(candidate):
+                return get_codec(candidate)
+    if name not in CODECS:
+        raise InvalidArgument(f'Unknown JSON codec {name}, expected one of {", ".join(CODECS)}')
+    codec = _codecs.get(name)
+    if not codec:
+        try:
+            codec = _codecs[name] = CODECS[name]()
+        except ImportError as e:
+            raise InvalidArgument(f'JSON codec {name} is not installed') from e
+    return codec
+
+
+def available(name: str) -> bool:
+    try:
+        get_codec(name)
+        return True
+    except InvalidArgument:
+        return False
@@ -0,0 +1,154 @@
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Hashable, List, NamedTuple, Optional
+
+from strenum import StrEnum
+
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+
+
+class OverflowPolicy(StrEnum):
+    """What to do with a new event when a dispatch queue is full, and for `CONFLATE`, before it is"""
+    BLOCK = 'block'
+    """Wait for the handlers to catch up. Nothing is lost, but the socket isn't read in the meantime."""
+    DROP_OLDEST = 'drop-oldest'
+    """Discard the oldest queued event to make room"""
+    CONFLATE = 'conflate'
+    """
+    Whether or not the queue is full, replace a queued event of the same type and symbol, so handlers only see the
+    latest one. It's handled where the event it replaced was queued, ahead of anything queued since. Falls back to
+    blocking if the queue is full of distinct symbols.
+    """
+
+
+@dataclass
+class DispatchConfig:
+    """
+    Runs handlers on worker threads, behind bounded queues, instead of on the thread that reads the websocket
+    """
+    max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE
+    """The maximum number of events queued per worker"""
+    overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK
+    workers: int = 1
+    """
+    With more than one worker, events are partitioned by symbol, so the events of a symbol are still handled in
+    order
+    """
+
+
+class DispatchStats(NamedTuple):
+    depths: List[int]
+    """The number of events currently queued, per worker"""
+    dispatched: int
+    dropped: int
+    conflated: int
+
+
+_STOP = object()
+
+
+class _DispatchQueue:
+    def __init__(self, max_size: int, overflow_policy: OverflowPolicy):
+        self.__max_size = max_size
+        self.__overflow_policy = overflow_policy
+        self.__entries: Deque[list] = deque()
+        # Queued entries by conflation key, so they can be replaced in place
+        self.__pending: Dict[Hashable, list] = {}
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+        self.dispatched = 0
+        self.dropped = 0
+        self.conflated = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def put(self, key: Optional[Hashable], callback: Callable[[Any], None], argument: Any) -> None:
+        with self.__lock:
+            if self.__overflow_policy == OverflowPolicy.CONFLATE and key is not None:
+                entry = self.__pending.get(key)
+                if entry:
+                    entry[2] = argument
+                    self.conflated += 1
+                    return
+            if len(self.__entries) >= self.__max_size:
+                if self.__overflow_policy == OverflowPolicy.DROP_OLDEST:
+                    self.__forget(self.__entries.popleft())
+                    self.dropped += 1
+                else:
+                    self.__not_full.wait_for(lambda: len(self.__entries) < self.__max_size)
+            entry = [key, callback, argument]
+            self.__entries.append(entry)
+            if key is not None:
+                self.__pending[key] = entry
+            self.__not_empty.notify()
+
+    def put_stop(self) -> None:
+        with self.__lock:
+            self.__entries.append([None, _STOP, None])
+            self.__not_empty.notify()
+
+    def get(self) -> list:
+        with self.__lock:
+            self.__not_empty.wait_for(lambda: self.__entries)
+            entry = self.__entries.popleft()
+            self.__forget(entry)
+            self.__not_full.notify()
+            return entry
+
+    def __forget(self, entry: list) -> None:
+        if entry[0] is not None and self.__pending.get(entry[0]) is entry:
+            del self.__pending[entry[0]]
+
+
+class Dispatcher:
+    """Hands events from the receiving thread to handlers running on worker threads"""
+
+    def __init__(self, config: DispatchConfig):
+        self.__queues = [_DispatchQueue(config.max_queue_size, config.overflow_policy)
+                         for _ in range(max(config.workers, 1))]
+        self.__threads = [threading.Thread(target=self.__work, args=(q,), daemon=True) for q in self.__queues]
+        for thread in self.__threads:
+            thread.start()
+
+    def submit(self, key: Optional[Hashable], partition: Optional[str], callback: Callable[[Any], None],
+               argument: Any) -> None:
+        """
+        :param key: Identifies events that may be conflated with each other, e.g. `(event type, symbol)`
+        :param partition: Events with the same partition are handled by the same worker, in order
+        """
+        queues = self.__queues
+        queue = queues[hash(partition) % len(queues)] if partition is not None and len(queues) > 1 else queues[0]
+        queue.put(key, callback, argument)
+
+    def stop(self) -> None:
+        """Handle whatever is already queued, then stop the workers"""
+        for queue in self.__queues:
+            queue.put_stop()
+        for thread in self.__threads:
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def stats(self) -> DispatchStats:
+        return DispatchStats(
+            depths=[len(q) for q in self.__queues],
+            dispatched=sum(q.dispatched for q in self.__queues),
+            dropped=sum(q.dropped for q in self.__queues),
+            conflated=sum(q.conflated for q in self.__queues)
+        )
+
+    @staticmethod
+    def __work(queue: _DispatchQueue) -> None:
+        while True:
+            _, callback, argument = queue.get()
+            if callback is _STOP:
+                return
+            try:
+                callback(argument)
+            except Exception: # pylint: disable=broad-except
+                # A failing handler shouldn't take every other handler on this worker down with it
+                logging.exception('Feed event handler failed')
+            queue.dispatched += 1
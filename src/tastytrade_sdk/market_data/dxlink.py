@@ -0,0 +1,342 @@
+import datetime as dt
+import logging
+from itertools import product
+from math import floor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from tastytrade_sdk.exceptions import TastytradeSdkException, InvalidArgument
+from tastytrade_sdk.market_data.codec import Codec, get_codec
+from tastytrade_sdk.market_data.models import Profile, Quote, Summary, Trade, Greeks, Candle, FrozenProfile, \
+    FrozenQuote, FrozenSummary, FrozenTrade, FrozenGreeks, FrozenCandle
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+
+FeedEvent = Union[Profile, Quote, Summary, Trade, Greeks, Candle]
+# An (event type, numpy structured array) pair
+Batch = Tuple[str, Any]
+
+EVENT_TYPES = ('Profile', 'Quote', 'Summary', 'Trade', 'Greeks', 'Candle')
+BATCH_EVENT_TYPES = ('Quote', 'Summary', 'Trade', 'Greeks', 'Candle')
+FEED_CHANNEL = 1
+HANDSHAKE_TIMEOUT_SECONDS = 10
+
+# Handshake states, named after the DXLink message that completes them
+SETUP = 'SETUP'
+AUTHORIZED = 'AUTH_STATE'
+CHANNEL_OPENED = 'CHANNEL_OPENED'
+
+
+# The wire fields each model is built from, in the order of the model's constructor arguments after `symbol`. Only
+# these fields are requested in the FEED_SETUP message.
+EVENT_FIELDS = {
+    'Profile': ('description', 'high52WeekPrice', 'low52WeekPrice', 'beta', 'earningsPerShare', 'dividendFrequency',
+                'exDividendAmount', 'shares', 'freeFloat'),
+    'Quote': ('bidPrice', 'bidSize', 'bidExchangeCode', 'askPrice', 'askSize', 'askExchangeCode'),
+    'Summary': ('eventSymbol', 'dayId', 'dayOpenPrice', 'dayHighPrice', 'dayLowPrice', 'dayClosePrice', 'prevDayId',
+                'prevDayClosePrice', 'prevDayVolume', 'openInterest'),
+    'Trade': ('eventSymbol', 'time', 'sequence', 'exchangeCode', 'price', 'change', 'size', 'extendedTradingHours',
+              'dayId', 'dayVolume', 'dayTurnover'),
+    'Greeks': ('time', 'price', 'volatility', 'delta', 'gamma', 'theta', 'rho', 'vega'),
+    'Candle': ('eventSymbol', 'eventFlags', 'index', 'time', 'count', 'open', 'high', 'low', 'close', 'volume',
+               'vwap', 'impVolatility', 'openInterest')
+}
+
+EVENT_MODELS = {'Profile': Profile, 'Quote': Quote, 'Summary': Summary, 'Trade': Trade, 'Greeks': Greeks,
+                'Candle': Candle}
+FROZEN_EVENT_MODELS = {'Profile': FrozenProfile, 'Quote': FrozenQuote, 'Summary': FrozenSummary,
+                       'Trade': FrozenTrade, 'Greeks': FrozenGreeks, 'Candle': FrozenCandle}
+DEFAULT_CANDLE_PERIOD = '1m'
+
+
+def candle_symbol(streamer_symbol: str, period: str) -> str:
+    """The symbol Candle events are subscribed to under, e.g. `'SPY{=5m}'`"""
+    return f'{streamer_symbol}{{={period}}}'
+
+
+def epoch_milliseconds(value: Union[dt.datetime, int]) -> int:
+    """Naive datetimes are taken to be UTC, like the times of events"""
+    if isinstance(value, dt.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=dt.timezone.utc)
+        return round(value.timestamp() * 1000)
+    return value
+
+
+def subscribed_event_types(handled_event_types: Iterable[str], event_types: Optional[List[str]]) -> List[str]:
+    """Combine the event types that have handlers with those requested explicitly, in a stable order"""
+    unknown_types = set(event_types or []) - set(EVENT_TYPES)
+    if unknown_types:
+        raise InvalidArgument(f'Unsupported event types: {", ".join(sorted(unknown_types))}')
+    return [t for t in EVENT_TYPES if t in handled_event_types or t in (event_types or [])]
+
+
+class EventDecoder:
+    """Builds one type of model from either FULL-format event objects or COMPACT-format value arrays"""
+
+    def __init__(self, event_type: str, frozen: bool = False):
+        self.__model = (FROZEN_EVENT_MODELS if frozen else EVENT_MODELS)[event_type]
+        self.__fields = EVENT_FIELDS[event_type]
+        self.configure(self.accept_fields_of(event_type))
+
+    @staticmethod
+    def accept_fields_of(event_type: str) -> List[str]:
+        return ['eventType', 'eventSymbol'] + [f for f in EVENT_FIELDS[event_type] if f != 'eventSymbol']
+
+    def configure(self, wire_fields: List[str]) -> None:
+        """Set the field order of incoming COMPACT arrays, as announced by the server in FEED_CONFIG"""
+        positions = {f: i for i, f in enumerate(wire_fields)}
+        self.__width = len(wire_fields)
+        self.__symbol_index = positions['eventSymbol']
+        self.__indices = [positions.get(f, 0) for f in self.__fields]
+        # Fields the server doesn't send are passed to the model as None
+        self.__missing = [i for i, f in enumerate(self.__fields) if f not in positions]
+
+    def from_dict(self, symbol: str, event: dict) -> FeedEvent:
+        return self.__model(symbol, *[event.get(f) for f in self.__fields])
+
+    def from_values(self, translate: Callable[[str], str], values: list) -> Iterator[FeedEvent]:
+        # The models' positional constructors are the fast path: no keyword matching, and values go straight into
+        # slots
+        model = self.__model
+        symbol_index = self.__symbol_index
+        indices = self.__indices
+        missing = self.__missing
+        for offset in range(0, len(values), self.__width):
+            args = [values[offset + i] for i in indices]
+            for i in missing:
+                args[i] = None
+            yield model(translate(values[offset + symbol_index]), *args)
+
+
+class DxLinkProtocol:
+    """
+    Sans-IO implementation of the DXLink messages used by `Subscription` and `AsyncSubscription`. It builds outgoing
+    messages and turns incoming ones into handshake states and feed events, leaving the websocket to the caller.
+
+    Feed data is negotiated in the COMPACT format, limited to the fields the models are built from.
+
+    Candle events are subscribed to under candle symbols of one period, and with a `fromTime` if history is wanted.
+    Their events are translated back to the plain symbol.
+    """
+
+    def __init__(self, streamer_symbol_translations: StreamerSymbolTranslations, event_types: List[str],
+                 frozen_events: bool = False, batch_event_types: Optional[List[str]] = None,
+                 codec: Optional[Codec] = None, candle_period: str = DEFAULT_CANDLE_PERIOD,
+                 candle_from_time: Optional[Union[dt.datetime, int]] = None):
+        """
+        :param event_types: Event types to build a model per event for
+        :param frozen_events: Build the frozen variants of the models
+        :param batch_event_types: Event types to build one structured numpy array per frame for, see
+        `tastytrade_sdk.market_data.batches`
+        :param codec: The JSON codec for messages, see `tastytrade_sdk.market_data.codec`. The fastest one installed by
+        default.
+        :param candle_period: e.g. `'1m'`, `'5m'`, `'1h'` or `'1d'`
+        :param candle_from_time: Start Candle subscriptions with a snapshot of the candles since this time
+        """
+        self.__streamer_symbol_translations = streamer_symbol_translations
+        self.__candle_period = candle_period
+        self.__candle_from_time = None if candle_from_time is None else epoch_milliseconds(candle_from_time)
+        self.__codec = codec or get_codec()
+        self.__loads = self.__codec.loads
+        self.__event_types = [t for t in EVENT_TYPES if t in event_types or t in (batch_event_types or [])]
+        self.__decoders = {t: EventDecoder(t, frozen_events) for t in event_types}
+        self.__batch_decoders = {}
+        self.symbol_ids = None
+        if batch_event_types:
+            # pylint: disable=import-outside-toplevel
+            from tastytrade_sdk.market_data.batches import BatchDecoder, SymbolIds
+            self.symbol_ids = SymbolIds()
+            self.__batch_decoders = {t: BatchDecoder(t, self.symbol_ids) for t in batch_event_types}
+        # An insertion-ordered set of the (streamer symbol, event type) pairs currently subscribed to
+        self.__subscriptions: Dict[Tuple[str, str], None] = dict.fromkeys(
+            product(streamer_symbol_translations.streamer_symbols, self.__event_types))
+        self.keepalive_interval: Optional[int] = None
+
+    @property
+    def streamer_symbol_translations(self) -> StreamerSymbolTranslations:
+        return self.__streamer_symbol_translations
+
+    @property
+    def event_types(self) -> List[str]:
+        return list(self.__event_types)
+
+    @property
+    def subscriptions(self) -> List[Tuple[str, str]]:
+        """The `(streamer symbol, event type)` pairs currently subscribed to"""
+        return list(self.__subscriptions)
+
+    @property
+    def codec(self) -> Codec:
+        return self.__codec
+
+    def message(self, _type: str, channel: Optional[int] = 0, **kwargs) -> str:
+        return self.__codec.dumps({
+            **{'type': _type, 'channel': channel},
+            **kwargs
+        })
+
+    def setup(self) -> str:
+        return self.message('SETUP', version='0.1', keepaliveTimeout=60, acceptKeepaliveTimeout=60)
+
+    def auth(self, token: str) -> str:
+        return self.message('AUTH', token=token)
+
+    def channel_request(self) -> str:
+        return self.message('CHANNEL_REQUEST', channel=FEED_CHANNEL, service='FEED', parameters={'contract': 'AUTO'})
+
+    def feed_setup(self) -> str:
+        return self.message('FEED_SETUP', channel=FEED_CHANNEL, acceptDataFormat='COMPACT',
+                            acceptEventFields={t: EventDecoder.accept_fields_of(t) for t in self.__event_types})
+
+    def feed_subscription(self) -> str:
+        """Subscribe to everything currently tracked, e.g. right after the channel opens"""
+        return self.message('FEED_SUBSCRIPTION', channel=FEED_CHANNEL,
+                            add=[self.__entry(s, t, True) for s, t in list(self.__subscriptions)])
+
+    def feed_subscriptions(self, chunk_size: int) -> List[str]:
+        """
+        Like `feed_subscription`, but split into messages of at most `chunk_size` subscriptions each, so that tens of
+        thousands of subscriptions don't go out as a single huge frame
+        """
+        subscriptions = list(self.__subscriptions)
+        return [self.message('FEED_SUBSCRIPTION', channel=FEED_CHANNEL,
+                             add=[self.__entry(s, t, True) for s, t in subscriptions[i:i + chunk_size]])
+                for i in range(0, len(subscriptions), chunk_size)]
+
+    def add_subscriptions(self, streamer_symbols: List[str], event_types: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Track additional subscriptions
+
+        :return: The incremental FEED_SUBSCRIPTION message to send, or `None` if nothing new was added
+        """
+        event_types = self.validate_event_types(event_types)
+        added = [x for x in product(streamer_symbols, event_types) if x not in self.__subscriptions]
+        self.__subscriptions.update(dict.fromkeys(added))
+        if not added:
+            return None
+        return self.message('FEED_SUBSCRIPTION', channel=FEED_CHANNEL, add=[self.__entry(s, t, True) for s, t in added])
+
+    def remove_subscriptions(self, streamer_symbols: List[str],
+                             event_types: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Stop tracking subscriptions
+
+        :return: The incremental FEED_SUBSCRIPTION message to send, or `None` if nothing was removed
+        """
+        event_types = self.validate_event_types(event_types)
+        removed = [x for x in product(streamer_symbols, event_types) if x in self.__subscriptions]
+        for x in removed:
+            del self.__subscriptions[x]
+        if not removed:
+            return None
+        return self.message('FEED_SUBSCRIPTION', channel=FEED_CHANNEL,
+                            remove=[self.__entry(s, t, False) for s, t in removed])
+
+    def validate_event_types(self, event_types: Optional[List[str]]) -> List[str]:
+        if event_types is None:
+            return self.__event_types
+        unsupported = [t for t in event_types if t not in self.__event_types]
+        if unsupported:
+            raise InvalidArgument(f'Not subscribed to event types: {", ".join(unsupported)}')
+        return event_types
+
+    def keepalive(self) -> str:
+        return self.message('KEEPALIVE')
+
+    def __entry(self, streamer_symbol: str, event_type: str, add: bool) -> dict:
+        if event_type != 'Candle':
+            return {'symbol': streamer_symbol, 'type': event_type}
+        entry = {'symbol': candle_symbol(streamer_symbol, self.__candle_period), 'type': event_type}
+        if add and self.__candle_from_time is not None:
+            entry['fromTime'] = self.__candle_from_time
+        return entry
+
+    def __translate_candle_symbol(self, candle_streamer_symbol: str) -> str:
+        # e.g. 'SPY{=5m}' back to 'SPY'
+        return self.__streamer_symbol_translations.get_original_symbol(candle_streamer_symbol.partition('{')[0])
+
+    def handle(self, raw: Union[str, bytes]) -> Tuple[Optional[str], List[Tuple[str, FeedEvent]], List[Batch]]:
+        """
+        Process a single incoming message
+
+        :return: The handshake state the message completes, if any, the `(event type, event)` pairs it carries, and
+        the `(event type, structured array)` pairs for event types decoded in batches
+        """
+        message = self.__loads(raw)
+        _type = message['type']
+        if _type == 'ERROR':
+            raise StreamerException(message['error'], message['message'])
+        if _type == 'FEED_DATA':
+            return (None,) + self.__parse_feed_data(message['data'])
+        if _type == 'FEED_CONFIG':
+            for event_type, fields in (message.get('eventFields') or {}).items():
+                for decoder in (self.__decoders.get(event_type), self.__batch_decoders.get(event_type)):
+                    if decoder:
+                        decoder.configure(fields)
+            return None, [], []
+        if _type == 'SETUP': # also contains a more specific version number
+            self.keepalive_interval = floor(message['keepaliveTimeout'] / 2)
+            return SETUP, [], []
+        if _type == 'AUTH_STATE': # userId is returned here on 'AUTHORIZED' message
+            return (AUTHORIZED if message['state'] == 'AUTHORIZED' else None), [], []
+        if _type == 'CHANNEL_OPENED':
+            return CHANNEL_OPENED, [], []
+        logging.debug('Unhandled message type: %s', _type)
+        return None, [], []
+
+    def __parse_feed_data(self, data: list) -> Tuple[List[Tuple[str, FeedEvent]], List[Batch]]:
+        translate = self.__streamer_symbol_translations.get_original_symbol
+        if data and isinstance(data[0], dict):
+            # FULL format, in case the server didn't accept the COMPACT FEED_SETUP
+            events = [e for e in (self.__parse_feed_event(event) for event in data) if e]
+            batches = []
+            for event_type, decoder in self.__batch_decoders.items():
+                of_type = [e for e in data if e['eventType'] == event_type]
+                if of_type:
+                    batches.append((event_type, decoder.from_dicts(self.__translator(event_type), of_type)))
+            return events, batches
+        # COMPACT format: [eventType, [values of every event, flattened], eventType, [...], ...]
+        events = []
+        batches = []
+        translate_candle_symbol = self.__translate_candle_symbol
+        for event_type, values in zip(data[::2], data[1::2]):
+            decoder = self.__decoders.get(event_type)
+            batch_decoder = self.__batch_decoders.get(event_type)
+            if not (decoder or batch_decoder):
+                logging.debug('Unhandled feed event type %s', event_type)
+                continue
+            translator = translate_candle_symbol if event_type == 'Candle' else translate
+            if decoder:
+                events.extend((event_type, e) for e in decoder.from_values(translator, values))
+            if batch_decoder:
+                batches.append((event_type, batch_decoder.from_values(translator, values)))
+        return events, batches
+
+    def __translator(self, event_type: str) -> Callable[[str], str]:
+        if event_type == 'Candle':
+            return self.__translate_candle_symbol
+        return self.__streamer_symbol_translations.get_original_symbol
+
+    def __parse_feed_event(self, event: dict) -> Optional[Tuple[str, FeedEvent]]:
+        event_type = event['eventType']
+        original_symbol = self.__translator(event_type)(event['eventSymbol'])
+        decoder = self.__decoders.get(event_type)
+        if not decoder:
+            if event_type not in self.__batch_decoders:
+                logging.debug('Unhandled feed event type %s for symbol %s', event_type, original_symbol)
+            return None
+        return event_type, decoder.from_dict(original_symbol, event)
+
+
+class StreamerException(TastytradeSdkException):
+    def __init__(self, error: str, message: str):
+        super().__init__(f'{error}: {message}')
+
+
+class StreamerTimeout(TastytradeSdkException):
+    def __init__(self, state: str, timeout_seconds: float):
+        super().__init__(f'Timed out after {timeout_seconds}s waiting for {state}')
+
+
+class StreamerDisconnected(TastytradeSdkException):
+    def __init__(self, reason: str):
+        super().__init__(f'The streamer closed the connection: {reason}')
@@ -0,0 +1,106 @@
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from tastytrade_sdk.market_data.models import Event
+
+
+class Snapshot(NamedTuple):
+    """The latest events per symbol and event type, as of `version`"""
+    version: int
+    events: Dict[str, Dict[str, Event]]
+
+
+class LatestValues:
+    """
+    A thread-safe cache of the latest event of each type for each symbol, kept up to date by a subscription opened
+    with `SubscriptionConfig(latest_values=True)`. Strategy loops that can't keep up with every tick can read
+    conflated state from here instead.
+
+    Every update bumps a global version number, and each symbol remembers the version it was last updated at, so
+    readers can tell what changed since they last looked:
+    ```python
+    version = 0
+    while True:
+        updated = latest.wait_for_update(['SPY', 'QQQ'], timeout=5, since=version)
+        snapshot = latest.snapshot(updated)
+        version = snapshot.version
+        ...
+    ```
+    """
+
+    def __init__(self):
+        self.__condition = threading.Condition()
+        # The per-symbol dicts are replaced rather than changed, so readers can share them without copying
+        self.__events: Dict[str, Dict[str, Event]] = {}
+        self.__versions: Dict[str, int] = {}
+        self.__version = 0
+
+    @property
+    def version(self) -> int:
+        return self.__version
+
+    def update(self, events: Iterable[Tuple[str, Event]]) -> None:
+        """@private"""
+        with self.__condition:
+            version = self.__version
+            for event_type, event in events:
+                symbol = event.symbol
+                version += 1
+                latest = self.__events.get(symbol)
+                self.__events[symbol] = {**latest, event_type: event} if latest else {event_type: event}
+                self.__versions[symbol] = version
+            if version != self.__version:
+                self.__version = version
+                self.__condition.notify_all()
+
+    def get(self, symbol: str, event_type: str) -> Optional[Event]:
+        """The latest event of a type for a symbol, e.g. `latest.get('SPY', 'Quote')`"""
+        return self.__events.get(symbol, {}).get(event_type)
+
+    def get_all(self, symbol: str) -> Dict[str, Event]:
+        """The latest event of every type for a symbol, keyed by event type"""
+        return self.__events.get(symbol, {})
+
+    def version_of(self, symbol: str) -> int:
+        """The version at which a symbol was last updated, or 0 if it never was"""
+        return self.__versions.get(symbol, 0)
+
+    def snapshot(self, symbols: Optional[Iterable[str]] = None) -> Snapshot:
+        """
+        A consistent view of the latest events, for some or all symbols
+        :param symbols: Symbols to include. Defaults to all of them.
+        """
+        with self.__condition:
+            if symbols is None:
+                return Snapshot(self.__version, self.__events.copy())
+            return Snapshot(self.__version, {s: self.__events[s] for s in symbols if s in self.__events})
+
+    def wait_for_update(self, symbols: Optional[Iterable[str]] = None, timeout: Optional[float] = None,
+                        since: Optional[int] = None) -> List[str]:
+        """
+        Block until at least one symbol is updated
+        :param symbols: Symbols to wait for. Defaults to any symbol.
+        :param timeout: Seconds to wait before giving up
+        :param since: Wait for updates after this version. Defaults to the current version.
+        :return: The symbols updated after `since`, which is empty if the wait timed out
+        """
+        symbols = None if symbols is None else list(symbols)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__condition:
+            since = self.__version if since is None else since
+            while True:
+                updated = self.__updated_since(symbols, since)
+                if updated:
+                    return updated
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return []
+                self.__condition.wait(remaining)
+
+    def __updated_since(self, symbols: Optional[List[str]], since: int) -> List[str]:
+        if since >= self.__version:
+            return []
+        if symbols is None:
+            return [s for s, v in self.__versions.items() if v > since]
+        return [s for s in symbols if self.__versions.get(s, 0) > since]
@@ -1,11 +1,18 @@
-from typing import List, Callable, Optional
+import asyncio
+from typing import List, Callable, Optional, Awaitable, Union
 
 from injector import inject
 
 from tastytrade_sdk.api import Api
+from tastytrade_sdk.config import Config
+from tastytrade_sdk.market_data.async_subscription import AsyncSubscription
+from tastytrade_sdk.market_data.codec import get_codec
+from tastytrade_sdk.market_data.dxlink import EVENT_TYPES
+from tastytrade_sdk.market_data.stats import SubscriptionStats
+from tastytrade_sdk.market_data.sharded_subscription import ShardedSubscription
 from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslationsFactory
-from tastytrade_sdk.market_data.subscription import Subscription
-from tastytrade_sdk.market_data.models import Profile, Quote, Summary, Trade, Greeks
+from tastytrade_sdk.market_data.subscription import Subscription, BatchHandlers, CandleConfig, SubscriptionConfig
+from tastytrade_sdk.market_data.models import Profile, Quote, Summary, Trade, Greeks, Candle
 
 
 class MarketData:
@@ -14,33 +21,138 @@ class MarketData:
     """
 
     @inject
-    def __init__(self, api: Api, streamer_symbol_translations_factory: StreamerSymbolTranslationsFactory):
+    def __init__(self, api: Api, streamer_symbol_translations_factory: StreamerSymbolTranslationsFactory,
+                 config: Config):
         """@private"""
         self.__api = api
+        self.__config = config
         self.__streamer_symbol_translations_factory = streamer_symbol_translations_factory
 
     def subscribe(self, symbols: List[str], on_profile: Optional[Callable[[Profile], None]] = None,
                   on_quote: Optional[Callable[[Quote], None]] = None,
                   on_summary: Optional[Callable[[Summary], None]] = None,
                   on_trade: Optional[Callable[[Trade], None]] = None,
-                  on_greeks: Optional[Callable[[Greeks], None]] = None) -> Subscription:
+                  on_greeks: Optional[Callable[[Greeks], None]] = None,
+                  on_candle: Optional[Callable[[Candle], None]] = None,
+                  event_types: Optional[List[str]] = None,
+                  batch_handlers: Optional[BatchHandlers] = None,
+                  candles: Optional[CandleConfig] = None,
+                  config: Optional[SubscriptionConfig] = None) -> Subscription:
         """
         Subscribe to live feed data
         :param symbols: Symbols to subscribe to. Can be across multiple instrument types.
-        :param on_profile: Handle for `Profile` events
+        :param on_profile: Handler for `Profile` events
         :param on_quote: Handler for `Quote` events
         :param on_summary: Handler for `Summary` events
         :param on_trade: Handler for `Trade` events
         :param on_greeks: Handler for `Greeks` events
+        :param on_candle: Handler for `Candle` events, in the period given by `candles`
+        :param event_types: Additional event types (e.g. `['Quote', 'Greeks']`) to subscribe to without a handler,
+        e.g. to only keep their latest values
+        :param batch_handlers: Handlers for all the events of a type in a FEED_DATA frame at once, as numpy arrays
+        :param candles: The period of `Candle` events, and whether to start with, and collect, their history
+        :param config: Event delivery, reconnects, recording and stats. By default, the subscription reconnects
+        whenever the connection drops.
         """
         data = self.__api.get('/api-quote-tokens')['data']
+        handlers = (on_profile, on_quote, on_summary, on_trade, on_greeks, on_candle)
         return Subscription(
             data['dxlink-url'],
             data['token'],
             self.__streamer_symbol_translations_factory.create(symbols),
-            on_profile,
-            on_quote,
-            on_summary,
-            on_trade,
-            on_greeks
+            dict(zip(EVENT_TYPES, handlers)),
+            batch_handlers,
+            event_types,
+            config,
+            candles,
+            self.__streamer_symbol_translations_factory,
+            self.__quote_token,
+            stats=SubscriptionStats() if self.__config.instrumentation else None,
+            codec=get_codec(self.__config.json_codec)
         )
+
+    def subscribe_sharded(self, symbols: List[str], shards: int,
+                          on_profile: Optional[Callable[[Profile], None]] = None,
+                          on_quote: Optional[Callable[[Quote], None]] = None,
+                          on_summary: Optional[Callable[[Summary], None]] = None,
+                          on_trade: Optional[Callable[[Trade], None]] = None,
+                          on_greeks: Optional[Callable[[Greeks], None]] = None,
+                          event_types: Optional[List[str]] = None,
+                          config: Optional[SubscriptionConfig] = None,
+                          processes: bool = False,
+                          serialize_handlers: bool = True) -> ShardedSubscription:
+        """
+        Subscribe to live feed data over several connections, for symbol universes too large for one. Handlers are
+        the same as for `subscribe`.
+        :param symbols: Symbols to subscribe to. Can be across multiple instrument types.
+        :param shards: The number of connections to spread symbols across
+        :param config: Of `SubscriptionConfig`, only `frozen_events`, `latest_values`, `reconnect` and the
+        subscription chunking apply to sharded subscriptions
+        :param processes: Decode each shard's feed in a separate process, so that decoding isn't limited to one core.
+        Events are sent back to this process a frame at a time. Quote tokens aren't refreshed on reconnect in this
+        mode.
+        :param serialize_handlers: Never call handlers from more than one shard at once. Turn this off if handlers are
+        thread-safe.
+        """
+        data = self.__api.get('/api-quote-tokens')['data']
+        return ShardedSubscription(
+            data['dxlink-url'],
+            data['token'],
+            self.__streamer_symbol_translations_factory.create(symbols),
+            shards,
+            dict(zip(EVENT_TYPES, (on_profile, on_quote, on_summary, on_trade, on_greeks))),
+            event_types,
+            self.__streamer_symbol_translations_factory,
+            config,
+            processes,
+            serialize_handlers,
+            None if processes else self.__quote_token
+        )
+
+    async def subscribe_async(self, symbols: List[str],
+                              on_profile: Optional[Callable[[Profile], Union[None, Awaitable[None]]]] = None,
+                              on_quote: Optional[Callable[[Quote], Union[None, Awaitable[None]]]] = None,
+                              on_summary: Optional[Callable[[Summary], Union[None, Awaitable[None]]]] = None,
+                              on_trade: Optional[Callable[[Trade], Union[None, Awaitable[None]]]] = None,
+                              on_greeks: Optional[Callable[[Greeks], Union[None, Awaitable[None]]]] = None,
+                              on_candle: Optional[Callable[[Candle], Union[None, Awaitable[None]]]] = None,
+                              event_types: Optional[List[str]] = None,
+                              batch_handlers: Optional[BatchHandlers] = None,
+                              candles: Optional[CandleConfig] = None,
+                              config: Optional[SubscriptionConfig] = None) -> AsyncSubscription:
+        """
+        Subscribe to live feed data on the running asyncio event loop. Options are the same as for `subscribe`.
+        :param symbols: Symbols to subscribe to. Can be across multiple instrument types.
+        :param on_profile: Handler for `Profile` events. Handlers can be plain functions or coroutine functions.
+        :param on_quote: Handler for `Quote` events
+        :param on_summary: Handler for `Summary` events
+        :param on_trade: Handler for `Trade` events
+        :param on_greeks: Handler for `Greeks` events
+        :param on_candle: Handler for `Candle` events, in the period given by `candles`
+        :param event_types: Additional event types (e.g. `['Quote', 'Greeks']`) to subscribe to without a handler,
+        for consumption with `async for`
+        :param batch_handlers: Handlers for all the events of a type in a FEED_DATA frame at once, as numpy arrays.
+        These can be coroutine functions too.
+        :param candles: The period of `Candle` events, and whether to start with a snapshot of their history.
+        `CandleConfig.history` isn't supported.
+        :param config: Of `SubscriptionConfig`, only `frozen_events`, `latest_values` and the subscription chunking
+        apply to async subscriptions, which don't reconnect
+        """
+        loop = asyncio.get_running_loop()
+        data = (await loop.run_in_executor(None, self.__api.get, '/api-quote-tokens'))['data']
+        translations = await loop.run_in_executor(None, self.__streamer_symbol_translations_factory.create, symbols)
+        return AsyncSubscription(
+            data['dxlink-url'],
+            data['token'],
+            translations,
+            dict(zip(EVENT_TYPES, (on_profile, on_quote, on_summary, on_trade, on_greeks, on_candle))),
+            batch_handlers,
+            event_types,
+            config,
+            candles,
+            self.__streamer_symbol_translations_factory,
+            get_codec(self.__config.json_codec)
+        )
+
+    def __quote_token(self) -> str:
+        return self.__api.get('/api-quote-tokens')['data']['token']
@@ -1,21 +1,68 @@
 import datetime as dt
-from dataclasses import dataclass
-from math import isnan
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar, Union
 
 NullableFloatStr = Optional[Union[float, str]]
 
+E = TypeVar('E', bound='Event')
+
 
 def _float(value: NullableFloatStr) -> Optional[float]:
-    if isinstance(value, str):
-        return float(value) if value.isnumeric() else None
+    # Most values arrive as floats already, so check for that first
+    if value.__class__ is float:
+        # NaN is the only float that isn't equal to itself, and comparing is faster than math.isnan
+        return None if value != value else value  # pylint: disable=comparison-with-itself
     if value is None:
         return None
-    return None if isnan(value) else value
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+        return None if value != value else value  # pylint: disable=comparison-with-itself
+    return value
+
+
+class Event:
+    """
+    Base class of the feed event models. Events are slotted, so that the many thousands of them created per second
+    on a busy feed stay small and cheap to build.
+
+    Events aren't dataclasses, so `dataclasses.asdict`, `fields` and `replace` don't work on them. `as_dict` and
+    `replace` take their place, and the keys of `as_dict` are the event's fields.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The event's fields by name"""
+        return {f: getattr(self, f) for f in self._fields}
+
+    def replace(self: E, **changes: Any) -> E:
+        """A copy of the event with some fields changed, of the same model and frozen or not like this one"""
+        return self.__class__(**{**self.as_dict(), **changes})
+
+    def __repr__(self) -> str:
+        return f'{self._model().__name__}({", ".join(f"{f}={getattr(self, f)!r}" for f in self._fields)})'
 
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Event) or self._model() is not other._model():
+            return NotImplemented
+        return self._values() == other._values()
 
-@dataclass
-class Profile:
+    __hash__ = None
+
+    def __reduce__(self):
+        return self.__class__, self._values()
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, f) for f in self._fields)
+
+    @classmethod
+    def _model(cls) -> Type['Event']:
+        return cls
+
+
+class Profile(Event):
     """ Attributes not handled here:
         eventSymbol
         shortSaleRestriction
@@ -26,6 +73,10 @@ class Profile:
         highLimitPrice
         lowLimitPrice
         """
+    __slots__ = ('symbol', 'description', 'hi52wk', 'lo52wk', 'beta', 'earningsPerShare', 'dividendFreq',
+                 'exDividendAmount', 'shares', 'freeFloat')
+    _fields = __slots__
+
     symbol: str
     description: str
     hi52wk: Optional[float]
@@ -36,6 +87,7 @@ class Profile:
     exDividendAmount: Optional[float]
     shares: Optional[float] # outstanding shares
     freeFloat: Optional[float]
+
     def __init__(self, symbol: str, description: str, hi52wk: NullableFloatStr, lo52wk: NullableFloatStr,
                  beta: NullableFloatStr, earningsPerShare: NullableFloatStr, dividendFreq: NullableFloatStr,
                  exDividendAmount: NullableFloatStr, shares: NullableFloatStr, freeFloat: NullableFloatStr):
@@ -51,10 +103,12 @@ class Profile:
         self.freeFloat = _float(freeFloat)
 
 
-@dataclass
-class Quote:
+class Quote(Event):
     """ Attributes not handled here:
         """
+    __slots__ = ('symbol', 'bid_price', 'bid_size', 'bid_exchange_code', 'ask_price', 'ask_size', 'ask_exchange_code')
+    _fields = __slots__
+
     symbol: str
     bid_price: Optional[float]
     bid_size: Optional[float]
@@ -75,12 +129,16 @@ class Quote:
         self.ask_size = _float(ask_size)
         self.ask_exchange_code = ask_exchange_code
 
-@dataclass
-class Summary:
+
+class Summary(Event):
     """ Attributes not handled here:
         dayClosePriceType
         prevDayClosePriceType
         """
+    __slots__ = ('symbol', 'eventSymbol', 'dayId', 'dayOpen', 'dayHigh', 'dayLow', 'dayClose', 'prevDayId',
+                 'prevClose', 'prevDayVolume', 'openInterest')
+    _fields = __slots__
+
     symbol: str
     eventSymbol: str
     dayId: int
@@ -108,17 +166,24 @@ class Summary:
         self.prevDayVolume = _float(prevDayVolume)
         self.openInterest = openInterest
 
-@dataclass
-class Trade:
+
+class Trade(Event):
     """ Attributes not handled here:
         timeNanoPart (it always seems to be 0)
         tickDirection
         sizeAsDouble
         dayVolumeAsDouble
+
+        `time` is converted to a `datetime` the first time it's read, rather than for every event. `timestamp` has the
+        raw epoch milliseconds.
         """
+    __slots__ = ('symbol', 'eventSymbol', '_time', '_datetime', 'sequence', 'exchangeCode', 'price', 'change', 'size',
+                 'extendedTradingHours', 'dayId', 'dayVolume', 'dayTurnover')
+    _fields = ('symbol', 'eventSymbol', 'time', 'sequence', 'exchangeCode', 'price', 'change', 'size',
+               'extendedTradingHours', 'dayId', 'dayVolume', 'dayTurnover')
+
     symbol: str
     eventSymbol: str
-    time: dt.datetime
     sequence: int
     exchangeCode: str
     price: Optional[float]
@@ -128,12 +193,17 @@ class Trade:
     dayId: int
     dayVolume: int
     dayTurnover: Optional[float]
-    def __init__(self, symbol: str, eventSymbol: str, time: dt.datetime, sequence: int, exchangeCode: str,
+
+    def __init__(self, symbol: str, eventSymbol: str, time: Union[dt.datetime, int], sequence: int, exchangeCode: str,
                  price: NullableFloatStr, change: NullableFloatStr, size: int, extendedTradingHours: bool,
                  dayId: int, dayVolume: int, dayTurnover: NullableFloatStr):
+        """
+        :param time: Either a `datetime`, or epoch milliseconds as sent by the streamer
+        """
         self.symbol = symbol
         self.eventSymbol = eventSymbol
-        self.time = time
+        self._time = time
+        self._datetime = None
         self.sequence = sequence
         self.exchangeCode = exchangeCode
         self.price = _float(price)
@@ -144,8 +214,30 @@ class Trade:
         self.dayVolume = dayVolume
         self.dayTurnover = _float(dayTurnover)
 
-@dataclass
-class Greeks:
+    @property
+    def time(self) -> Optional[dt.datetime]:
+        if self._datetime is None and self._time is not None:
+            value = self._time
+            if not isinstance(value, dt.datetime):
+                # necessary to convert to sec then datetime
+                value = dt.datetime.utcfromtimestamp(value / 1000)
+            # Bypasses the frozen variant's __setattr__, since this is only a cache
+            object.__setattr__(self, '_datetime', value)
+        return self._datetime
+
+    @property
+    def timestamp(self) -> Optional[int]:
+        """Epoch milliseconds"""
+        value = self._time
+        if isinstance(value, dt.datetime):
+            return round(value.replace(tzinfo=dt.timezone.utc).timestamp() * 1000)
+        return value
+
+
+class Greeks(Event):
+    __slots__ = ('symbol', 'time', 'price', 'volatility', 'delta', 'gamma', 'theta', 'rho', 'vega')
+    _fields = __slots__
+
     symbol: str
     time: int
     price: Optional[float]
@@ -169,3 +261,132 @@ class Greeks:
         self.theta = _float(theta)
         self.rho = _float(rho)
         self.vega = _float(vega)
+
+
+# eventFlags bits of Candle events, which mark out the snapshot of history that a subscription with a `fromTime` starts
+# with. The snapshot arrives newest candle first.
+TX_PENDING = 0x01
+REMOVE_EVENT = 0x02
+SNAPSHOT_BEGIN = 0x04
+SNAPSHOT_END = 0x08
+SNAPSHOT_SNIP = 0x10
+"""Ends a snapshot that was cut short, e.g. because it would have had too many candles"""
+
+
+class Candle(Event):
+    """ Attributes not handled here:
+        sequence, which is in the lowest bits of `index`
+        bidVolume
+        askVolume
+
+        `eventSymbol` is the candle symbol, e.g. `'SPY{=5m}'`, and `time` is the start of the candle in epoch
+        milliseconds.
+        """
+    __slots__ = ('symbol', 'eventSymbol', 'eventFlags', 'index', 'time', 'count', 'open', 'high', 'low', 'close',
+                 'volume', 'vwap', 'impVolatility', 'openInterest')
+    _fields = __slots__
+
+    symbol: str
+    eventSymbol: str
+    eventFlags: int
+    index: int
+    time: int
+    count: Optional[float]
+    open: Optional[float]
+    high: Optional[float]
+    low: Optional[float]
+    close: Optional[float]
+    volume: Optional[float]
+    vwap: Optional[float]
+    impVolatility: Optional[float]
+    openInterest: Optional[float]
+
+    def __init__(self, symbol: str, eventSymbol: str, eventFlags: int, index: int, time: int, count: NullableFloatStr,
+                 open: NullableFloatStr, high: NullableFloatStr, low: NullableFloatStr, close: NullableFloatStr,
+                 volume: NullableFloatStr, vwap: NullableFloatStr, impVolatility: NullableFloatStr,
+                 openInterest: NullableFloatStr):
+        """@private"""
+        # pylint: disable=redefined-builtin
+        self.symbol = symbol
+        self.eventSymbol = eventSymbol
+        self.eventFlags = eventFlags or 0
+        self.index = index
+        self.time = time
+        self.count = _float(count)
+        self.open = _float(open)
+        self.high = _float(high)
+        self.low = _float(low)
+        self.close = _float(close)
+        self.volume = _float(volume)
+        self.vwap = _float(vwap)
+        self.impVolatility = _float(impVolatility)
+        self.openInterest = _float(openInterest)
+
+    @property
+    def removed(self) -> bool:
+        """Whether this event removes the candle at `time`, rather than adding or updating it"""
+        return bool(self.eventFlags & REMOVE_EVENT)
+
+    @property
+    def snapshot_end(self) -> bool:
+        """Whether this is the last, and oldest, candle of the snapshot"""
+        return bool(self.eventFlags & (SNAPSHOT_END | SNAPSHOT_SNIP))
+
+
+class _FrozenEvent(Event):
+    """
+    Base class of the immutable, hashable variants of the event models. Instances are still instances of the model,
+    but any attempt to change them raises an `AttributeError`.
+    """
+    __slots__ = ()
+
+    def __new__(cls, *args, **kwargs):
+        # Build a mutable instance so the model's own __init__ can run its conversions, then turn it into a frozen one.
+        # Reassigning __class__ is allowed since the frozen variant adds no slots of its own.
+        model = cls._model()
+        event = model.__new__(model)
+        model.__init__(event, *args, **kwargs)
+        event.__class__ = cls
+        return event
+
+    def __init__(self, *_args, **_kwargs):
+        # Already initialized by __new__, and the model's __init__ would try to set the frozen fields again
+        pass
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self._model().__name__} events are frozen')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{self._model().__name__} events are frozen')
+
+    def __hash__(self):
+        return hash((self._model(), self._values()))
+
+    @classmethod
+    def _model(cls) -> Type[Event]:
+        # The model is the other base of each frozen variant
+        return cls.__bases__[1]
+
+
+class FrozenProfile(_FrozenEvent, Profile):
+    __slots__ = ()
+
+
+class FrozenQuote(_FrozenEvent, Quote):
+    __slots__ = ()
+
+
+class FrozenSummary(_FrozenEvent, Summary):
+    __slots__ = ()
+
+
+class FrozenTrade(_FrozenEvent, Trade):
+    __slots__ = ()
+
+
+class FrozenGreeks(_FrozenEvent, Greeks):
+    __slots__ = ()
+
+
+class FrozenCandle(_FrozenEvent, Candle):
+    __slots__ = ()
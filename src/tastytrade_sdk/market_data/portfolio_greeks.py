@@ -0,0 +1,182 @@
+import datetime as dt
+import threading
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError('Portfolio Greeks require numpy. Install it with `pip install tastytrade-sdk[numpy]`') from e
+
+from tastytrade_sdk.market_data.models import Greeks
+
+GREEKS = ('delta', 'gamma', 'theta', 'vega', 'rho')
+_INITIAL_CAPACITY = 64
+
+
+def _occ_expiration(symbol: str) -> Optional[dt.date]:
+    """The expiration date of an OCC option symbol, e.g. `'SPY   230818C00450000'`"""
+    if len(symbol) != 21 or symbol[12] not in 'CP':
+        return None
+    try:
+        return dt.datetime.strptime(symbol[6:12], '%y%m%d').date()
+    except ValueError:
+        return None
+
+
+class PortfolioGreeks:
+    """
+    Position-weighted Greeks of a book of positions, kept current by Greeks events, e.g. as a subscription's
+    `on_greeks` handler:
+    ```python
+    portfolio = PortfolioGreeks()
+    for position in tasty.api.get(f'/accounts/{account_number}/positions')['data']['items']:
+        portfolio.add_api_position(position)
+    subscription = tasty.market_data.subscribe(portfolio.symbols, on_greeks=portfolio.update)
+    ```
+
+    Every position's quantity × multiplier × greek is kept in an array, and totals overall, per underlying and per
+    underlying and expiration are adjusted by the difference each event makes, so an event costs the same however
+    large the book is. Totals are recomputed from scratch every `resync_every` updates, so that rounding errors can't
+    build up over a day of ticks.
+
+    Positions in an underlying itself have a delta of 1 per share, and no other Greeks. Thread-safe.
+    """
+
+    def __init__(self, resync_every: int = 100_000):
+        self.__resync_every = resync_every
+        self.__updates = 0
+        self.__lock = threading.Lock()
+        self.__size = 0
+        self.__multipliers = np.zeros(_INITIAL_CAPACITY)
+        self.__weights = np.zeros(_INITIAL_CAPACITY)
+        self.__contributions = np.zeros((_INITIAL_CAPACITY, len(GREEKS)))
+        self.__underlying_ids = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self.__group_ids = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self.__rows: Dict[str, List[int]] = {}
+        # Per-share Greeks of each symbol, so that positions added or resized later start from them
+        self.__greeks: Dict[str, np.ndarray] = {}
+        self.__underlyings: Dict[str, int] = {}
+        self.__groups: Dict[Tuple[str, Optional[dt.date]], int] = {}
+        self.__total = np.zeros(len(GREEKS))
+        self.__by_underlying = np.zeros((0, len(GREEKS)))
+        self.__by_group = np.zeros((0, len(GREEKS)))
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.__rows)
+
+    def add_position(self, symbol: str, quantity: float, underlying_symbol: str, multiplier: float = 100,
+                     expiration: Optional[dt.date] = None) -> None:
+        """
+        :param quantity: Negative for short positions
+        :param expiration: Defaults to the expiration in `symbol`, if it's an OCC option symbol
+        """
+        expiration = expiration or _occ_expiration(symbol)
+        with self.__lock:
+            if self.__size == len(self.__weights):
+                self.__grow()
+            row = self.__size
+            self.__size += 1
+            self.__rows.setdefault(symbol, []).append(row)
+            self.__multipliers[row] = multiplier
+            self.__weights[row] = quantity * multiplier
+            self.__underlying_ids[row] = self.__id(self.__underlyings, underlying_symbol)
+            self.__group_ids[row] = self.__id(self.__groups, (underlying_symbol, expiration))
+            self.__ensure_group_capacity()
+            if symbol == underlying_symbol:
+                self.__greeks.setdefault(symbol, np.array([1.0, 0.0, 0.0, 0.0, 0.0]))
+            greeks = self.__greeks.get(symbol)
+            if greeks is not None:
+                self.__set(row, self.__weights[row] * greeks)
+
+    def add_api_position(self, position: dict) -> None:
+        """Add an item of the `/accounts/{account_number}/positions` response"""
+        quantity = float(position['quantity'])
+        if position.get('quantity-direction') == 'Short':
+            quantity = -quantity
+        self.add_position(position['symbol'], quantity, position['underlying-symbol'],
+                          float(position.get('multiplier') or 1))
+
+    def set_quantity(self, symbol: str, quantity: float) -> None:
+        """
+        Resize every position in a symbol, e.g. after a fill, keeping the multiplier it was added with. Zero keeps the
+        position, but without any Greeks.
+        """
+        with self.__lock:
+            greeks = self.__greeks.get(symbol)
+            for row in self.__rows.get(symbol, []):
+                self.__weights[row] = quantity * self.__multipliers[row]
+                self.__set(row, self.__weights[row] * greeks if greeks is not None else np.zeros(len(GREEKS)))
+
+    def update(self, greeks: Greeks) -> None:
+        """Apply a Greeks event. Greeks it doesn't carry keep their last known value."""
+        values = np.array([greeks.delta, greeks.gamma, greeks.theta, greeks.vega, greeks.rho], dtype=np.float64)
+        with self.__lock:
+            rows = self.__rows.get(greeks.symbol)
+            if rows is None:
+                return
+            previous = self.__greeks.get(greeks.symbol)
+            missing = np.isnan(values)
+            if missing.any():
+                values[missing] = previous[missing] if previous is not None else 0.0
+            self.__greeks[greeks.symbol] = values
+            for row in rows:
+                self.__set(row, self.__weights[row] * values)
+            self.__updates += 1
+            if self.__updates % self.__resync_every == 0:
+                self.__resync()
+
+    def total(self) -> Dict[str, float]:
+        with self.__lock:
+            return dict(zip(GREEKS, self.__total.tolist()))
+
+    def by_underlying(self) -> Dict[str, Dict[str, float]]:
+        with self.__lock:
+            return {u: dict(zip(GREEKS, self.__by_underlying[i].tolist())) for u, i in self.__underlyings.items()}
+
+    def by_expiration(self) -> Dict[Tuple[str, Optional[dt.date]], Dict[str, float]]:
+        """Keyed by `(underlying symbol, expiration)`, where the expiration of underlying positions is `None`"""
+        with self.__lock:
+            return {g: dict(zip(GREEKS, self.__by_group[i].tolist())) for g, i in self.__groups.items()}
+
+    def __set(self, row: int, contribution: np.ndarray) -> None:
+        change = contribution - self.__contributions[row]
+        self.__contributions[row] = contribution
+        self.__total += change
+        self.__by_underlying[self.__underlying_ids[row]] += change
+        self.__by_group[self.__group_ids[row]] += change
+
+    def __resync(self) -> None:
+        size = self.__size
+        contributions = self.__contributions[:size]
+        self.__total = contributions.sum(axis=0)
+        self.__by_underlying = self.__sum_by(self.__underlying_ids[:size], contributions, len(self.__by_underlying))
+        self.__by_group = self.__sum_by(self.__group_ids[:size], contributions, len(self.__by_group))
+
+    @staticmethod
+    def __sum_by(ids: np.ndarray, contributions: np.ndarray, groups: int) -> np.ndarray:
+        totals = np.zeros((groups, len(GREEKS)))
+        np.add.at(totals, ids, contributions)
+        return totals
+
+    def __grow(self) -> None:
+        capacity = len(self.__weights) * 2
+        self.__multipliers = np.resize(self.__multipliers, capacity)
+        self.__weights = np.resize(self.__weights, capacity)
+        self.__contributions = np.vstack([self.__contributions, np.zeros_like(self.__contributions)])
+        self.__underlying_ids = np.resize(self.__underlying_ids, capacity)
+        self.__group_ids = np.resize(self.__group_ids, capacity)
+
+    def __ensure_group_capacity(self) -> None:
+        self.__by_underlying = self.__pad(self.__by_underlying, len(self.__underlyings))
+        self.__by_group = self.__pad(self.__by_group, len(self.__groups))
+
+    @staticmethod
+    def __pad(totals: np.ndarray, groups: int) -> np.ndarray:
+        if len(totals) >= groups:
+            return totals
+        return np.vstack([totals, np.zeros((groups - len(totals), len(GREEKS)))])
+
+    @staticmethod
+    def __id(ids: dict, key) -> int:
+        return ids.setdefault(key, len(ids))
@@ -0,0 +1,91 @@
+import glob
+import gzip
+import logging
+import os
+import threading
+import time
+from typing import IO, Iterator, Optional, Tuple, Union
+
+SEGMENT_SUFFIX = '.log.gz'
+
+
+class FrameRecorder:
+    """
+    Records raw feed frames, with the time they were received, to gzip-compressed segments in a directory. Segments
+    are only ever appended to, and a new one is started once the current one reaches `segment_max_bytes`, so a crash
+    costs at most the tail of the last segment.
+
+    Each line of a segment is `<received at, in epoch nanoseconds>\\t<raw frame>`. Read them back with `read_frames`.
+    """
+
+    def __init__(self, directory: str, segment_max_bytes: int = 64 * 1024 * 1024, prefix: str = 'frames',
+                 compress_level: int = 6):
+        """
+        :param segment_max_bytes: Start a new segment after writing this many uncompressed bytes to the current one
+        :param compress_level: gzip compression level. Lower is faster, for busy feeds.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__segment_max_bytes = segment_max_bytes
+        self.__prefix = prefix
+        self.__compress_level = compress_level
+        self.__lock = threading.Lock()
+        self.__file: Optional[IO[bytes]] = None
+        self.__written = 0
+
+    def record(self, raw: Union[str, bytes], received_at_ns: Optional[int] = None) -> None:
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        if received_at_ns is None:
+            received_at_ns = time.time_ns()
+        # JSON never needs a literal newline, so replacing any with a space keeps one frame per line losslessly
+        line = f'{received_at_ns}\t{raw.replace(chr(10), " ")}\n'.encode()
+        with self.__lock:
+            if self.__file is None or self.__written >= self.__segment_max_bytes:
+                self.__rotate()
+            self.__file.write(line)
+            self.__written += len(line)
+
+    def flush(self) -> None:
+        with self.__lock:
+            if self.__file:
+                self.__file.flush()
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__file:
+                self.__file.close()
+                self.__file = None
+
+    def __enter__(self) -> 'FrameRecorder':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __rotate(self) -> None:
+        if self.__file:
+            self.__file.close()
+        # Zero-padded, so that segments sort by name in the order they were written
+        path = os.path.join(self.__directory, f'{self.__prefix}-{time.time_ns():020d}{SEGMENT_SUFFIX}')
+        self.__file = gzip.open(path, 'ab', compresslevel=self.__compress_level)
+        self.__written = 0
+
+
+def read_frames(path: str) -> Iterator[Tuple[int, str]]:
+    """
+    Read back what a `FrameRecorder` recorded
+
+    :param path: A single segment, or a directory of them
+    :return: `(received at, in epoch nanoseconds, raw frame)` pairs, in the order they were recorded
+    """
+    segments = sorted(glob.glob(os.path.join(path, f'*{SEGMENT_SUFFIX}'))) if os.path.isdir(path) else [path]
+    for segment in segments:
+        with gzip.open(segment, 'rt') as file:
+            try:
+                for line in file:
+                    received_at, raw = line.rstrip('\n').split('\t', 1)
+                    yield int(received_at), raw
+            except EOFError:
+                # The recorder didn't get to finish this segment, e.g. because the process was killed
+                logging.warning('Segment %s ends abruptly, skipping the rest of it', segment)
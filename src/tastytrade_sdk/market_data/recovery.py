@@ -0,0 +1,62 @@
+import random
+from dataclasses import dataclass
+from itertools import count
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+from tastytrade_sdk.market_data.models import Trade
+
+
+@dataclass(frozen=True)
+class ReconnectPolicy:
+    """
+    How a subscription reconnects after its connection drops. Delays grow exponentially, with some jitter so that
+    many subscriptions dropped at once don't all reconnect at once.
+    """
+    initial_delay_seconds: float = 0.5
+    max_delay_seconds: float = 30
+    multiplier: float = 2
+    jitter: float = 0.1
+    """The fraction by which each delay is randomly shortened or lengthened"""
+    max_attempts: Optional[int] = None
+    """Give up and close the subscription after this many failed attempts in a row. `None` keeps trying forever."""
+    handshake_timeout_seconds: float = 10
+
+    def delays(self) -> Iterator[float]:
+        """The delay before each attempt"""
+        attempts = count() if self.max_attempts is None else range(self.max_attempts)
+        for attempt in attempts:
+            delay = min(self.initial_delay_seconds * self.multiplier ** attempt, self.max_delay_seconds)
+            yield delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+class Gap(NamedTuple):
+    """Trades that were never delivered, going by the sequence numbers of the trades around them"""
+    symbol: str
+    timestamp: int
+    """Epoch milliseconds of the trades around the gap"""
+    expected_sequence: int
+    sequence: int
+
+
+class TradeGapDetector:
+    """
+    Detects missing `Trade` events. The streamer numbers trades within the same millisecond, so a jump in `sequence`
+    between two trades with the same `time` means that something in between was lost.
+
+    `Trade` carries the last trade rather than every trade, so the streamer itself may skip trades on a busy symbol.
+    Gaps are best treated as a sign that data was lost somewhere, rather than a count of missing trades.
+    """
+
+    def __init__(self):
+        self.__last: Dict[str, Tuple[int, int]] = {}
+
+    def check(self, trade: Trade) -> Optional[Gap]:
+        timestamp = trade.timestamp
+        sequence = trade.sequence
+        if timestamp is None or sequence is None:
+            return None
+        last = self.__last.get(trade.symbol)
+        self.__last[trade.symbol] = (timestamp, sequence)
+        if last and last[0] == timestamp and sequence > last[1] + 1:
+            return Gap(trade.symbol, timestamp, last[1] + 1, sequence)
+        return None
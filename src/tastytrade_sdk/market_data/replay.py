@@ -0,0 +1,139 @@
+import threading
+import time
+from dataclasses import replace
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from websockets.exceptions import ConnectionClosedOK
+
+from tastytrade_sdk.market_data.codec import get_codec
+from tastytrade_sdk.market_data.dxlink import EVENT_TYPES, FEED_CHANNEL
+from tastytrade_sdk.market_data.models import Profile, Quote, Summary, Trade, Greeks, Candle
+from tastytrade_sdk.market_data.recording import read_frames
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+from tastytrade_sdk.market_data.subscription import BatchHandlers, CandleConfig, Subscription, SubscriptionConfig
+
+
+class IdentityTranslations(StreamerSymbolTranslations):
+    """Treats every streamer symbol as the symbol itself, for recordings made without knowing the translations"""
+
+    def __init__(self):
+        super().__init__([])
+
+    def get_original_symbol(self, streamer_symbol: str) -> str:
+        return streamer_symbol
+
+
+class _ReplayConnection:
+    """
+    Stands in for the websocket. It answers the DXLink handshake itself, then hands out the recorded frames, paced
+    the way they were received.
+    """
+
+    def __init__(self, frames: Iterator[Tuple[int, str]], speed: Optional[float], finished: threading.Event):
+        self.__frames = frames
+        self.__speed = speed
+        self.__finished = finished
+        self.__closed = threading.Event()
+        self.__replies: List[Tuple[str, str]] = []
+        self.__lock = threading.Condition()
+        self.__started_at: Optional[float] = None
+        self.__first_received_at_ns: Optional[int] = None
+        self.__codec = get_codec()
+
+    def send(self, message: str) -> None:
+        _type = self.__codec.loads(message)['type']
+        reply = None
+        if _type == 'SETUP':
+            reply = self.__message('SETUP', keepaliveTimeout=60, acceptKeepaliveTimeout=60, version='replay')
+        elif _type == 'AUTH':
+            reply = self.__message('AUTH_STATE', state='AUTHORIZED')
+        elif _type == 'CHANNEL_REQUEST':
+            reply = self.__message('CHANNEL_OPENED', channel=FEED_CHANNEL, service='FEED')
+        if reply:
+            with self.__lock:
+                self.__replies.append((_type, reply))
+                self.__lock.notify()
+
+    def recv(self, timeout: Optional[float] = None) -> str:
+        with self.__lock:
+            # Replay only starts once the subscription has finished its handshake and subscribed
+            if not self.__lock.wait_for(lambda: self.__replies or self.__started_at or self.__closed.is_set(),
+                                        timeout):
+                raise TimeoutError()
+            if self.__replies:
+                _type, reply = self.__replies.pop(0)
+                if _type == 'CHANNEL_REQUEST':
+                    self.__started_at = time.monotonic()
+                return reply
+        if self.__closed.is_set():
+            raise ConnectionClosedOK(None, None)
+        try:
+            received_at, raw = next(self.__frames)
+        except StopIteration:
+            self.__finished.set()
+            self.__closed.set()
+            raise ConnectionClosedOK(None, None) from None
+        self.__pace(received_at)
+        return raw
+
+    def close(self) -> None:
+        self.__closed.set()
+        with self.__lock:
+            self.__lock.notify_all()
+
+    def __pace(self, received_at_ns: int) -> None:
+        if not self.__speed:
+            return
+        if self.__first_received_at_ns is None:
+            self.__first_received_at_ns = received_at_ns
+        due = self.__started_at + (received_at_ns - self.__first_received_at_ns) / 1e9 / self.__speed
+        delay = due - time.monotonic()
+        if delay > 0:
+            self.__closed.wait(delay)
+
+    def __message(self, _type: str, channel: int = 0, **kwargs) -> str:
+        return self.__codec.dumps({'type': _type, 'channel': channel, **kwargs})
+
+
+class ReplaySubscription(Subscription):
+    """
+    Feeds a recording made with `FrameRecorder` through the same decoding and handlers as a live `Subscription`,
+    without a network connection
+    """
+
+    def __init__(self, recording: str,
+                 on_profile: Optional[Callable[[Profile], None]] = None,
+                 on_quote: Optional[Callable[[Quote], None]] = None,
+                 on_summary: Optional[Callable[[Summary], None]] = None,
+                 on_trade: Optional[Callable[[Trade], None]] = None,
+                 on_greeks: Optional[Callable[[Greeks], None]] = None,
+                 on_candle: Optional[Callable[[Candle], None]] = None,
+                 speed: Optional[float] = 1,
+                 streamer_symbol_translations: Optional[StreamerSymbolTranslations] = None,
+                 event_types: Optional[List[str]] = None,
+                 batch_handlers: Optional[BatchHandlers] = None,
+                 candles: Optional[CandleConfig] = None,
+                 config: Optional[SubscriptionConfig] = None):
+        """
+        :param recording: A segment, or a directory of segments, written by `FrameRecorder`
+        :param speed: How fast to replay relative to how frames were received, e.g. `10` for ten times as fast.
+        `None` replays as fast as possible.
+        :param streamer_symbol_translations: Translates streamer symbols in the recording back to symbols. By default
+        events carry the streamer symbols as they were recorded.
+        :param config: As for a live subscription, except that a recording is never reconnected to
+        """
+        self.__finished = threading.Event()
+        super().__init__(
+            f'replay:{recording}', '', streamer_symbol_translations or IdentityTranslations(),
+            dict(zip(EVENT_TYPES, (on_profile, on_quote, on_summary, on_trade, on_greeks, on_candle))),
+            batch_handlers, event_types, replace(config or SubscriptionConfig(), reconnect=None), candles,
+            connector=lambda url, **_: _ReplayConnection(read_frames(recording), speed, self.__finished)
+        )
+
+    def wait(self, timeout_seconds: Optional[float] = None) -> bool:
+        """
+        Block until the whole recording has been replayed
+
+        :return: Whether it finished before the timeout
+        """
+        return self.__finished.wait(timeout_seconds)
@@ -0,0 +1,407 @@
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from tastytrade_sdk.exceptions import InvalidArgument, TastytradeSdkException
+from tastytrade_sdk.market_data import dxlink
+from tastytrade_sdk.market_data.dxlink import HANDSHAKE_TIMEOUT_SECONDS
+from tastytrade_sdk.market_data.latest_values import LatestValues
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations, \
+    StreamerSymbolTranslationsFactory
+from tastytrade_sdk.market_data.subscription import Handshake, Subscription, SubscriptionConfig
+
+# SubscriptionConfig options that sharded subscriptions don't support
+_UNSUPPORTED_OPTIONS = ('dispatch', 'on_disconnect', 'on_resync', 'on_gap', 'recorder', 'on_stats')
+# On top of the handshake itself, for a shard process to start up and import the SDK
+PROCESS_START_TIMEOUT_SECONDS = 30
+
+Frame = List[Tuple[str, Any]]
+
+# Messages from shard processes
+_OPENED = 'OPENED'
+_FAILED = 'FAILED'
+_FRAME = 'FRAME'
+_DISCONNECTED = 'DISCONNECTED'
+_RESYNCED = 'RESYNCED'
+_CLOSED = 'CLOSED'
+# Commands to shard processes
+_ADD = 'ADD'
+_REMOVE = 'REMOVE'
+_STOP = 'STOP'
+
+
+def shard_of(symbol: str, shards: int) -> int:
+    """The shard a symbol belongs to. Unlike `hash`, this is the same across processes and runs."""
+    return zlib.crc32(symbol.encode()) % shards
+
+
+class ShardHealth(NamedTuple):
+    shard: int
+    symbols: int
+    connected: bool
+    events: int
+    last_event_age_seconds: Optional[float]
+    """Seconds since the shard last delivered an event, or `None` if it hasn't yet"""
+    reconnects: int
+    error: Optional[str]
+    """Why the shard failed, if it did"""
+
+
+class ShardFailed(TastytradeSdkException):
+    def __init__(self, shard: int, message: str):
+        super().__init__(f'Shard {shard} failed: {message}')
+
+
+class _Shard(ABC):
+    def __init__(self, index: int, symbols: Set[str], on_frame: Callable[[Frame], None]):
+        self.index = index
+        self.symbols = symbols
+        self.events = 0
+        self.last_event_at: Optional[float] = None
+        self.reconnects = 0
+        self.error: Optional[str] = None
+        self.__on_frame = on_frame
+
+    def deliver(self, events: Frame) -> None:
+        self.events += len(events)
+        self.last_event_at = time.monotonic()
+        self.__on_frame(events)
+
+    def health(self) -> ShardHealth:
+        return ShardHealth(
+            shard=self.index,
+            symbols=len(self.symbols),
+            connected=self.connected,
+            events=self.events,
+            last_event_age_seconds=None if self.last_event_at is None else time.monotonic() - self.last_event_at,
+            reconnects=self.reconnects,
+            error=self.error
+        )
+
+    @property
+    @abstractmethod
+    def connected(self) -> bool:
+        pass
+
+    @abstractmethod
+    def open(self, timeout_seconds: float) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def add(self, translations: List[Tuple[str, str]], event_types: Optional[List[str]]) -> None:
+        pass
+
+    @abstractmethod
+    def remove(self, symbols: List[str], event_types: Optional[List[str]]) -> None:
+        pass
+
+
+class _ThreadShard(_Shard):
+    """A shard with its own connection and receive thread, decoding in this process"""
+
+    def __init__(self, index: int, url: str, token: str, translations: List[Tuple[str, str]],
+                 event_types: List[str], on_frame: Callable[[Frame], None], config: SubscriptionConfig,
+                 token_provider: Optional[Callable[[], str]]):
+        super().__init__(index, {s for s, _ in translations}, on_frame)
+        self.__translations = StreamerSymbolTranslations(translations)
+        self.__subscription = Subscription(
+            url, token, self.__translations, {}, event_types=event_types,
+            config=replace(config, on_resync=self.__resynced), token_provider=token_provider, on_frame=self.deliver
+        )
+
+    @property
+    def connected(self) -> bool:
+        return self.__subscription.connected
+
+    def open(self, timeout_seconds: float) -> None:
+        self.__subscription.open(timeout_seconds)
+
+    def close(self) -> None:
+        self.__subscription.close()
+
+    def add(self, translations: List[Tuple[str, str]], event_types: Optional[List[str]]) -> None:
+        self.__translations.update(StreamerSymbolTranslations(translations))
+        self.__subscription.add_symbols([s for s, _ in translations], event_types)
+
+    def remove(self, symbols: List[str], event_types: Optional[List[str]]) -> None:
+        self.__subscription.remove_symbols(symbols, event_types)
+
+    def __resynced(self) -> None:
+        self.reconnects += 1
+
+
+class _ProcessShard(_Shard):
+    """
+    A shard whose connection, JSON decoding and event building run in a separate process. Events come back over a
+    queue, one frame at a time.
+    """
+
+    def __init__(self, index: int, url: str, token: str, translations: List[Tuple[str, str]],
+                 event_types: List[str], on_frame: Callable[[Frame], None], config: SubscriptionConfig):
+        super().__init__(index, {s for s, _ in translations}, on_frame)
+        self.__args = (url, token, translations, event_types, config)
+        # spawn rather than fork, since forking a process that already runs threads isn't safe
+        self.__context = multiprocessing.get_context('spawn')
+        self.__commands = self.__context.Queue()
+        self.__results = self.__context.Queue()
+        self.__process: Optional[multiprocessing.Process] = None
+        self.__reader: Optional[threading.Thread] = None
+        self.__handshake = Handshake()
+        self.__connected = False
+
+    @property
+    def connected(self) -> bool:
+        return self.__connected
+
+    def open(self, timeout_seconds: float) -> None:
+        self.__process = self.__context.Process(target=_run_shard_process,
+                                                args=(*self.__args, timeout_seconds, self.__commands, self.__results),
+                                                daemon=True)
+        self.__process.start()
+        self.__reader = threading.Thread(target=self.__read, daemon=True)
+        self.__reader.start()
+        self.__handshake.wait_for(_OPENED, timeout_seconds * 3 + PROCESS_START_TIMEOUT_SECONDS)
+
+    def close(self) -> None:
+        if not self.__process:
+            return
+        self.__commands.put((_STOP, None))
+        self.__process.join(PROCESS_START_TIMEOUT_SECONDS)
+        if self.__process.is_alive():
+            self.__process.terminate()
+        if self.__reader and self.__reader is not threading.current_thread():
+            self.__reader.join()
+        self.__connected = False
+
+    def add(self, translations: List[Tuple[str, str]], event_types: Optional[List[str]]) -> None:
+        self.__commands.put((_ADD, (translations, event_types)))
+
+    def remove(self, symbols: List[str], event_types: Optional[List[str]]) -> None:
+        self.__commands.put((_REMOVE, (symbols, event_types)))
+
+    def __read(self) -> None:
+        while True:
+            try:
+                kind, payload = self.__results.get(timeout=1)
+            except queue.Empty:
+                if self.__process and not self.__process.is_alive():
+                    self.__fail(f'Process exited with code {self.__process.exitcode}')
+                    return
+                continue
+            if kind == _FRAME:
+                self.deliver(payload)
+            elif kind == _OPENED:
+                self.__connected = True
+                self.__handshake.reach(_OPENED)
+            elif kind == _RESYNCED:
+                self.__connected = True
+                self.reconnects += 1
+            elif kind == _DISCONNECTED:
+                self.__connected = False
+            elif kind == _FAILED:
+                self.__fail(payload)
+                return
+            elif kind == _CLOSED:
+                self.__connected = False
+                return
+
+    def __fail(self, message: str) -> None:
+        self.__connected = False
+        self.error = message
+        self.__handshake.fail(ShardFailed(self.index, message))
+
+
+def _run_shard_process(url: str, token: str, translations: List[Tuple[str, str]], event_types: List[str],
+                       config: SubscriptionConfig, timeout_seconds: float, commands: multiprocessing.Queue,
+                       results: multiprocessing.Queue) -> None:
+    streamer_symbol_translations = StreamerSymbolTranslations(translations)
+    config = replace(config, on_disconnect=lambda e: results.put((_DISCONNECTED, str(e))),
+                     on_resync=lambda: results.put((_RESYNCED, None)))
+    subscription = Subscription(url, token, streamer_symbol_translations, {}, event_types=event_types, config=config,
+                                on_frame=lambda events: results.put((_FRAME, events)))
+    try:
+        subscription.open(timeout_seconds)
+    except TastytradeSdkException as e:
+        results.put((_FAILED, str(e)))
+        return
+    results.put((_OPENED, None))
+    try:
+        _serve_shard_commands(subscription, streamer_symbol_translations, commands)
+    finally:
+        subscription.close()
+        results.put((_CLOSED, None))
+
+
+def _serve_shard_commands(subscription: Subscription, streamer_symbol_translations: StreamerSymbolTranslations,
+                          commands: multiprocessing.Queue) -> None:
+    """Apply the commands of the process that started this one, until told to stop"""
+    while True:
+        try:
+            command, args = commands.get(timeout=1)
+        except queue.Empty:
+            # Don't outlive the process that started this one
+            if not multiprocessing.parent_process().is_alive():
+                return
+            continue
+        if command == _STOP:
+            return
+        if command == _ADD:
+            added, added_event_types = args
+            streamer_symbol_translations.update(StreamerSymbolTranslations(added))
+            subscription.add_symbols([s for s, _ in added], added_event_types)
+        elif command == _REMOVE:
+            subscription.remove_symbols(*args)
+
+
+def _partition(translations: StreamerSymbolTranslations, shards: int) -> List[List[Tuple[str, str]]]:
+    """The translations of each shard"""
+    translations_by_shard: List[List[Tuple[str, str]]] = [[] for _ in range(shards)]
+    for symbol, streamer_symbol in translations.items():
+        translations_by_shard[shard_of(symbol, shards)].append((symbol, streamer_symbol))
+    return translations_by_shard
+
+
+class ShardedSubscription:
+    """
+    Spreads symbols across several connections, each with its own receive thread, or optionally its own process
+    for decoding. Events from every shard go to the same handlers.
+    """
+
+    def __init__(self, url: str, token: str, streamer_symbol_translations: StreamerSymbolTranslations, shards: int,
+                 handlers: Dict[str, Callable[[Any], None]],
+                 event_types: Optional[List[str]] = None,
+                 streamer_symbol_translations_factory: Optional[StreamerSymbolTranslationsFactory] = None,
+                 config: Optional[SubscriptionConfig] = None,
+                 processes: bool = False,
+                 serialize_handlers: bool = True,
+                 token_provider: Optional[Callable[[], str]] = None):
+        """
+        @private
+
+        :param handlers: Event handlers by event type, e.g. `{'Quote': on_quote}`
+        """
+        if shards < 1:
+            raise InvalidArgument('At least one shard is needed')
+        config = config or SubscriptionConfig()
+        unsupported = [option for option in _UNSUPPORTED_OPTIONS if getattr(config, option)]
+        if unsupported:
+            raise InvalidArgument(f'Not supported by sharded subscriptions: {", ".join(unsupported)}')
+        self.__handlers = {t: h for t, h in handlers.items() if h}
+        self.__event_types = dxlink.subscribed_event_types(self.__handlers, event_types)
+        if not self.__event_types:
+            raise InvalidArgument('At least one feed event handler must be provided')
+
+        self.__translations = streamer_symbol_translations
+        self.__streamer_symbol_translations_factory = streamer_symbol_translations_factory
+        self.__latest_values = LatestValues() if config.latest_values else None
+        # Shards receive on their own threads, so unless handlers can cope with that, take turns calling them
+        self.__handler_lock = threading.Lock() if serialize_handlers else nullcontext()
+        # Latest values are kept across shards, here
+        config = replace(config, latest_values=False)
+        if processes:
+            self.__shards: List[_Shard] = [
+                _ProcessShard(i, url, token, translations, self.__event_types, self.__deliver, config)
+                for i, translations in enumerate(_partition(streamer_symbol_translations, shards))
+            ]
+        else:
+            self.__shards = [
+                _ThreadShard(i, url, token, translations, self.__event_types, self.__deliver, config, token_provider)
+                for i, translations in enumerate(_partition(streamer_symbol_translations, shards))
+            ]
+
+    def open(self, timeout_seconds: float = HANDSHAKE_TIMEOUT_SECONDS) -> 'ShardedSubscription':
+        """
+        Connect every shard, and start listening for feed events
+
+        :param timeout_seconds: How long to wait for each step of each shard's DXLink handshake before giving up
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.__shards)) as executor:
+                # Raises the first shard's failure, if any, after every shard has finished trying
+                list(executor.map(lambda shard: shard.open(timeout_seconds), self.__shards))
+        except TastytradeSdkException:
+            self.close()
+            raise
+        return self
+
+    def close(self) -> None:
+        """Close every shard's connection"""
+        for shard in self.__shards:
+            try:
+                shard.close()
+            except Exception: # pylint: disable=broad-except
+                logging.exception('Failed to close shard %s', shard.index)
+
+    @property
+    def latest_values(self) -> Optional[LatestValues]:
+        """
+        The latest event per symbol and event type, across shards. `None` unless the subscription was created with
+        `SubscriptionConfig.latest_values`.
+        """
+        return self.__latest_values
+
+    def health(self) -> List[ShardHealth]:
+        return [shard.health() for shard in self.__shards]
+
+    def add_symbols(self, symbols: List[str], event_types: Optional[List[str]] = None) -> None:
+        """
+        Subscribe to more symbols without reconnecting. Each goes to the shard it belongs to.
+        :param symbols: Symbols to add. Can be across multiple instrument types.
+        :param event_types: The event types to add them for, e.g. `['Quote']`. Defaults to every event type this
+        subscription has a handler for.
+        """
+        self.__validate_event_types(event_types)
+        translations = self.__translations
+        if self.__streamer_symbol_translations_factory:
+            self.__streamer_symbol_translations_factory.extend(translations, symbols)
+        unknown = [s for s in symbols if translations.get_streamer_symbol(s) is None]
+        if unknown:
+            raise InvalidArgument(f'Unknown symbols: {", ".join(unknown)}')
+        for shard, symbols_of_shard in self.__by_shard(symbols).items():
+            shard.symbols.update(symbols_of_shard)
+            shard.add([(s, translations.get_streamer_symbol(s)) for s in symbols_of_shard], event_types)
+
+    def remove_symbols(self, symbols: List[str], event_types: Optional[List[str]] = None) -> None:
+        """
+        Unsubscribe from symbols without reconnecting. Events already in flight may still be delivered.
+        :param symbols: Symbols to remove
+        :param event_types: The event types to remove them for, e.g. `['Quote']`. Defaults to every event type this
+        subscription has a handler for.
+        """
+        self.__validate_event_types(event_types)
+        for shard, symbols_of_shard in self.__by_shard(symbols).items():
+            if event_types is None:
+                shard.symbols.difference_update(symbols_of_shard)
+            shard.remove(symbols_of_shard, event_types)
+
+    def __validate_event_types(self, event_types: Optional[List[str]]) -> None:
+        unsupported = [t for t in event_types or [] if t not in self.__event_types]
+        if unsupported:
+            raise InvalidArgument(f'Not subscribed to event types: {", ".join(unsupported)}')
+
+    def __by_shard(self, symbols: List[str]) -> Dict[_Shard, List[str]]:
+        by_shard: Dict[_Shard, List[str]] = {}
+        for symbol in symbols:
+            by_shard.setdefault(self.__shards[shard_of(symbol, len(self.__shards))], []).append(symbol)
+        return by_shard
+
+    def __deliver(self, events: Frame) -> None:
+        if self.__latest_values:
+            self.__latest_values.update(events)
+        with self.__handler_lock:
+            for event_type, event in events:
+                handler = self.__handlers.get(event_type)
+                if handler:
+                    handler(event)
@@ -0,0 +1,119 @@
+import time
+from heapq import nlargest
+from typing import Any, Callable, Dict, List, Optional
+
+from tastytrade_sdk.instrumentation import Histogram, Stats
+from tastytrade_sdk.market_data import dxlink
+
+
+class SubscriptionStats:
+    """
+    Counters and timings for a subscription's hot path, cheap enough to leave on. See `snapshot` for what's
+    collected.
+    """
+
+    def __init__(self, stale_after_seconds: float = 60, slowest_symbols: int = 10):
+        """
+        :param stale_after_seconds: Symbols without an event for this long are reported as stale
+        :param slowest_symbols: How many of the symbols that handlers spent the most time on to report
+        """
+        self.__stale_after_seconds = stale_after_seconds
+        self.__slowest_symbols = slowest_symbols
+        self.__frames = 0
+        self.__events: Dict[str, int] = {}
+        self.__decode = Histogram()
+        self.__handlers = {t: Histogram() for t in dxlink.EVENT_TYPES}
+        self.__handler_seconds_by_symbol: Dict[str, float] = {}
+        self.__feed_lag = Histogram()
+        self.__last_event_at: Dict[str, float] = {}
+        self.__opened_at: Optional[float] = None
+        self.__disconnects = 0
+        self.__reconnects = 0
+
+    def opened(self) -> None:
+        """@private"""
+        self.__opened_at = time.monotonic()
+
+    def decoded(self, seconds: float) -> None:
+        """@private"""
+        self.__frames += 1
+        self.__decode.observe(seconds)
+
+    def received(self, events: List[Any]) -> None:
+        """@private"""
+        now = time.monotonic()
+        now_ms = time.time() * 1000
+        counts = self.__events
+        last_event_at = self.__last_event_at
+        for event_type, event in events:
+            counts[event_type] = counts.get(event_type, 0) + 1
+            last_event_at[event.symbol] = now
+            # Only Trade and Greeks carry the time the streamer created them
+            if event_type == 'Trade':
+                event_time = event.timestamp
+            elif event_type == 'Greeks':
+                event_time = event.time
+            else:
+                continue
+            if event_time:
+                self.__feed_lag.observe((now_ms - event_time) / 1000)
+
+    def timed(self, event_type: str, handler: Callable[[Any], None]) -> Callable[[Any], None]:
+        """@private"""
+        histogram = self.__handlers[event_type]
+        by_symbol = self.__handler_seconds_by_symbol
+        perf_counter = time.perf_counter
+
+        def timed_handler(event) -> None:
+            started_at = perf_counter()
+            try:
+                handler(event)
+            finally:
+                seconds = perf_counter() - started_at
+                histogram.observe(seconds)
+                # Unsynchronized, so with several dispatch workers a few increments may be lost. Fine for ranking.
+                by_symbol[event.symbol] = by_symbol.get(event.symbol, 0.0) + seconds
+
+        return timed_handler
+
+    def disconnected(self) -> None:
+        """@private"""
+        self.__disconnects += 1
+
+    def reconnected(self) -> None:
+        """@private"""
+        self.__reconnects += 1
+
+    def snapshot(self, symbols: Optional[List[str]] = None) -> Stats:
+        """
+        :param symbols: The symbols that are expected to have events, to detect stale ones among
+        :return: A dict of
+            - `frames`: FEED_DATA and other messages received
+            - `events`: Events received, per event type
+            - `decode_seconds`: Histogram of the time it took to decode each message into events
+            - `handler_seconds`: Histograms of the time handlers took per event, per event type
+            - `slowest_symbols`: `(symbol, seconds)` of the symbols that handlers spent the most time on in total
+            - `feed_lag_seconds`: Histogram of the time from when the streamer created an event to when it was
+              received, for event types that carry that time
+            - `stale_symbols`: Symbols without an event in the last `stale_after_seconds`
+            - `disconnects`, `reconnects`
+        """
+        now = time.monotonic()
+        last_event_at = dict(self.__last_event_at)
+        stale = []
+        if self.__opened_at is not None:
+            for symbol in symbols if symbols is not None else list(last_event_at):
+                if now - last_event_at.get(symbol, self.__opened_at) > self.__stale_after_seconds:
+                    stale.append(symbol)
+        return {
+            'frames': self.__frames,
+            'events': dict(self.__events),
+            'decode_seconds': self.__decode.snapshot(),
+            'handler_seconds': {t: h.snapshot() for t, h in self.__handlers.items()},
+            'slowest_symbols': nlargest(self.__slowest_symbols, dict(self.__handler_seconds_by_symbol).items(),
+                                        key=lambda item: item[1]),
+            'feed_lag_seconds': self.__feed_lag.snapshot(),
+            'stale_symbols': stale,
+            'disconnects': self.__disconnects,
+            'reconnects': self.__reconnects
+        }
@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from injector import inject, singleton
+
+from tastytrade_sdk.config import Config
+
+# Stay well under SQLITE_MAX_VARIABLE_NUMBER, which is 999 on older builds
+_SQLITE_CHUNK_SIZE = 500
+
+
+@singleton
+class StreamerSymbolCache:
+    """
+    Remembers symbol -> streamer symbol translations, so that symbols resolved recently don't need another round trip
+    to the instruments endpoints.
+
+    Entries expire after `Config.streamer_symbol_cache_ttl_seconds`, and the least recently used entries are evicted
+    once there are more than `Config.streamer_symbol_cache_max_size` of them in memory. When
+    `Config.streamer_symbol_cache_path` is set, entries are also kept in a sqlite database at that path, which can be
+    shared by several processes and survives restarts.
+    """
+
+    @inject
+    def __init__(self, config: Config):
+        self.__ttl_seconds = config.streamer_symbol_cache_ttl_seconds
+        self.__max_size = config.streamer_symbol_cache_max_size
+        self.__path = config.streamer_symbol_cache_path
+        self.__entries: 'OrderedDict[str, Tuple[str, float]]' = OrderedDict()
+        self.__lock = threading.Lock()
+        if self.__path:
+            with self.__connect() as connection:
+                connection.execute('CREATE TABLE IF NOT EXISTS streamer_symbols ('
+                                   'symbol TEXT PRIMARY KEY, streamer_symbol TEXT NOT NULL, expires_at REAL NOT NULL)')
+
+    def get_many(self, symbols: List[str]) -> Dict[str, str]:
+        """Return the streamer symbols of every symbol that is cached and hasn't expired"""
+        now = time.time()
+        hits = {}
+        with self.__lock:
+            for symbol in symbols:
+                entry = self.__entries.get(symbol)
+                if not entry:
+                    continue
+                if entry[1] <= now:
+                    del self.__entries[symbol]
+                    continue
+                self.__entries.move_to_end(symbol)
+                hits[symbol] = entry[0]
+        misses = [s for s in symbols if s not in hits]
+        if self.__path and misses:
+            stored = self.__load(misses, now)
+            with self.__lock:
+                for symbol, streamer_symbol, expires_at in stored:
+                    self.__remember(symbol, streamer_symbol, expires_at)
+                    hits[symbol] = streamer_symbol
+        return hits
+
+    def put_many(self, translations: List[Tuple[str, str]]) -> None:
+        """Cache `(symbol, streamer symbol)` pairs"""
+        if not translations:
+            return
+        expires_at = time.time() + self.__ttl_seconds
+        with self.__lock:
+            for symbol, streamer_symbol in translations:
+                self.__remember(symbol, streamer_symbol, expires_at)
+        if self.__path:
+            with self.__connect() as connection:
+                connection.executemany('INSERT OR REPLACE INTO streamer_symbols VALUES (?, ?, ?)',
+                                       [(s, x, expires_at) for s, x in translations])
+                connection.execute('DELETE FROM streamer_symbols WHERE expires_at <= ?', (time.time(),))
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+        if self.__path:
+            with self.__connect() as connection:
+                connection.execute('DELETE FROM streamer_symbols')
+
+    def __remember(self, symbol: str, streamer_symbol: str, expires_at: float) -> None:
+        self.__entries[symbol] = (streamer_symbol, expires_at)
+        self.__entries.move_to_end(symbol)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def __load(self, symbols: List[str], now: float) -> List[Tuple[str, str, float]]:
+        rows = []
+        with self.__connect() as connection:
+            for i in range(0, len(symbols), _SQLITE_CHUNK_SIZE):
+                chunk = symbols[i:i + _SQLITE_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows += connection.execute(
+                    'SELECT symbol, streamer_symbol, expires_at FROM streamer_symbols '
+                    f'WHERE expires_at > ? AND symbol IN ({placeholders})',
+                    [now] + chunk
+                ).fetchall()
+        return rows
+
+    @contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps this safe to use from any thread, and the timeout lets concurrent
+        # processes wait for each other's writes instead of failing
+        connection = sqlite3.connect(self.__path, timeout=10)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
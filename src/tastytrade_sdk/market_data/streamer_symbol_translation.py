@@ -1,10 +1,25 @@
+import logging
+import re
 import urllib.parse
-from typing import List, Optional, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from bidict import bidict
 from injector import inject
 
 from tastytrade_sdk.api import Api
+from tastytrade_sdk.market_data.streamer_symbol_cache import StreamerSymbolCache
+
+# Keeps each lookup's query string comfortably under common URL length limits, even for OCC option symbols
+LOOKUP_CHUNK_SIZE = 100
+LOOKUP_MAX_WORKERS = 8
+
+# OCC option symbols: a root symbol padded to six characters, then YYMMDD, C or P, and the strike times 1000
+_EQUITY_OPTION_PATTERN = re.compile(r'^[A-Z0-9./]{1,6} *\d{6}[CP]\d{8}$')
+_CRYPTOCURRENCY_PATTERN = re.compile(r'^[A-Z0-9]+[/-]USD$')
+_EXTRA_PARAMS: Dict[str, List[Tuple[str, Any]]] = {
+    'equity-options': [('with-expired', True)]
+}
 
 
 class StreamerSymbolTranslations:
@@ -17,6 +32,12 @@ class StreamerSymbolTranslations:
     def get_original_symbol(self, streamer_symbol: str) -> str:
         return self.__bidict.inv[streamer_symbol]
 
+    def update(self, other: 'StreamerSymbolTranslations') -> None:
+        self.__bidict.update(other.items())
+
+    def items(self) -> List[Tuple[str, str]]:
+        return list(self.__bidict.items())
+
     @property
     def streamer_symbols(self) -> List[str]:
         return list(self.__bidict.values())
@@ -24,23 +45,80 @@ class StreamerSymbolTranslations:
 
 class StreamerSymbolTranslationsFactory:
     @inject
-    def __init__(self, api: Api):
+    def __init__(self, api: Api, cache: StreamerSymbolCache):
         self.__api = api
+        self.__cache = cache
 
     def create(self, symbols: List[str]) -> StreamerSymbolTranslations:
-        equities = self.__get_symbol_translations('equities', symbols)
-        futures = self.__get_symbol_translations('futures', symbols)
-        equity_options = self.__get_symbol_translations('equity-options', symbols, [('with-expired', True)])
-        future_options = self.__get_symbol_translations('future-options', symbols)
-        cryptos = self.__get_symbol_translations('cryptocurrencies', symbols)
-        return StreamerSymbolTranslations(equities + futures + equity_options + future_options + cryptos)
-
-    def __get_symbol_translations(self, path_key: str, symbols: Optional[List[str]] = None,
-                                  extra_params: Optional[List[Tuple[str, Any]]] = None) -> List[Tuple[str, str]]:
+        cached = self.__cache.get_many(symbols)
+        symbols_by_path_key: Dict[str, List[str]] = {}
+        for symbol in symbols:
+            if symbol not in cached:
+                symbols_by_path_key.setdefault(instrument_path_key(symbol), []).append(symbol)
+        canonical = self.__look_up(symbols_by_path_key)
+        # The API answers with its own spelling of each symbol, e.g. upper case or OCC padding. Translations are kept
+        # under the symbols as requested, and cached under both spellings, so that asking again hits the cache.
+        requested = {_normalized(s): s for path_symbols in symbols_by_path_key.values() for s in path_symbols}
+        fetched = [(requested.get(_normalized(s), s), x) for s, x in canonical]
+        found = {s for s, _ in fetched}
+        for path_key, path_symbols in symbols_by_path_key.items():
+            missing = [s for s in path_symbols if s not in found]
+            if missing:
+                # Either unknown, or their shape sent them to the wrong endpoint
+                logging.warning('No streamer symbols found at /instruments/%s for: %s', path_key, ', '.join(missing))
+        self.__cache.put_many(list(dict(canonical + fetched).items()))
+        # Two spellings of a symbol share a streamer symbol, and only the first one asked for is kept
+        unique = {x: s for s, x in reversed(list(cached.items()) + fetched)}
+        return StreamerSymbolTranslations([(s, x) for x, s in unique.items()])
+
+    def extend(self, translations: StreamerSymbolTranslations, symbols: List[str]) -> List[str]:
+        """
+        Look up only the symbols that `translations` doesn't already know about, add them to it, and return the
+        streamer symbols of every symbol that could be translated
+        """
+        unknown = [s for s in symbols if translations.get_streamer_symbol(s) is None]
+        if unknown:
+            translations.update(self.create(unknown))
+        return [x for x in (translations.get_streamer_symbol(s) for s in symbols) if x is not None]
+
+    def __look_up(self, symbols_by_path_key: Dict[str, List[str]]) -> List[Tuple[str, str]]:
+        lookups = [(path_key, chunk) for path_key, path_symbols in symbols_by_path_key.items()
+                   for chunk in _chunks(path_symbols, LOOKUP_CHUNK_SIZE)]
+        if len(lookups) <= 1:
+            results = [self.__get_symbol_translations(*lookup) for lookup in lookups]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(lookups), LOOKUP_MAX_WORKERS)) as executor:
+                results = list(executor.map(lambda lookup: self.__get_symbol_translations(*lookup), lookups))
+        return [translation for result in results for translation in result]
+
+    def __get_symbol_translations(self, path_key: str, symbols: Optional[List[str]] = None) -> List[Tuple[str, str]]:
         if not symbols:
             return []
         items = self.__api.get(
             f'/instruments/{path_key}',
-            params=[('symbol[]', urllib.parse.quote(x.upper())) for x in symbols or []] + (extra_params or [])
+            params=[('symbol[]', urllib.parse.quote(x.upper())) for x in symbols] + _EXTRA_PARAMS.get(path_key, [])
         ).get('data').get('items')
         return [(x['symbol'], x['streamer-symbol']) for x in items if 'streamer-symbol' in x]
+
+
+def instrument_path_key(symbol: str) -> str:
+    """Guess which `/instruments/{path_key}` endpoint knows about a symbol from the shape of the symbol"""
+    symbol = symbol.upper()
+    if symbol.startswith('./'):
+        return 'future-options'
+    if symbol.startswith('/'):
+        return 'futures'
+    if _EQUITY_OPTION_PATTERN.match(symbol):
+        return 'equity-options'
+    if _CRYPTOCURRENCY_PATTERN.match(symbol):
+        return 'cryptocurrencies'
+    return 'equities'
+
+
+def _normalized(symbol: str) -> str:
+    return symbol.upper().replace(' ', '')
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
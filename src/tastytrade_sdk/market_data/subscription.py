@@ -2,213 +2,543 @@ import datetime as dt
 import logging
 import threading
 import time
-from itertools import product
-from math import floor
-from typing import Callable, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
 
-import ujson
-from websockets.exceptions import ConnectionClosedOK
+from websockets.exceptions import ConnectionClosed, WebSocketException
 from websockets.sync.client import connect, ClientConnection
 
 from tastytrade_sdk.exceptions import TastytradeSdkException, InvalidArgument
-from tastytrade_sdk.market_data.models import Profile, Quote, Summary, Trade, Greeks
-from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+from tastytrade_sdk.instrumentation import Exporter, Stats
+from tastytrade_sdk.market_data import dxlink
+from tastytrade_sdk.market_data.codec import Codec
+from tastytrade_sdk.market_data.dispatch import DispatchConfig, Dispatcher, DispatchStats
+from tastytrade_sdk.market_data.dxlink import DxLinkProtocol, StreamerDisconnected, StreamerException, \
+    StreamerTimeout, HANDSHAKE_TIMEOUT_SECONDS
+from tastytrade_sdk.market_data.latest_values import LatestValues
+from tastytrade_sdk.market_data.recording import FrameRecorder
+from tastytrade_sdk.market_data.recovery import Gap, ReconnectPolicy, TradeGapDetector
+from tastytrade_sdk.market_data.stats import SubscriptionStats
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations, \
+    StreamerSymbolTranslationsFactory
+
+if TYPE_CHECKING:
+    from tastytrade_sdk.market_data.batches import SymbolIds
+    from tastytrade_sdk.market_data.candles import CandleHistory, Candles
+
+# Receives one numpy structured array per FEED_DATA frame, see `tastytrade_sdk.market_data.batches.BATCH_DTYPES`
+BatchHandler = Callable[[Any], None]
+
+DEFAULT_SUBSCRIPTION_CHUNK_SIZE = 500
+DEFAULT_SUBSCRIPTION_PACE_SECONDS = 0.05
+
+
+@dataclass
+class BatchHandlers:
+    """
+    Handlers for all the events of a type in a FEED_DATA frame at once, as a numpy structured array. Symbols are in
+    the `symbol_id` column, see `Subscription.symbol_ids`. Requires numpy.
+    """
+    quote: Optional[BatchHandler] = None
+    summary: Optional[BatchHandler] = None
+    trade: Optional[BatchHandler] = None
+    greeks: Optional[BatchHandler] = None
+    candle: Optional[BatchHandler] = None
+
+    def by_event_type(self) -> Dict[str, BatchHandler]:
+        """@private"""
+        handlers = (self.quote, self.summary, self.trade, self.greeks, self.candle)
+        return {t: h for t, h in zip(dxlink.BATCH_EVENT_TYPES, handlers) if h}
+
+
+@dataclass
+class CandleConfig:
+    """Which candles to subscribe to, and where they go besides the `Candle` handler"""
+    period: str = dxlink.DEFAULT_CANDLE_PERIOD
+    """The period of the candles, e.g. `'1m'`, `'5m'`, `'1h'` or `'1d'`"""
+    from_time: Optional[Union[dt.datetime, int]] = None
+    """
+    Start with a snapshot of the candles since this time, epoch milliseconds or a `datetime`, naive ones being UTC
+    """
+    history: bool = False
+    """
+    Collect candles, starting with the snapshot, into NumPy arrays in `Subscription.candle_history`, without building
+    a `Candle` per event. Requires numpy.
+    """
+    on_snapshot: Optional[Callable[[str, 'Candles'], None]] = None
+    """Called with a symbol and its candles once the snapshot of its history is complete"""
+
+
+@dataclass
+class SubscriptionConfig:
+    """How a subscription delivers events, recovers from dropped connections and reports on itself"""
+    frozen_events: bool = False
+    """Deliver immutable, hashable events, e.g. to safely share them across threads"""
+    latest_values: bool = False
+    """Keep the latest event per symbol and event type in `Subscription.latest_values`"""
+    dispatch: Optional[DispatchConfig] = None
+    """
+    Run handlers on worker threads behind bounded queues, so that slow handlers don't hold up reading the socket. By
+    default, handlers run on the receiving thread.
+    """
+    reconnect: Optional[ReconnectPolicy] = ReconnectPolicy()
+    """How to reconnect and resubscribe when the connection drops. `None` to stay disconnected."""
+    on_disconnect: Optional[Callable[[BaseException], None]] = None
+    """Called with the cause when the connection drops, before reconnecting"""
+    on_resync: Optional[Callable[[], None]] = None
+    """Called once reconnected and resubscribed. Events may have been missed in between."""
+    on_gap: Optional[Callable[[Gap], None]] = None
+    """Called when the sequence numbers of `Trade` events show that some were missed"""
+    recorder: Optional[FrameRecorder] = None
+    """
+    Record every raw frame received, e.g. to replay them later with `ReplaySubscription`. Closing the subscription
+    closes the recorder too.
+    """
+    on_stats: Optional[Callable[[Stats], None]] = None
+    """Called with `Subscription.stats` every `stats_interval_seconds`, e.g. to export them to a metrics system"""
+    stats_interval_seconds: float = 60
+    subscription_chunk_size: Optional[int] = DEFAULT_SUBSCRIPTION_CHUNK_SIZE
+    """The maximum number of subscriptions per FEED_SUBSCRIPTION message. `None` to send them all at once."""
+    subscription_pace_seconds: float = DEFAULT_SUBSCRIPTION_PACE_SECONDS
+    """How long to wait between FEED_SUBSCRIPTION messages"""
 
 
 class LoopThread(threading.Thread):
-    def __init__(self, activity: Callable, timeout_seconds: int = 0):
+    def __init__(self, activity: Callable, timeout_seconds: float = 0,
+                 stop_event: Optional[threading.Event] = None):
         threading.Thread.__init__(self)
-        self.__running = True
+        self.__stop_event = stop_event or threading.Event()
         self.__activity = activity
         self.__timeout_seconds = timeout_seconds
         super().start()
 
     def run(self):
-        while self.__running:
+        while not self.__stop_event.is_set():
             self.__activity()
             self.__pause()
 
     def __pause(self):
         if not self.__timeout_seconds:
             return
-        start = time.time()
-        while self.__running and time.time() - start <= self.__timeout_seconds:
-            continue
+        # Blocks without using any CPU until either the interval elapses or the loop is stopped
+        self.__stop_event.wait(self.__timeout_seconds)
 
     def stop(self):
-        self.__running = False
+        self.__stop_event.set()
+
+
+class Handshake:
+    """Tracks which DXLink handshake messages have been received, so that callers can block until one arrives"""
+    SETUP = dxlink.SETUP
+    AUTHORIZED = dxlink.AUTHORIZED
+    CHANNEL_OPENED = dxlink.CHANNEL_OPENED
+
+    def __init__(self):
+        self.__condition = threading.Condition()
+        self.__reached = set()
+        self.__error: Optional[TastytradeSdkException] = None
+
+    def reach(self, state: str) -> None:
+        with self.__condition:
+            self.__reached.add(state)
+            self.__condition.notify_all()
+
+    def fail(self, error: TastytradeSdkException) -> None:
+        with self.__condition:
+            self.__error = error
+            self.__condition.notify_all()
+
+    def wait_for(self, state: str, timeout_seconds: float) -> None:
+        with self.__condition:
+            if not self.__condition.wait_for(lambda: state in self.__reached or self.__error, timeout_seconds):
+                raise StreamerTimeout(state, timeout_seconds)
+            # A failure after the state was reached, e.g. the connection closing, is for the receive loop to handle
+            if state not in self.__reached:
+                raise self.__error
+
+
+def _connect(url: str, **kwargs) -> ClientConnection:
+    """
+    Open a websocket connection that outlives the call. The subscription closes it itself, which entering it as a
+    context manager promises, so that newer websockets versions don't warn about a connection used without one.
+    """
+    return connect(url, **kwargs).__enter__()  # pylint: disable=unnecessary-dunder-call
 
 
 class Subscription:
     __websocket: Optional[ClientConnection] = None
-    __keepalive_thread: Optional[LoopThread]
-    __receive_thread: Optional[LoopThread]
-    __is_authorized: bool = False
+    __keepalive_thread: Optional[LoopThread] = None
+    __receive_thread: Optional[LoopThread] = None
 
     def __init__(self, url: str, token: str, streamer_symbol_translations: StreamerSymbolTranslations,
-                 on_profile: Optional[Callable[[Profile], None]] = None,
-                 on_quote: Optional[Callable[[Quote], None]] = None,
-                 on_summary: Optional[Callable[[Summary], None]] = None,
-                 on_trade: Optional[Callable[[Trade], None]] = None,
-                 on_greeks: Optional[Callable[[Greeks], None]] = None):
-        """@private"""
+                 handlers: Dict[str, Callable[[Any], None]],
+                 batch_handlers: Optional[BatchHandlers] = None,
+                 event_types: Optional[List[str]] = None,
+                 config: Optional[SubscriptionConfig] = None,
+                 candles: Optional[CandleConfig] = None,
+                 streamer_symbol_translations_factory: Optional[StreamerSymbolTranslationsFactory] = None,
+                 token_provider: Optional[Callable[[], str]] = None,
+                 on_frame: Optional[Callable[[List[Tuple[str, Any]]], None]] = None,
+                 connector: Callable[..., ClientConnection] = _connect,
+                 stats: Optional[SubscriptionStats] = None,
+                 codec: Optional[Codec] = None):
+        """
+        @private
 
-        if not (on_profile or on_quote or on_summary or on_trade or on_greeks):
+        :param handlers: Event handlers by event type, e.g. `{'Quote': on_quote}`
+        :param on_frame: Receives all the events of a FEED_DATA frame instead of them going to the handlers
+        :param connector: Opens the websocket connection, given the url
+        :param stats: Collects counters and timings, see `stats`
+        :param codec: The JSON codec for streamer messages, the fastest one installed by default
+        """
+        config = config or SubscriptionConfig()
+        candles = candles or CandleConfig()
+        self.__handlers = {t: h for t, h in handlers.items() if h}
+        self.__batch_handlers = (batch_handlers or BatchHandlers()).by_event_type()
+        self.__on_candle_batch = self.__batch_handlers.get('Candle')
+        self.__candle_history: Optional['CandleHistory'] = None
+        if candles.history:
+            # Candles are collected from batches, so that a snapshot of history doesn't become an object per candle
+            self.__batch_handlers['Candle'] = self.__collect_candles
+        if config.on_gap:
+            # Gaps are detected from Trade events, so they're needed even without a Trade handler
+            event_types = (event_types or []) + ['Trade']
+        self.__event_types = dxlink.subscribed_event_types(self.__handlers, event_types)
+        if not (self.__event_types or self.__batch_handlers):
             raise InvalidArgument('At least one feed event handler must be provided')
 
         self.__url = url
         self.__token = token
-        self.__streamer_symbol_translations = streamer_symbol_translations
-        self.__on_profile = on_profile
-        self.__on_quote = on_quote
-        self.__on_summary = on_summary
-        self.__on_trade = on_trade
-        self.__on_greeks = on_greeks
-
-    def open(self) -> 'Subscription':
-        """Start listening for feed events"""
-        self.__websocket = connect(self.__url)
-        self.__receive_thread = LoopThread(self.__receive)
-
-        subscription_types = []
-        if self.__on_profile:
-            subscription_types.append('Profile')
-        if self.__on_quote:
-            subscription_types.append('Quote')
-        if self.__on_summary:
-            subscription_types.append('Summary')
-        if self.__on_trade:
-            subscription_types.append('Trade')
-        if self.__on_greeks:
-            subscription_types.append('Greeks')
-
-        subscriptions = [{'symbol': s, 'type': t} for s, t in
-                         product(self.__streamer_symbol_translations.streamer_symbols, subscription_types)]
-
-        self.__send('SETUP', version='0.1', keepaliveTimeout=60, acceptKeepaliveTimeout=60)#, version='0.1-js/1.0.0')
-        self.__send('AUTH', token=self.__token)
-        while not self.__is_authorized:
-            continue
-        self.__send('CHANNEL_REQUEST', channel=1, service='FEED', parameters={'contract': 'AUTO'})
-        self.__send('FEED_SUBSCRIPTION', channel=1, add=subscriptions)
+        self.__protocol = DxLinkProtocol(streamer_symbol_translations, self.__event_types, config.frozen_events,
+                                         list(self.__batch_handlers), codec, candles.period, candles.from_time)
+        if candles.history:
+            self.__candle_history = _candle_history(self.__protocol.symbol_ids, candles.on_snapshot)
+        self.__latest_values = LatestValues() if config.latest_values else None
+        self.__streamer_symbol_translations_factory = streamer_symbol_translations_factory
+        self.__config = config
+        self.__dispatcher: Optional[Dispatcher] = None
+        self.__token_provider = token_provider
+        self.__token_stale = False
+        self.__gap_detector = TradeGapDetector() if config.on_gap else None
+        self.__on_frame = on_frame
+        self.__connector = connector
+        self.__stats = stats
+        if stats:
+            self.__handlers = {t: stats.timed(t, h) for t, h in self.__handlers.items()}
+        self.__stats_exporter = Exporter(self.stats, config.on_stats, config.stats_interval_seconds) \
+            if stats and config.on_stats else None
+        self.__handshake = Handshake()
+        self.__closed = threading.Event()
+        # Set once the feed is set up on the current connection, so that subscription changes can go out right away
+        self.__ready = threading.Event()
+
+    def open(self, timeout_seconds: float = HANDSHAKE_TIMEOUT_SECONDS) -> 'Subscription':
+        """
+        Start listening for feed events
+
+        :param timeout_seconds: How long to wait for each step of the DXLink handshake before giving up
+        """
+        if self.__config.dispatch:
+            self.__dispatcher = Dispatcher(self.__config.dispatch)
+        self.__websocket = self.__connector(self.__url)
+        self.__receive_thread = LoopThread(self.__receive, stop_event=self.__closed)
+
+        try:
+            self.__send(self.__protocol.setup())
+            self.__handshake.wait_for(Handshake.SETUP, timeout_seconds)
+            self.__send(self.__protocol.auth(self.__token))
+            self.__handshake.wait_for(Handshake.AUTHORIZED, timeout_seconds)
+            self.__send(self.__protocol.channel_request())
+            self.__handshake.wait_for(Handshake.CHANNEL_OPENED, timeout_seconds)
+        except TastytradeSdkException:
+            self.close()
+            raise
+        self.__send(self.__protocol.feed_setup())
+        self.__ready.set()
+        if self.__stats:
+            self.__stats.opened()
+        if self.__stats_exporter:
+            self.__stats_exporter.start()
+        self.__subscribe_all()
         return self
 
     def close(self) -> None:
         """Close the stream connection"""
-        if self.__keepalive_thread:
-            self.__keepalive_thread.stop()
-        if self.__receive_thread:
-            self.__receive_thread.stop()
+        self.__closed.set()
+        self.__ready.clear()
         if self.__websocket:
             self.__websocket.close()
+        for thread in (self.__keepalive_thread, self.__receive_thread):
+            if thread and thread is not threading.current_thread():
+                thread.join()
+        if self.__dispatcher:
+            self.__dispatcher.stop()
+            self.__dispatcher = None
+        if self.__stats_exporter:
+            self.__stats_exporter.stop()
+        if self.__config.recorder:
+            # Nothing more is received, so finish the segment being written
+            self.__config.recorder.close()
+
+    @property
+    def latest_values(self) -> Optional[LatestValues]:
+        """
+        The latest event per symbol and event type. `None` unless the subscription was created with
+        `SubscriptionConfig.latest_values`.
+        """
+        return self.__latest_values
+
+    @property
+    def candle_history(self) -> Optional['CandleHistory']:
+        """
+        The candles of every symbol, including the snapshot of history since `CandleConfig.from_time`. `None` unless
+        the subscription was created with `CandleConfig.history`. Requires numpy.
+        """
+        return self.__candle_history
+
+    def stats(self) -> Stats:
+        """
+        A snapshot of counters and timings, see `tastytrade_sdk.market_data.stats.SubscriptionStats.snapshot`. Empty
+        unless the subscription was created with stats enabled.
+        """
+        if not self.__stats:
+            return {}
+        translations = self.__protocol.streamer_symbol_translations
+        symbols = list(dict.fromkeys(translations.get_original_symbol(s) for s, _ in self.__protocol.subscriptions))
+        return self.__stats.snapshot(symbols)
+
+    @property
+    def connected(self) -> bool:
+        """Whether the feed is currently set up, as opposed to connecting, reconnecting or closed"""
+        return self.__ready.is_set()
+
+    @property
+    def dispatch_stats(self) -> Optional[DispatchStats]:
+        """Queue depths and drop/conflation counts. `None` unless created with `SubscriptionConfig.dispatch`."""
+        return self.__dispatcher.stats() if self.__dispatcher else None
+
+    @property
+    def symbol_ids(self) -> Optional['SymbolIds']:
+        """Maps the `symbol_id` column of batches back to symbols. `None` unless batch handlers were provided."""
+        return self.__protocol.symbol_ids
+
+    def add_symbols(self, symbols: List[str], event_types: Optional[List[str]] = None) -> None:
+        """
+        Subscribe to more symbols without reconnecting. Only symbols that haven't been seen by this subscription
+        before are looked up.
+        :param symbols: Symbols to add. Can be across multiple instrument types.
+        :param event_types: The event types to add them for, e.g. `['Quote']`. Defaults to every event type this
+        subscription has a handler for.
+        """
+        self.__protocol.validate_event_types(event_types)
+        self.__send_change(self.__protocol.add_subscriptions(self.__streamer_symbols(symbols), event_types))
+
+    def remove_symbols(self, symbols: List[str], event_types: Optional[List[str]] = None) -> None:
+        """
+        Unsubscribe from symbols without reconnecting. Events already in flight may still be delivered.
+        :param symbols: Symbols to remove
+        :param event_types: The event types to remove them for, e.g. `['Quote']`. Defaults to every event type this
+        subscription has a handler for.
+        """
+        translations = self.__protocol.streamer_symbol_translations
+        streamer_symbols = [x for x in (translations.get_streamer_symbol(s) for s in symbols) if x is not None]
+        self.__send_change(self.__protocol.remove_subscriptions(streamer_symbols, event_types))
+
+    def __streamer_symbols(self, symbols: List[str]) -> List[str]:
+        translations = self.__protocol.streamer_symbol_translations
+        if self.__streamer_symbol_translations_factory:
+            return self.__streamer_symbol_translations_factory.extend(translations, symbols)
+        unknown = [s for s in symbols if translations.get_streamer_symbol(s) is None]
+        if unknown:
+            raise InvalidArgument(f'Unknown symbols: {", ".join(unknown)}')
+        return [translations.get_streamer_symbol(s) for s in symbols]
 
     def __receive(self) -> None:
-        if not self.__websocket:
+        websocket = self.__websocket
+        if not websocket:
+            return
+        try:
+            raw = websocket.recv()
+        except ConnectionClosed as e:
+            # Unblocks `open` with the reason, if the connection closed before the handshake completed
+            error = StreamerDisconnected(str(e))
+            error.__cause__ = e
+            self.__handshake.fail(error)
+            self.__disconnected(e)
             return
+        if self.__config.recorder:
+            self.__config.recorder.record(raw)
         try:
-            message = ujson.loads(self.__websocket.recv())
-        except ConnectionClosedOK:
+            if self.__stats:
+                started_at = time.perf_counter()
+                state, events, batches = self.__protocol.handle(raw)
+                self.__stats.decoded(time.perf_counter() - started_at)
+            else:
+                state, events, batches = self.__protocol.handle(raw)
+        except StreamerException as e:
+            if self.__config.reconnect and self.__ready.is_set():
+                # e.g. the token expired, so start over on a new connection with a new token
+                logging.error('Streamer error, reconnecting: %s', e)
+                self.__token_stale = True
+                websocket.close()
+                self.__disconnected(e)
+                return
+            self.__handshake.fail(e)
+            raise
+        if state:
+            self.__reach(state)
+            self.__handshake.reach(state)
+        self.__deliver(events, batches)
+
+    def __reach(self, state: str) -> None:
+        if state == Handshake.SETUP and not self.__keepalive_thread:
+            self.__keepalive_thread = LoopThread(lambda: self.__send(self.__protocol.keepalive()),
+                                                 self.__protocol.keepalive_interval, stop_event=self.__closed)
+
+    def __deliver(self, events: List[Tuple[str, Any]], batches: List[Tuple[str, Any]]) -> None:
+        if events:
+            self.__observe(events)
+        if self.__on_frame:
+            if events:
+                self.__on_frame(events)
+            return
+        dispatcher = self.__dispatcher
+        if dispatcher:
+            for event_type, event in events:
+                handler = self.__handlers.get(event_type)
+                if handler:
+                    dispatcher.submit((event_type, event.symbol), event.symbol, handler, event)
+            for event_type, batch in batches:
+                dispatcher.submit(None, None, self.__batch_handlers[event_type], batch)
+            return
+        for event_type, event in events:
+            handler = self.__handlers.get(event_type)
+            if handler:
+                handler(event)
+        for event_type, batch in batches:
+            self.__batch_handlers[event_type](batch)
+
+    def __observe(self, events: List[Tuple[str, Any]]) -> None:
+        """Everything that sees events before the handlers do"""
+        if self.__stats:
+            self.__stats.received(events)
+        if self.__latest_values:
+            self.__latest_values.update(events)
+        if self.__gap_detector:
+            for event_type, event in events:
+                if event_type == 'Trade':
+                    gap = self.__gap_detector.check(event)
+                    if gap:
+                        self.__config.on_gap(gap)
+
+    def __collect_candles(self, batch: Any) -> None:
+        self.__candle_history.update(batch)
+        if self.__on_candle_batch:
+            self.__on_candle_batch(batch)
+
+    def __disconnected(self, error: BaseException) -> None:
+        was_ready = self.__ready.is_set()
+        self.__ready.clear()
+        if self.__closed.is_set():
             return
-        _type = message['type']
-        if _type == 'ERROR':
-            raise StreamerException(message['error'], message['message'])
-        if _type == 'SETUP': # also contains a more specific version number
-            keepalive_interval = floor(message['keepaliveTimeout'] / 2)
-            self.__keepalive_thread = LoopThread(lambda: self.__send('KEEPALIVE'), keepalive_interval)
-        elif _type == 'AUTH_STATE': # userId is returned here on 'AUTHORIZED' message
-            self.__is_authorized = message['state'] == 'AUTHORIZED'
-        elif _type == 'FEED_DATA':
-            for event in message['data']:
-                self.__handle_feed_event(event)
-        #elif _type == 'CHANNEL_OPENED': # Why is this returned twice?
-            #pass # what is subFormat parameter returned here?
-        #elif _type == 'FEED_CONFIG':
-            #pass
-        #elif _type == 'KEEPALIVE': # shouldn't be necessary since self.__keepalive_thread
-            #self.__send('KEEPALIVE') # is created
-        else:
-            logging.debug('Unhandled message type: %s', _type)
-
-    def __handle_feed_event(self, event: dict) -> None:
-        event_type = event['eventType']
-        original_symbol = self.__streamer_symbol_translations.get_original_symbol(event['eventSymbol'])
-        if event_type == 'Profile' and self.__on_profile:
-            self.__on_profile(Profile(
-                symbol=original_symbol,
-                description=event['description'],
-                hi52wk=event['high52WeekPrice'],
-                lo52wk=event['low52WeekPrice'],
-                beta=event['beta'],
-                earningsPerShare=event['earningsPerShare'],
-                dividendFreq=event['dividendFrequency'],
-                exDividendAmount=event['exDividendAmount'],
-                shares=event['shares'],
-                freeFloat=event['freeFloat']
-            ))
-        elif event_type == 'Quote' and self.__on_quote:
-            self.__on_quote(Quote(
-                symbol=original_symbol,
-                bid_price=event['bidPrice'],
-                bid_size=event['bidSize'],
-                bid_exchange_code=event['bidExchangeCode'],
-                ask_price=event['askPrice'],
-                ask_size=event['askSize'],
-                ask_exchange_code=event['askExchangeCode']
-            ))
-        elif event_type == 'Summary' and self.__on_summary:
-            self.__on_summary(Summary(
-                symbol=original_symbol,
-                eventSymbol=event['eventSymbol'],
-                dayId=event['dayId'],
-                dayOpen=event['dayOpenPrice'],
-                dayHigh=event['dayHighPrice'],
-                dayLow=event['dayLowPrice'],
-                dayClose=event['dayClosePrice'],
-                prevDayId=event['prevDayId'],
-                prevClose=event['prevDayClosePrice'],
-                prevDayVolume=event['prevDayVolume'],
-                openInterest=event['openInterest']
-            ))
-        elif event_type == 'Trade' and self.__on_trade:
-            self.__on_trade(Trade(
-                symbol=original_symbol,
-                eventSymbol=event['eventSymbol'],
-                # necessary to convert to sec then datetime
-                time=dt.datetime.utcfromtimestamp(event['time'] / 1000),
-                # ^^^ very important that this step is done once
-                # and nowhere else ***
-                sequence=event['sequence'],
-                exchangeCode=event['exchangeCode'],
-                price=event['price'],
-                change=event['change'],
-                size=event['size'],
-                extendedTradingHours=event['extendedTradingHours'],
-                dayId=event['dayId'],
-                dayVolume=event['dayVolume'],
-                dayTurnover=event['dayTurnover']
-            ))
-        elif event_type == 'Greeks' and self.__on_greeks:
-            self.__on_greeks(Greeks(
-                symbol=original_symbol,
-                time=event['time'],
-                price=event['price'],
-                volatility=event['volatility'],
-                delta=event['delta'],
-                gamma=event['gamma'],
-                theta=event['theta'],
-                vega=event['vega'],
-                rho=event['rho']
-            ))
-        else:
-            logging.debug('Unhandled feed event type %s for symbol %s', event_type, original_symbol)
-
-    def __send(self, _type: str, channel: Optional[int] = 0, **kwargs) -> None:
-        self.__websocket.send(ujson.dumps({
-            **{'type': _type, 'channel': channel},
-            **kwargs
-        }))
-
-
-class StreamerException(TastytradeSdkException):
-    def __init__(self, error: str, message: str):
-        super().__init__(f'{error}: {message}')
+        reconnect = self.__config.reconnect
+        if not (reconnect and was_ready):
+            # Nothing more will arrive on this connection, so let the keepalive and receive loops wind down
+            self.__closed.set()
+            return
+        logging.warning('Disconnected from the streamer: %s', error)
+        if self.__stats:
+            self.__stats.disconnected()
+        if self.__config.on_disconnect:
+            self.__config.on_disconnect(error)
+        for attempt, delay in enumerate(reconnect.delays(), 1):
+            if self.__closed.wait(delay):
+                return
+            try:
+                self.__resync(reconnect.handshake_timeout_seconds)
+            except (OSError, WebSocketException, TastytradeSdkException) as e:
+                logging.warning('Reconnect attempt %s failed: %s', attempt, e)
+                continue
+            logging.info('Reconnected to the streamer after %s attempt(s)', attempt)
+            if self.__stats:
+                self.__stats.reconnected()
+            if self.__config.on_resync:
+                self.__config.on_resync()
+            return
+        logging.error('Giving up reconnecting to the streamer')
+        self.__closed.set()
+
+    def __resync(self, timeout_seconds: float) -> None:
+        """Connect again, and replay the handshake and every tracked subscription"""
+        if self.__token_stale and self.__token_provider:
+            self.__token = self.__token_provider()
+            self.__token_stale = False
+        websocket = self.__connector(self.__url, open_timeout=timeout_seconds)
+        try:
+            # The handshake runs on this connection directly, so that nothing else is sent on it before it completes
+            websocket.send(self.__protocol.setup())
+            self.__await_state(websocket, Handshake.SETUP, timeout_seconds)
+            websocket.send(self.__protocol.auth(self.__token))
+            try:
+                self.__await_state(websocket, Handshake.AUTHORIZED, timeout_seconds)
+            except TastytradeSdkException:
+                self.__token_stale = True
+                raise
+            websocket.send(self.__protocol.channel_request())
+            self.__await_state(websocket, Handshake.CHANNEL_OPENED, timeout_seconds)
+            websocket.send(self.__protocol.feed_setup())
+        except BaseException:
+            websocket.close()
+            raise
+        self.__websocket = websocket
+        self.__ready.set()
+        # Subscription changes made while disconnected were tracked, so they're included here
+        self.__subscribe_all()
+
+    def __await_state(self, websocket: ClientConnection, state: str, timeout_seconds: float) -> None:
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            try:
+                raw = websocket.recv(timeout=max(deadline - time.monotonic(), 0))
+            except TimeoutError as e:
+                raise StreamerTimeout(state, timeout_seconds) from e
+            if self.__config.recorder:
+                self.__config.recorder.record(raw)
+            reached, events, batches = self.__protocol.handle(raw)
+            if reached:
+                self.__reach(reached)
+            self.__deliver(events, batches)
+            if reached == state:
+                return
+
+    def __subscribe_all(self) -> None:
+        chunk_size = self.__config.subscription_chunk_size
+        if not chunk_size:
+            self.__send(self.__protocol.feed_subscription())
+            return
+        for i, message in enumerate(self.__protocol.feed_subscriptions(chunk_size)):
+            # Spaced out, so that the streamer isn't flooded with a large subscription all at once
+            if i and self.__closed.wait(self.__config.subscription_pace_seconds):
+                return
+            self.__send(message)
+
+    def __send(self, message: Optional[str]) -> None:
+        websocket = self.__websocket
+        if not message or not websocket or self.__closed.is_set():
+            return
+        try:
+            websocket.send(message)
+        except ConnectionClosed:
+            # The receive loop finds out about this too, and takes care of reconnecting
+            pass
+
+    def __send_change(self, message: Optional[str]) -> None:
+        # While (re)connecting, changes are only tracked, and get sent along with the whole subscription once ready
+        if self.__ready.is_set():
+            self.__send(message)
+
+
+def _candle_history(symbol_ids: 'SymbolIds',
+                    on_snapshot: Optional[Callable[[str, 'Candles'], None]]) -> 'CandleHistory':
+    from tastytrade_sdk.market_data.candles import CandleHistory  # pylint: disable=import-outside-toplevel
+    return CandleHistory(symbol_ids, on_snapshot)
@@ -0,0 +1,222 @@
+import datetime as dt
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError('Option chains require numpy. Install it with `pip install tastytrade-sdk[numpy]`') from e
+
+from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.models import Greeks
+
+CALL = 'C'
+PUT = 'P'
+OPTION_TYPES = (CALL, PUT)
+
+
+class OptionContract(NamedTuple):
+    symbol: str
+    """The OCC symbol, e.g. `'SPY   230818C00450000'`"""
+    streamer_symbol: str
+    expiration: dt.date
+    strike: float
+    option_type: str
+    """`CALL` or `PUT`"""
+
+
+class Expiration:
+    """
+    The strikes of one expiration date, as arrays sorted by strike. The `*_symbols` and `*_deltas` arrays are aligned
+    with `strikes`, with `None` symbols where a strike only has a call or only a put, and NaN deltas until they're
+    known, see `OptionChain.update_greeks`.
+    """
+
+    def __init__(self, date: dt.date, days_to_expiration: int, expiration_type: str, settlement_type: str,
+                 strikes: np.ndarray, symbols: Dict[str, np.ndarray], streamer_symbols: Dict[str, np.ndarray],
+                 deltas: Optional[Dict[str, np.ndarray]] = None):
+        """@private"""
+        self.date = date
+        self.days_to_expiration = days_to_expiration
+        self.expiration_type = expiration_type
+        """e.g. `'Regular'`, `'Weekly'` or `'Quarterly'`"""
+        self.settlement_type = settlement_type
+        """`'AM'` or `'PM'`"""
+        self.strikes = strikes
+        self.call_symbols = symbols[CALL]
+        self.put_symbols = symbols[PUT]
+        self.call_streamer_symbols = streamer_symbols[CALL]
+        self.put_streamer_symbols = streamer_symbols[PUT]
+        deltas = deltas or {t: np.full(len(strikes), np.nan) for t in OPTION_TYPES}
+        self.call_deltas = deltas[CALL]
+        self.put_deltas = deltas[PUT]
+
+    def symbols(self, option_type: str) -> np.ndarray:
+        return self.call_symbols if option_type == CALL else self.put_symbols
+
+    def streamer_symbols(self, option_type: str) -> np.ndarray:
+        return self.call_streamer_symbols if option_type == CALL else self.put_streamer_symbols
+
+    def deltas(self, option_type: str) -> np.ndarray:
+        return self.call_deltas if option_type == CALL else self.put_deltas
+
+    def contract(self, index: int, option_type: str) -> Optional[OptionContract]:
+        symbol = self.symbols(option_type)[index]
+        if symbol is None:
+            return None
+        return OptionContract(symbol, self.streamer_symbols(option_type)[index], self.date,
+                              float(self.strikes[index]), option_type)
+
+    def slice(self, start: int, stop: int) -> 'Expiration':
+        """@private The strikes from index `start` up to `stop`, as views of this expiration's arrays"""
+        return Expiration(self.date, self.days_to_expiration, self.expiration_type, self.settlement_type,
+                          self.strikes[start:stop],
+                          {t: self.symbols(t)[start:stop] for t in OPTION_TYPES},
+                          {t: self.streamer_symbols(t)[start:stop] for t in OPTION_TYPES},
+                          {t: self.deltas(t)[start:stop] for t in OPTION_TYPES})
+
+    @staticmethod
+    def from_nested(expiration: dict) -> 'Expiration':
+        """@private Build from an expiration of the `/option-chains/{symbol}/nested` response"""
+        strikes = sorted(expiration['strikes'], key=lambda s: float(s['strike-price']))
+        return Expiration(
+            dt.date.fromisoformat(expiration['expiration-date']),
+            int(expiration['days-to-expiration']),
+            expiration.get('expiration-type'),
+            expiration.get('settlement-type'),
+            np.array([float(s['strike-price']) for s in strikes], dtype=np.float64),
+            {CALL: np.array([s.get('call') for s in strikes], dtype=object),
+             PUT: np.array([s.get('put') for s in strikes], dtype=object)},
+            {CALL: np.array([s.get('call-streamer-symbol') for s in strikes], dtype=object),
+             PUT: np.array([s.get('put-streamer-symbol') for s in strikes], dtype=object)}
+        )
+
+
+class OptionChain:
+    """
+    The options of one root symbol, indexed for lookups by expiration, strike and option type, by symbol, and by
+    delta once Greeks are known. Streamer symbols are attached, so the chain can be subscribed to without looking them
+    up, see `tastytrade_sdk.option_chains.option_chains.OptionChains.subscribe`.
+    """
+
+    def __init__(self, underlying_symbol: str, root_symbol: str, shares_per_contract: int,
+                 expirations: List[Expiration]):
+        """@private"""
+        self.underlying_symbol = underlying_symbol
+        self.root_symbol = root_symbol
+        self.shares_per_contract = shares_per_contract
+        self.__expirations = sorted(expirations, key=lambda e: e.date)
+        self.__by_date = {e.date: e for e in self.__expirations}
+        # symbol -> (expiration, strike index, option type), for O(1) lookups by symbol and by strike
+        self.__index: Dict[str, Tuple[Expiration, int, str]] = {}
+        self.__by_strike: Dict[Tuple[dt.date, float, str], int] = {}
+        for expiration in self.__expirations:
+            for option_type in OPTION_TYPES:
+                for i, symbol in enumerate(expiration.symbols(option_type)):
+                    if symbol is not None:
+                        self.__index[symbol] = (expiration, i, option_type)
+                        self.__by_strike[(expiration.date, float(expiration.strikes[i]), option_type)] = i
+
+    @property
+    def expirations(self) -> List[dt.date]:
+        """Sorted"""
+        return [e.date for e in self.__expirations]
+
+    @property
+    def days_to_expiration(self) -> np.ndarray:
+        """Aligned with `expirations`, as of when the chain was loaded"""
+        return np.array([e.days_to_expiration for e in self.__expirations], dtype=np.int64)
+
+    def expiration(self, date: dt.date) -> Expiration:
+        expiration = self.__by_date.get(date)
+        if not expiration:
+            raise InvalidArgument(f'{self.root_symbol} has no expiration on {date}')
+        return expiration
+
+    def strikes(self, date: dt.date) -> np.ndarray:
+        return self.expiration(date).strikes
+
+    def contract(self, date: dt.date, strike: float, option_type: str) -> Optional[OptionContract]:
+        index = self.__by_strike.get((date, float(strike), option_type))
+        return None if index is None else self.__by_date[date].contract(index, option_type)
+
+    def contract_of(self, symbol: str) -> Optional[OptionContract]:
+        entry = self.__index.get(symbol)
+        return entry[0].contract(entry[1], entry[2]) if entry else None
+
+    def nearest_strike(self, date: dt.date, price: float) -> float:
+        strikes = self.strikes(date)
+        if strikes.size == 0:
+            raise InvalidArgument(f'{self.root_symbol} has no strikes on {date}')
+        index = int(np.searchsorted(strikes, price))
+        if index == len(strikes) or (index > 0 and price - strikes[index - 1] <= strikes[index] - price):
+            index -= 1
+        return float(strikes[index])
+
+    def update_greeks(self, greeks: Greeks) -> None:
+        """Remember the delta of a contract of this chain, e.g. as an `on_greeks` handler. Other symbols are ignored."""
+        entry = self.__index.get(greeks.symbol)
+        if entry and greeks.delta is not None:
+            expiration, index, option_type = entry
+            expiration.deltas(option_type)[index] = greeks.delta
+
+    def nearest_delta(self, date: dt.date, delta: float, option_type: str) -> Optional[OptionContract]:
+        """The contract whose last known delta is closest to `delta`, e.g. `0.25` for calls or `-0.25` for puts"""
+        expiration = self.expiration(date)
+        distances = np.abs(expiration.deltas(option_type) - delta)
+        if np.isnan(distances).all():
+            return None
+        return expiration.contract(int(np.nanargmin(distances)), option_type)
+
+    def delta_bucket(self, date: dt.date, low: float, high: float, option_type: str) -> List[OptionContract]:
+        """The contracts whose last known delta is in [`low`, `high`), in strike order"""
+        expiration = self.expiration(date)
+        deltas = expiration.deltas(option_type)
+        indices = np.flatnonzero((deltas >= low) & (deltas < high))
+        return [expiration.contract(int(i), option_type) for i in indices]
+
+    def filter(self, min_days_to_expiration: Optional[int] = None, max_days_to_expiration: Optional[int] = None,
+               price: Optional[float] = None, strikes_around: Optional[int] = None) -> 'OptionChain':
+        """
+        A chain of only some of the contracts, e.g. to subscribe to, as views of this chain's arrays
+
+        :param price: The underlying price that `strikes_around` is centered on
+        :param strikes_around: Keep this many strikes below `price` and this many above it, per expiration
+        """
+        if (price is None) != (strikes_around is None):
+            raise InvalidArgument('price and strikes_around go together')
+        expirations = []
+        for expiration in self.__expirations:
+            if min_days_to_expiration is not None and expiration.days_to_expiration < min_days_to_expiration:
+                continue
+            if max_days_to_expiration is not None and expiration.days_to_expiration > max_days_to_expiration:
+                continue
+            if price is not None:
+                middle = int(np.searchsorted(expiration.strikes, price))
+                expiration = expiration.slice(max(middle - strikes_around, 0), middle + strikes_around)
+            expirations.append(expiration)
+        return OptionChain(self.underlying_symbol, self.root_symbol, self.shares_per_contract, expirations)
+
+    def contracts(self, option_types: Sequence[str] = OPTION_TYPES) -> Iterator[OptionContract]:
+        """Every contract, by expiration, then strike, then option type"""
+        for expiration in self.__expirations:
+            for index in range(len(expiration.strikes)):
+                for option_type in option_types:
+                    contract = expiration.contract(index, option_type)
+                    if contract:
+                        yield contract
+
+    def symbols(self, option_types: Sequence[str] = OPTION_TYPES) -> List[str]:
+        return [c.symbol for c in self.contracts(option_types)]
+
+    def streamer_symbol_translations(self) -> List[Tuple[str, str]]:
+        """`(symbol, streamer symbol)` pairs of every contract"""
+        return [(c.symbol, c.streamer_symbol) for c in self.contracts() if c.streamer_symbol]
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+    @staticmethod
+    def from_nested(item: dict) -> 'OptionChain':
+        """@private Build from an item of the `/option-chains/{symbol}/nested` response"""
+        return OptionChain(item['underlying-symbol'], item['root-symbol'], int(item.get('shares-per-contract') or 100),
+                           [Expiration.from_nested(e) for e in item['expirations']])
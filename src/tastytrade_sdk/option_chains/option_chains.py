@@ -0,0 +1,70 @@
+import urllib.parse
+from typing import Any, List, Optional
+
+from injector import inject, singleton
+
+from tastytrade_sdk.api import Api
+from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.market_data import MarketData
+from tastytrade_sdk.market_data.streamer_symbol_cache import StreamerSymbolCache
+from tastytrade_sdk.market_data.subscription import Subscription
+from tastytrade_sdk.option_chains.option_chain import OptionChain, OPTION_TYPES
+
+
+@singleton
+class OptionChains:
+    """
+    Loads equity and index option chains. Requires numpy.
+
+    ```python
+    chain = tasty.option_chains.get('SPY').filter(max_days_to_expiration=45, price=450, strikes_around=10)
+    subscription = tasty.option_chains.subscribe(chain, on_greeks=chain.update_greeks)
+    subscription.open()
+    ```
+    <br/>
+    """
+
+    @inject
+    def __init__(self, api: Api, streamer_symbol_cache: StreamerSymbolCache, market_data: MarketData):
+        """@private"""
+        self.__api = api
+        self.__streamer_symbol_cache = streamer_symbol_cache
+        self.__market_data = market_data
+
+    def get_all(self, underlying_symbol: str) -> List[OptionChain]:
+        """
+        The chains of every root symbol an underlying has options under, e.g. `SPX` and `SPXW` for `SPX`. Their streamer
+        symbols are cached, so that subscribing to their contracts doesn't need to look them up.
+        """
+        path = f'/option-chains/{urllib.parse.quote(underlying_symbol, safe="")}/nested'
+        items = self.__api.get(path)['data']['items']
+        chains = [OptionChain.from_nested(item) for item in items]
+        for chain in chains:
+            self.__streamer_symbol_cache.put_many(chain.streamer_symbol_translations())
+        return chains
+
+    def get(self, underlying_symbol: str, root_symbol: Optional[str] = None) -> OptionChain:
+        """
+        The chain of one root symbol
+
+        :param root_symbol: Defaults to the root symbol that is the underlying symbol itself, if there is one, or else
+        the first one
+        """
+        chains = self.get_all(underlying_symbol)
+        if not chains:
+            raise InvalidArgument(f'{underlying_symbol} has no options')
+        wanted = root_symbol or underlying_symbol
+        for chain in chains:
+            if chain.root_symbol == wanted:
+                return chain
+        if root_symbol:
+            raise InvalidArgument(f'{underlying_symbol} has no options with root symbol {root_symbol}')
+        return chains[0]
+
+    def subscribe(self, chain: OptionChain, option_types: List[str] = OPTION_TYPES, **kwargs: Any) -> Subscription:
+        """
+        Subscribe to the contracts of a chain, e.g. one narrowed down with `OptionChain.filter` first
+
+        :param kwargs: Passed on to `tastytrade_sdk.MarketData.subscribe`
+        """
+        return self.__market_data.subscribe(chain.symbols(option_types), **kwargs)
@@ -0,0 +1,213 @@
+import datetime as dt
+import math
+import threading
+from typing import Callable, List, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError('Option pricing requires numpy. Install it with `pip install tastytrade-sdk[numpy]`') from e
+
+from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.models import Greeks, Quote, Trade
+from tastytrade_sdk.option_chains.option_chain import CALL, OptionChain
+
+BLACK_SCHOLES = 'black-scholes'
+"""For options on stocks and indices"""
+BLACK_76 = 'black-76'
+"""For options on futures"""
+MODELS = (BLACK_SCHOLES, BLACK_76)
+
+_DAYS_PER_YEAR = 365.0
+_SECONDS_PER_YEAR = _DAYS_PER_YEAR * 24 * 60 * 60
+# Expiring contracts are priced as if a minute were left, rather than dividing by zero
+_MIN_YEARS = 60 / _SECONDS_PER_YEAR
+
+
+class Prices(NamedTuple):
+    """
+    Theoretical prices and Greeks, as arrays, in the units of `tastytrade_sdk.Greeks` events: theta is per day, and
+    vega and rho are per percentage point of volatility and of the interest rate
+    """
+    price: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    theta: np.ndarray
+    vega: np.ndarray
+    rho: np.ndarray
+
+
+def _erf(x: np.ndarray) -> np.ndarray:
+    # Abramowitz and Stegun 7.1.26, accurate to 1.5e-7, since numpy has no erf and scipy isn't a dependency
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1 / (1 + 0.3275911 * x)
+    y = 1 - ((((1.061405429 * t - 1.453152027) * t + 1.421413741) * t - 0.284496736) * t + 0.254829592) * t * np.exp(
+        -x * x)
+    return sign * y
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (1 + _erf(x / math.sqrt(2)))
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+
+
+class _Terms(NamedTuple):
+    """The terms both models' prices and Greeks are made of"""
+    sign: np.ndarray
+    """1 for calls and -1 for puts"""
+    sqrt_years: np.ndarray
+    deviation: np.ndarray
+    """The volatility over the time to expiration"""
+    carry_discount: np.ndarray
+    forward_leg: np.ndarray
+    strike_leg: np.ndarray
+    n_d1: np.ndarray
+    """The normal CDF of d1, or of -d1 for puts"""
+    n_d2: np.ndarray
+    pdf_d1: np.ndarray
+
+
+def _terms(spot: np.ndarray, strikes: np.ndarray, years: np.ndarray, volatilities: np.ndarray, is_call: np.ndarray,
+           rate: float, carry: float) -> _Terms:
+    sqrt_years = np.sqrt(years)
+    deviation = volatilities * sqrt_years
+    d1 = (np.log(spot / strikes) + (carry + 0.5 * volatilities * volatilities) * years) / deviation
+    d2 = d1 - deviation
+    carry_discount = np.exp((carry - rate) * years)
+    sign = np.where(is_call, 1.0, -1.0)
+    return _Terms(sign, sqrt_years, deviation, carry_discount, spot * carry_discount, strikes * np.exp(-rate * years),
+                  _norm_cdf(sign * d1), _norm_cdf(sign * d2), _norm_pdf(d1))
+
+
+def price_options(underlying_price, strikes, years, volatilities, is_call, rate: float = 0.0,
+                  dividend_yield: float = 0.0, model: str = BLACK_SCHOLES) -> Prices:
+    """
+    Theoretical prices and Greeks of many European options at once. Array arguments are broadcast against each other,
+    and contracts with a NaN volatility get NaNs.
+
+    :param underlying_price: The stock or index price, or the futures price for `BLACK_76`
+    :param years: Time to expiration
+    :param volatilities: Annualized, e.g. `0.2` for 20%
+    :param is_call: `True` for calls and `False` for puts
+    :param rate: The annualized, continuously compounded risk-free rate
+    :param dividend_yield: Ignored for `BLACK_76`
+    :param model: `BLACK_SCHOLES` or `BLACK_76`
+    """
+    if model not in MODELS:
+        raise InvalidArgument(f'Unknown model {model}, expected one of {", ".join(MODELS)}')
+    spot = np.asarray(underlying_price, dtype=np.float64)
+    years = np.maximum(np.asarray(years, dtype=np.float64), _MIN_YEARS)
+    volatilities = np.asarray(volatilities, dtype=np.float64)
+    # The cost of carry: the rate less the dividend yield for stocks, and nothing for futures
+    carry = 0.0 if model == BLACK_76 else rate - dividend_yield
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = _terms(spot, np.asarray(strikes, dtype=np.float64), years, volatilities,
+                       np.asarray(is_call, dtype=bool), rate, carry)
+        prices = terms.sign * (terms.forward_leg * terms.n_d1 - terms.strike_leg * terms.n_d2)
+        theta = (-terms.forward_leg * terms.pdf_d1 * volatilities / (2 * terms.sqrt_years)
+                 - terms.sign * (carry - rate) * terms.forward_leg * terms.n_d1
+                 - terms.sign * rate * terms.strike_leg * terms.n_d2)
+        rho = -years * prices if model == BLACK_76 else terms.sign * years * terms.strike_leg * terms.n_d2
+        return Prices(prices,
+                      terms.sign * terms.carry_discount * terms.n_d1,
+                      terms.carry_discount * terms.pdf_d1 / (spot * terms.deviation),
+                      theta / _DAYS_PER_YEAR,
+                      terms.forward_leg * terms.pdf_d1 * terms.sqrt_years / 100,
+                      rho / 100)
+
+
+class ChainPricer:
+    """
+    Prices every contract of an option chain locally, so that risk checks can follow the underlying between the
+    chain's Greeks events, which arrive far less often than its quotes and trades:
+    ```python
+    chain = tasty.option_chains.get('SPY').filter(max_days_to_expiration=45, price=450, strikes_around=10)
+    pricer = ChainPricer(chain, rate=0.05, on_prices=check_risk)
+    subscription = tasty.market_data.subscribe(chain.symbols() + [chain.underlying_symbol],
+                                               on_greeks=pricer.update_greeks, on_quote=pricer.update_quote)
+    ```
+
+    Each contract is priced with the implied volatility of its last Greeks event, and contracts without one yet are
+    NaN. Every underlying price reprices the whole chain in one vectorized call. Arrays are aligned with `symbols`.
+    Thread-safe.
+    """
+
+    def __init__(self, chain: OptionChain, rate: float = 0.0, dividend_yield: float = 0.0,
+                 model: str = BLACK_SCHOLES, on_prices: Optional[Callable[[Prices], None]] = None,
+                 expiration_time: dt.time = dt.time(20, 0)):
+        """
+        :param on_prices: Called with the new prices after every repricing
+        :param expiration_time: The UTC time contracts expire at on their expiration date, by default 4 PM New York
+        time in summer
+        """
+        if model not in MODELS:
+            raise InvalidArgument(f'Unknown model {model}, expected one of {", ".join(MODELS)}')
+        contracts = list(chain.contracts())
+        self.underlying_symbol = chain.underlying_symbol
+        self.symbols: List[str] = [c.symbol for c in contracts]
+        self.strikes = np.array([c.strike for c in contracts], dtype=np.float64)
+        self.is_call = np.array([c.option_type == CALL for c in contracts], dtype=bool)
+        self.volatilities = np.full(len(contracts), np.nan)
+        """The last implied volatility of each contract"""
+        self.__expirations = np.array(
+            [dt.datetime.combine(c.expiration, expiration_time, dt.timezone.utc).timestamp() for c in contracts],
+            dtype=np.float64)
+        self.__index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.__rate = rate
+        self.__dividend_yield = dividend_yield
+        self.__model = model
+        self.__on_prices = on_prices
+        self.__lock = threading.Lock()
+        self.__underlying_price: Optional[float] = None
+        self.__prices: Optional[Prices] = None
+
+    @property
+    def underlying_price(self) -> Optional[float]:
+        return self.__underlying_price
+
+    def prices(self) -> Optional[Prices]:
+        """The prices as of the last underlying price, if there's been one"""
+        return self.__prices
+
+    def update_greeks(self, greeks: Greeks) -> None:
+        """Remember the implied volatility of a contract, e.g. as an `on_greeks` handler. Other symbols are ignored."""
+        index = self.__index.get(greeks.symbol)
+        if index is not None and greeks.volatility is not None:
+            self.volatilities[index] = greeks.volatility
+
+    def update_quote(self, quote: Quote) -> None:
+        """Reprice at the mid price of an underlying quote, e.g. as an `on_quote` handler"""
+        if quote.symbol == self.underlying_symbol and quote.bid_price and quote.ask_price:
+            self.reprice((quote.bid_price + quote.ask_price) / 2)
+
+    def update_trade(self, trade: Trade) -> None:
+        """Reprice at the price of an underlying trade, e.g. as an `on_trade` handler"""
+        if trade.symbol == self.underlying_symbol and trade.price:
+            self.reprice(trade.price)
+
+    def reprice(self, underlying_price: float, now: Optional[dt.datetime] = None) -> Prices:
+        """
+        :param now: Defaults to the current time
+        """
+        timestamp = (now or dt.datetime.now(dt.timezone.utc)).timestamp()
+        with self.__lock:
+            years = (self.__expirations - timestamp) / _SECONDS_PER_YEAR
+            prices = price_options(underlying_price, self.strikes, years, self.volatilities, self.is_call,
+                                   self.__rate, self.__dividend_yield, self.__model)
+            self.__underlying_price = underlying_price
+            self.__prices = prices
+        if self.__on_prices:
+            self.__on_prices(prices)
+        return prices
+
+    def greeks(self, symbol: str) -> Optional[dict]:
+        """The last prices and Greeks of one contract, e.g. to compare with its Greeks events"""
+        index = self.__index.get(symbol)
+        prices = self.__prices
+        if index is None or prices is None:
+            return None
+        return {field: float(values[index]) for field, values in zip(Prices._fields, prices)}
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import ujson
+from injector import inject, singleton
+
+from tastytrade_sdk.config import CachePolicy, Config
+
+
+class _Entry(NamedTuple):
+    content: bytes
+    etag: Optional[str]
+    expires_at: float
+
+
+class _Responses:
+    def __init__(self, policy: CachePolicy):
+        self.policy = policy
+        self.entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+
+@singleton
+class ResponseCache:
+    """
+    @private
+
+    Caches the raw content of GET responses, per `CachePolicy`, so that every hit is decoded into new objects that
+    callers are free to modify. Any other request to a path drops the cached responses of that path and below, e.g. a
+    POST to `/accounts/123/orders` drops `/accounts/123/orders` and `/accounts/123/orders/456`.
+    """
+
+    @inject
+    def __init__(self, config: Config):
+        self.__responses = [_Responses(policy) for policy in config.response_cache or []]
+        self.__lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.__responses)
+
+    def get(self, path: str, key: str) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        :param key: The path and query string
+        :return: The cached response if it's fresh, and otherwise the `ETag` to revalidate it with, if any
+        """
+        responses = self.__match(path)
+        if not responses:
+            return None, None
+        with self.__lock:
+            entry = responses.entries.get(key)
+            if entry and entry.expires_at > time.monotonic():
+                responses.entries.move_to_end(key)
+                responses.hits += 1
+            else:
+                responses.misses += 1
+                etag = entry.etag if entry and responses.policy.revalidate else None
+                return None, etag
+        return ujson.loads(entry.content), None
+
+    def put(self, path: str, key: str, content: bytes, etag: Optional[str]) -> None:
+        responses = self.__match(path)
+        if not responses:
+            return
+        with self.__lock:
+            responses.entries[key] = _Entry(content, etag, time.monotonic() + responses.policy.ttl_seconds)
+            responses.entries.move_to_end(key)
+            while len(responses.entries) > responses.policy.max_entries:
+                responses.entries.popitem(last=False)
+                responses.evictions += 1
+
+    def revalidated(self, path: str, key: str) -> Optional[dict]:
+        """Extend the life of a response the API confirmed hasn't changed, with a 304, and return it"""
+        responses = self.__match(path)
+        if not responses:
+            return None
+        with self.__lock:
+            entry = responses.entries.pop(key, None)
+            if not entry:
+                return None
+            responses.entries[key] = entry._replace(expires_at=time.monotonic() + responses.policy.ttl_seconds)
+            responses.revalidations += 1
+        return ujson.loads(entry.content)
+
+    def invalidate(self, path: str) -> None:
+        prefix = path.rstrip('/')
+        with self.__lock:
+            for responses in self.__responses:
+                stale = [k for k in responses.entries if k == prefix or k.startswith((prefix + '/', prefix + '?'))]
+                for key in stale:
+                    del responses.entries[key]
+
+    def clear(self) -> None:
+        with self.__lock:
+            for responses in self.__responses:
+                responses.entries.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self.__lock:
+            return {r.policy.pattern: {'hits': r.hits, 'misses': r.misses, 'revalidations': r.revalidations,
+                                       'evictions': r.evictions, 'entries': len(r.entries)}
+                    for r in self.__responses}
+
+    def __match(self, path: str) -> Optional[_Responses]:
+        for responses in self.__responses:
+            if fnmatchcase(path, responses.policy.pattern):
+                return responses
+        return None
@@ -1,25 +1,43 @@
+from typing import List, Optional, TYPE_CHECKING
+
 from injector import Injector
 
-from tastytrade_sdk.config import Config
+from tastytrade_sdk.config import CachePolicy, Config, HttpConfig
 from tastytrade_sdk.api import Api, RequestsSession
+from tastytrade_sdk.async_api import AsyncApi
 from tastytrade_sdk.market_data.market_data import MarketData
 
+if TYPE_CHECKING:
+    from tastytrade_sdk.option_chains.option_chains import OptionChains
+
 
 class Tastytrade:
     """
     The SDK's top-level class
     """
 
-    def __init__(self, sandbox=False):
+    def __init__(self, sandbox=False, streamer_symbol_cache_path: Optional[str] = None, instrumentation: bool = True,
+                 http: Optional[HttpConfig] = None, response_cache: Optional[List[CachePolicy]] = None):
         """
         :param sandbox: allow the user to specify sandbox mode to change api base url to
         cert url, which is 'api.cert.tastyworks.com'
+        :param streamer_symbol_cache_path: path of a sqlite database in which to keep streamer symbol translations,
+        so that they can be shared across processes and restarts
+        :param instrumentation: Collect REST latencies and streaming counters and timings. Switch it off to save the
+        little overhead it has.
+        :param http: Connection pooling, timeouts and retries of REST requests
+        :param response_cache: Cache the responses of GET requests to the paths these policies match, e.g.
+        `tastytrade_sdk.config.DEFAULT_CACHE_POLICIES`. Nothing is cached by default.
         """
         api_base_url = 'api.tastyworks.com'
         if sandbox:
             api_base_url = 'api.cert.tastyworks.com'
         def configure(binder):
-            binder.bind(Config, to=Config(api_base_url=api_base_url))
+            binder.bind(Config, to=Config(api_base_url=api_base_url,
+                                          streamer_symbol_cache_path=streamer_symbol_cache_path,
+                                          instrumentation=instrumentation,
+                                          http=http or HttpConfig(),
+                                          response_cache=response_cache))
 
         self.__container = Injector(configure)
 
@@ -51,7 +69,7 @@ class Tastytrade:
         """
         End the session
         """
-        self.api.delete('/sessions')
+        self.__container.get(RequestsSession).logout()
 
     @property
     def market_data(self) -> MarketData:
@@ -66,3 +84,19 @@ class Tastytrade:
         Access the Api submodule
         """
         return self.__container.get(Api)
+
+    @property
+    def async_api(self) -> AsyncApi:
+        """
+        Access the AsyncApi submodule, which shares this instance's login. Requires httpx.
+        """
+        return self.__container.get(AsyncApi)
+
+    @property
+    def option_chains(self) -> 'OptionChains':
+        """
+        Access the OptionChains submodule. Requires numpy.
+        """
+        # pylint: disable=import-outside-toplevel
+        from tastytrade_sdk.option_chains.option_chains import OptionChains
+        return self.__container.get(OptionChains)
@@ -0,0 +1,53 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# A (status, headers, body) reply
+Reply = Tuple[int, Dict[str, str], Optional[dict]]
+
+
+class ApiServer:
+    """
+    A local stand-in for the REST API. It hands out the given replies in order, then 200s with an empty `data`, and
+    records every request it receives.
+    """
+
+    def __init__(self, replies: Optional[List[Reply]] = None):
+        self.replies: List[Reply] = replies or []
+        self.requests: List[Tuple[str, str, dict]] = []
+        self.__lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self): # pylint: disable=invalid-name
+                self.__reply()
+
+            do_POST = do_PUT = do_PATCH = do_DELETE = do_GET
+
+            def __reply(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                status, headers, body = server.next_reply(self.command, self.path, dict(self.headers))
+                encoded = json.dumps(body).encode() if body is not None else b''
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, *args):
+                pass
+
+        self.__httpd = ThreadingHTTPServer(('localhost', 0), Handler)
+        self.url = f'http://localhost:{self.__httpd.server_address[1]}'
+        threading.Thread(target=self.__httpd.serve_forever, args=(0.01,), daemon=True).start()
+
+    def next_reply(self, method: str, path: str, headers: dict) -> Reply:
+        with self.__lock:
+            self.requests.append((method, path, headers))
+            return self.replies.pop(0) if self.replies else (200, {}, {'data': {}})
+
+    def stop(self):
+        self.__httpd.shutdown()
+        self.__httpd.server_close()
@@ -0,0 +1,206 @@
+"""
+A local stand-in for the DXLink streamer. It speaks enough of the protocol for a subscription to connect, and
+streams synthetic events for whatever gets subscribed to, at a configurable rate.
+
+    with DxLinkServer(rate=10_000) as server:
+        subscription = Subscription(server.url, 'token', translations, {'Quote': print}).open()
+"""
+import itertools
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import ujson
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve, ServerConnection
+
+from tastytrade_sdk.market_data.dxlink import EventDecoder, FEED_CHANNEL
+
+
+def _message(_type: str, channel: int = 0, **kwargs) -> str:
+    return ujson.dumps({'type': _type, 'channel': channel, **kwargs})
+
+
+def _size(*_) -> int:
+    return random.randint(1, 1000)
+
+
+def _price(*_) -> float:
+    return round(random.uniform(1, 500), 2)
+
+
+# How to make up each field, given the symbol and sequence number. Anything not listed here is a price.
+_VALUES: Dict[str, Callable[[str, int], Any]] = {
+    'eventSymbol': lambda symbol, _: symbol,
+    'description': lambda symbol, _: symbol,
+    # Fractional epoch milliseconds, so that latency can be measured to the microsecond
+    'time': lambda *_: time.time() * 1000,
+    'sequence': lambda _, sequence: sequence,
+    'exchangeCode': lambda *_: 'Q',
+    'ExchangeCode': lambda *_: 'Q',
+    'extendedTradingHours': lambda *_: False,
+    'size': _size,
+    'Size': _size,
+    'Id': _size,
+    'dayVolume': _size,
+    'openInterest': _size,
+}
+# Fields ending in one of these, like `bidExchangeCode`, are made up the same way as the suffix
+_SUFFIXES = ('ExchangeCode', 'Size', 'Id')
+
+
+def _value(field: str, symbol: str, sequence: int):
+    key = next((s for s in _SUFFIXES if field.endswith(s)), field)
+    return _VALUES.get(key, _price)(symbol, sequence)
+
+
+class _Connection:
+    def __init__(self, server: 'DxLinkServer', websocket: ServerConnection):
+        self.__server = server
+        self.__websocket = websocket
+        self.__fields: Dict[str, List[str]] = {}
+        self.__subscriptions: Dict[Tuple[str, str], None] = {}
+        self.__lock = threading.Lock()
+        self.__streaming = False
+        self.__sequence = itertools.count()
+        # Values are made up once per subscription, and only the time and sequence change from then on
+        self.__values: Dict[Tuple[str, str], list] = {}
+
+    def handle(self) -> None:
+        try:
+            for raw in self.__websocket:
+                self.__receive(ujson.loads(raw))
+        except ConnectionClosed:
+            pass
+
+    def __receive(self, message: dict) -> None:
+        self.__server.received.append(message)
+        _type = message['type']
+        if _type == 'SETUP':
+            if self.__server.close_on_setup:
+                self.__websocket.close(reason=self.__server.close_on_setup)
+                return
+            self.__send(_message('SETUP', version='stand-in', keepaliveTimeout=60, acceptKeepaliveTimeout=60))
+            self.__send(_message('AUTH_STATE', state='UNAUTHORIZED'))
+        elif _type == 'AUTH':
+            authorized = self.__server.token is None or message['token'] == self.__server.token
+            self.__send(_message('AUTH_STATE', state='AUTHORIZED' if authorized else 'UNAUTHORIZED'))
+        elif _type == 'CHANNEL_REQUEST':
+            self.__send(_message('CHANNEL_OPENED', channel=message['channel'], service='FEED'))
+        elif _type == 'FEED_SETUP':
+            self.__fields.update(message.get('acceptEventFields') or {})
+            self.__send(_message('FEED_CONFIG', channel=FEED_CHANNEL, dataFormat='COMPACT', eventFields=self.__fields))
+        elif _type == 'FEED_SUBSCRIPTION':
+            with self.__lock:
+                for subscription in message.get('remove') or []:
+                    self.__subscriptions.pop((subscription['symbol'], subscription['type']), None)
+                for subscription in message.get('add') or []:
+                    self.__subscriptions[(subscription['symbol'], subscription['type'])] = None
+            if not self.__streaming:
+                self.__streaming = True
+                threading.Thread(target=self.__stream, daemon=True).start()
+
+    def __stream(self) -> None:
+        server = self.__server
+        events_per_frame = server.events_per_frame
+        next_frame_at = time.monotonic()
+        offset = 0
+        while not server.stopped.is_set():
+            with self.__lock:
+                subscriptions = list(self.__subscriptions)
+            if subscriptions:
+                # Round-robin over the subscriptions, a frame's worth at a time
+                chunk = [subscriptions[(offset + i) % len(subscriptions)] for i in range(events_per_frame)]
+                offset = (offset + events_per_frame) % len(subscriptions)
+                try:
+                    self.__send(self.__frame(chunk))
+                except ConnectionClosed:
+                    return
+                server.sent += len(chunk)
+            if server.rate:
+                next_frame_at += events_per_frame / server.rate
+                delay = next_frame_at - time.monotonic()
+                if delay > 0:
+                    server.stopped.wait(delay)
+
+    def __frame(self, subscriptions: List[Tuple[str, str]]) -> str:
+        values_by_type: Dict[str, list] = {}
+        now = time.time() * 1000
+        for subscription in subscriptions:
+            event_values = self.__values.get(subscription)
+            if event_values is None:
+                event_values = self.__values[subscription] = self.__make_values(*subscription)
+            time_index, sequence_index = event_values[0]
+            if time_index:
+                event_values[time_index] = now
+            if sequence_index:
+                event_values[sequence_index] = next(self.__sequence)
+            values_by_type.setdefault(subscription[1], []).extend(event_values[1:])
+        data = [x for event_type, values in values_by_type.items() for x in (event_type, values)]
+        return _message('FEED_DATA', channel=FEED_CHANNEL, data=data)
+
+    def __make_values(self, symbol: str, event_type: str) -> list:
+        fields = self.__fields.get(event_type) or EventDecoder.accept_fields_of(event_type)
+        # Headed by where the time and sequence are, so they can be updated in place
+        indices = (fields.index('time') + 1 if 'time' in fields else 0,
+                   fields.index('sequence') + 1 if 'sequence' in fields else 0)
+        return [indices, event_type] + [_value(f, symbol, 0) for f in fields[1:]]
+
+    def __send(self, message: str) -> None:
+        self.__websocket.send(message)
+
+
+class DxLinkServer:
+    def __init__(self, rate: Optional[float] = 1000, events_per_frame: int = 10, token: Optional[str] = None,
+                 host: str = 'localhost', port: int = 0):
+        """
+        :param rate: Events per second per connection. `None` sends as fast as possible.
+        :param token: Only authorize this token. By default any token is authorized.
+        :param port: 0 picks a free port
+        """
+        self.rate = rate
+        self.events_per_frame = events_per_frame
+        self.token = token
+        self.close_on_setup: Optional[str] = None
+        """Close connections with this reason as soon as they send SETUP"""
+        self.sent = 0
+        self.received: List[dict] = []
+        self.stopped = threading.Event()
+        self.__connections: Dict[ServerConnection, None] = {}
+        self.__server = serve(self.__handle, host, port)
+        self.__host = host
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f'ws://{self.__host}:{self.__server.socket.getsockname()[1]}'
+
+    def start(self) -> 'DxLinkServer':
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.__server.shutdown()
+        if self.__thread:
+            self.__thread.join()
+
+    def drop_connections(self) -> None:
+        """Close every open connection, as if the network had dropped"""
+        for websocket in list(self.__connections):
+            websocket.close()
+
+    def __handle(self, websocket: ServerConnection) -> None:
+        self.__connections[websocket] = None
+        try:
+            _Connection(self, websocket).handle()
+        finally:
+            self.__connections.pop(websocket, None)
+
+    def __enter__(self) -> 'DxLinkServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
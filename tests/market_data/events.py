@@ -0,0 +1,27 @@
+"""
+Feed events for tests, with made-up values for whatever a test doesn't look at:
+
+    builder.update(events.trade('SPY', time=START, price=10))
+"""
+import datetime as dt
+from typing import Type, Union
+
+from tastytrade_sdk.market_data.models import Greeks, NullableFloatStr, Quote, Trade
+
+
+def trade(symbol: str = 'SPY', time: Union[dt.datetime, int] = 0, price: NullableFloatStr = 1.0, size: int = 1,
+          sequence: int = 0, change: NullableFloatStr = 0.0, day_id: int = 0, day_volume: int = 0,
+          day_turnover: NullableFloatStr = 0.0, cls: Type[Trade] = Trade) -> Trade:
+    """:param cls: `Trade`, or `tastytrade_sdk.market_data.models.FrozenTrade`"""
+    return cls(symbol, symbol, time, sequence, 'Q', price, change, size, False, day_id, day_volume, day_turnover)
+
+
+def quote(symbol: str = 'SPY', bid_price: float = 1.0) -> Quote:
+    """A quote a cent wide"""
+    return Quote(symbol, bid_price, 1.0, 'Q', bid_price + 0.01, 1.0, 'Q')
+
+
+def greeks(symbol: str, delta: NullableFloatStr = None, gamma: NullableFloatStr = None,
+           theta: NullableFloatStr = None, vega: NullableFloatStr = None, rho: NullableFloatStr = None) -> Greeks:
+    """Greeks of an option at a price of 1 and a volatility of 20%. The ones not given are missing from the event."""
+    return Greeks(symbol, 0, 1.0, 0.2, delta, gamma, theta, rho, vega)
@@ -0,0 +1,248 @@
+import asyncio
+import importlib.util
+import time
+from typing import AsyncIterator, Callable
+from unittest import TestCase, skipUnless
+
+from tastytrade_sdk import AsyncSubscription, BatchHandlers, CandleConfig, DispatchConfig, OverflowPolicy, \
+    ReconnectPolicy, SubscriptionConfig
+from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.async_subscription import AsyncHandshake, _EventQueue
+from tastytrade_sdk.market_data.dxlink import StreamerDisconnected, StreamerException, StreamerTimeout, AUTHORIZED, \
+    CHANNEL_OPENED, SETUP
+from tastytrade_sdk.market_data.models import FrozenTrade
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+from tests.market_data.dxlink_server import DxLinkServer
+
+
+class AsyncSubscriptionTest(TestCase):
+    def test_requires_at_least_one_event_handler_or_type(self):
+        with self.assertRaises(InvalidArgument):
+            AsyncSubscription('url', 'token', StreamerSymbolTranslations([]), {})
+
+    def test_rejects_unknown_event_types(self):
+        with self.assertRaises(InvalidArgument):
+            AsyncSubscription('url', 'token', StreamerSymbolTranslations([]), {}, event_types=['Quote', 'Foo'])
+
+    def test_event_types_without_handlers(self):
+        subscription = AsyncSubscription('url', 'token', StreamerSymbolTranslations([]), {}, event_types=['Quote'],
+                                         config=SubscriptionConfig(latest_values=True, reconnect=None))
+        self.assertIsNotNone(subscription.latest_values)
+
+    def test_rejects_unsupported_options(self):
+        config = SubscriptionConfig(dispatch=DispatchConfig(), reconnect=ReconnectPolicy(max_attempts=3))
+        with self.assertRaises(InvalidArgument) as context:
+            AsyncSubscription('url', 'token', StreamerSymbolTranslations([]), {}, event_types=['Candle'],
+                              config=config, candles=CandleConfig(history=True))
+        self.assertIn('dispatch, reconnect, history', context.exception.message)
+
+
+class AsyncHandshakeTest(TestCase):
+    def test_wait_for_reached_state(self):
+        async def run():
+            handshake = AsyncHandshake()
+            asyncio.get_running_loop().call_later(0.01, lambda: asyncio.ensure_future(handshake.reach(SETUP)))
+            await handshake.wait_for(SETUP, 1)
+        asyncio.run(run())
+
+    def test_wait_for_times_out(self):
+        async def run():
+            handshake = AsyncHandshake()
+            await handshake.reach(SETUP)
+            await handshake.wait_for(CHANNEL_OPENED, 0.01)
+        with self.assertRaises(StreamerTimeout):
+            asyncio.run(run())
+
+    def test_failure_after_reached_state(self):
+        async def run():
+            handshake = AsyncHandshake()
+            await handshake.reach(CHANNEL_OPENED)
+            await handshake.fail(StreamerDisconnected('done'))
+            await handshake.wait_for(CHANNEL_OPENED, 1)
+        asyncio.run(run())
+
+    def test_wait_for_raises_streamer_error(self):
+        async def run():
+            handshake = AsyncHandshake()
+            await handshake.fail(StreamerException('UNAUTHORIZED', 'bad token'))
+            await handshake.wait_for(AUTHORIZED, 1)
+        with self.assertRaises(StreamerException):
+            asyncio.run(run())
+
+
+class EventQueueTest(TestCase):
+    def test_drop_oldest(self):
+        async def run():
+            queue = _EventQueue(2, OverflowPolicy.DROP_OLDEST)
+            for i in range(5):
+                await queue.put(('Quote', 'SPY'), i)
+            return [await queue.get(), await queue.get()]
+        self.assertEqual(asyncio.run(run()), [3, 4])
+
+    def test_conflate_keeps_the_earlier_position(self):
+        async def run():
+            queue = _EventQueue(10, OverflowPolicy.CONFLATE)
+            await queue.put(('Quote', 'SPY'), 'SPY quote 1')
+            await queue.put(('Trade', 'SPY'), 'SPY trade')
+            await queue.put(('Quote', 'SPY'), 'SPY quote 2')
+            return [await queue.get(), await queue.get()]
+        self.assertEqual(asyncio.run(run()), ['SPY quote 2', 'SPY trade'])
+
+    def test_block_waits_for_room(self):
+        async def run():
+            queue = _EventQueue(1, OverflowPolicy.BLOCK)
+            await queue.put(('Quote', 'SPY'), 0)
+            put = asyncio.ensure_future(queue.put(('Quote', 'SPY'), 1))
+            await asyncio.sleep(0.01)
+            self.assertFalse(put.done())
+            first = await queue.get()
+            await asyncio.wait_for(put, 1)
+            return [first, await queue.get()]
+        self.assertEqual(asyncio.run(run()), [0, 1])
+
+    def test_close_unblocks_a_full_queue(self):
+        async def run():
+            queue = _EventQueue(1, OverflowPolicy.BLOCK)
+            await queue.put(('Quote', 'SPY'), 0)
+            put = asyncio.ensure_future(queue.put(('Quote', 'SPY'), 1))
+            await asyncio.sleep(0.01)
+            queue.close()
+            await asyncio.wait_for(put, 1)
+        asyncio.run(run())
+
+
+class AsyncSubscriptionEndToEndTest(TestCase):
+    def setUp(self) -> None:
+        self.server = DxLinkServer(rate=2000).start()
+        self.translations = StreamerSymbolTranslations([('SPY', 'SPY'), ('/ESU3', '/ESU23:XCME')])
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    async def __wait_for(self, condition: Callable[[], bool]) -> None:
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, 'Timed out')
+            await asyncio.sleep(0.01)
+
+    @staticmethod
+    async def __consume(events: AsyncIterator) -> None:
+        async for _ in events:
+            await asyncio.sleep(0.001)
+
+    def __subscription(self, handlers: dict, **kwargs) -> AsyncSubscription:
+        return AsyncSubscription(self.server.url, 'token', self.translations, handlers, **kwargs)
+
+    def test_coroutine_handler(self):
+        quotes = []
+
+        async def on_quote(quote):
+            await asyncio.sleep(0)
+            quotes.append(quote)
+
+        async def run():
+            async with self.__subscription({'Quote': on_quote}):
+                await self.__wait_for(lambda: {q.symbol for q in quotes} == {'SPY', '/ESU3'})
+        asyncio.run(run())
+
+    def test_plain_handler(self):
+        trades = []
+
+        async def run():
+            subscription = self.__subscription({'Trade': trades.append},
+                                               config=SubscriptionConfig(latest_values=True, frozen_events=True))
+            async with subscription:
+                await self.__wait_for(lambda: {t.symbol for t in trades} == {'SPY', '/ESU3'})
+            return subscription
+        subscription = asyncio.run(run())
+        self.assertIsNotNone(subscription.latest_values.get('/ESU3', 'Trade'))
+        self.assertIsInstance(trades[-1], FrozenTrade)
+
+    def test_iteration_ends_when_closed(self):
+        async def run():
+            subscription = await self.__subscription({}, event_types=['Quote']).open()
+            quotes = []
+            async for quote in subscription:
+                quotes.append(quote)
+                if len(quotes) == 20:
+                    asyncio.ensure_future(subscription.close())
+            return quotes
+        quotes = asyncio.run(run())
+        self.assertGreaterEqual(len(quotes), 20)
+        self.assertEqual({q.symbol for q in quotes}, {'SPY', '/ESU3'})
+
+    def test_iteration_ends_when_the_connection_drops(self):
+        async def run():
+            subscription = await self.__subscription({}, event_types=['Quote']).open()
+            events = subscription.events(max_queue_size=1, overflow_policy=OverflowPolicy.DROP_OLDEST)
+            consumer = asyncio.ensure_future(self.__consume(events))
+            await self.__wait_for(lambda: self.server.sent)
+            # The server closes connections synchronously, which needs this loop to answer
+            await asyncio.get_running_loop().run_in_executor(None, self.server.drop_connections)
+            await asyncio.wait_for(consumer, 5)
+        asyncio.run(run())
+
+    def test_add_and_remove_symbols(self):
+        trades = []
+
+        async def run():
+            async with self.__subscription({'Trade': trades.append}) as subscription:
+                await self.__wait_for(lambda: trades)
+                await subscription.remove_symbols(['SPY', '/ESU3'])
+                await subscription.add_symbols(['/ESU3'])
+                count = len(trades)
+                await self.__wait_for(lambda: len(trades) > count + 50)
+        asyncio.run(run())
+        self.assertEqual({t.symbol for t in trades[-10:]}, {'/ESU3'})
+        subscriptions = [m for m in self.server.received if m['type'] == 'FEED_SUBSCRIPTION']
+        self.assertEqual(subscriptions[-2]['remove'], [{'symbol': 'SPY', 'type': 'Trade'},
+                                                       {'symbol': '/ESU23:XCME', 'type': 'Trade'}])
+        self.assertEqual(subscriptions[-1]['add'], [{'symbol': '/ESU23:XCME', 'type': 'Trade'}])
+
+    def test_subscription_chunks(self):
+        def subscriptions():
+            return [m['add'] for m in self.server.received if m['type'] == 'FEED_SUBSCRIPTION']
+
+        async def run():
+            config = SubscriptionConfig(subscription_chunk_size=1, subscription_pace_seconds=0)
+            async with self.__subscription({'Quote': lambda _: None}, config=config):
+                await self.__wait_for(lambda: len(subscriptions()) == 2)
+        asyncio.run(run())
+        self.assertEqual(subscriptions(), [[{'symbol': 'SPY', 'type': 'Quote'}],
+                                           [{'symbol': '/ESU23:XCME', 'type': 'Quote'}]])
+
+    @skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+    def test_batch_handlers(self):
+        batches = []
+
+        async def on_quotes(batch):
+            batches.append(batch)
+
+        async def run():
+            subscription = self.__subscription({}, batch_handlers=BatchHandlers(quote=on_quotes))
+            async with subscription:
+                await self.__wait_for(lambda: len(batches) > 5)
+            return subscription
+        subscription = asyncio.run(run())
+        symbols = {s for batch in batches for s in subscription.symbol_ids.symbols[batch['symbol_id']]}
+        self.assertEqual(symbols, {'SPY', '/ESU3'})
+
+    def test_close(self):
+        async def run():
+            subscription = await self.__subscription({'Quote': lambda _: None}).open()
+            await subscription.close()
+            return [q async for q in subscription]
+        self.assertEqual(asyncio.run(run()), [])
+
+    def test_unauthorized(self):
+        self.server.token = 'other'
+        with self.assertRaises(StreamerTimeout):
+            asyncio.run(self.__subscription({'Quote': print}).open(timeout_seconds=0.1))
+
+    def test_closed_during_handshake(self):
+        self.server.close_on_setup = 'go away'
+        started_at = time.monotonic()
+        with self.assertRaises(StreamerDisconnected) as context:
+            asyncio.run(self.__subscription({'Quote': print}).open(timeout_seconds=5))
+        self.assertIn('go away', context.exception.message)
+        self.assertLess(time.monotonic() - started_at, 1)
@@ -0,0 +1,69 @@
+import importlib.util
+from unittest import TestCase, skipUnless
+
+try:
+    import numpy as np
+
+    from tastytrade_sdk.exceptions import InvalidArgument
+    from tastytrade_sdk.market_data.bars import Bar, BarBuilder
+except ImportError:
+    pass
+
+from tests.market_data import events
+
+START = 1_700_000_100_000
+
+
+def _at(seconds: float) -> int:
+    return START + round(seconds * 1000)
+
+
+@skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+class BarBuilderTest(TestCase):
+    def setUp(self) -> None:
+        self.closed = []
+        self.builder = BarBuilder(intervals_seconds=(60, 300), capacity=4, on_bar=self.closed.append)
+
+    def test_builds_bars_and_closes_them_on_boundaries(self):
+        for seconds, price, size in ((0, 10, 1), (10, 12, 2), (20, 9, 3), (59.9, 11, 4), (60, 11.5, 5)):
+            self.builder.update(events.trade('SPY', _at(seconds), price, size))
+        self.assertEqual(self.closed, [Bar('SPY', 60, START, 10, 12, 9, 11, 10, 4)])
+        self.assertEqual(self.builder.open_bar('SPY', 60), Bar('SPY', 60, START + 60_000, 11.5, 11.5, 11.5, 11.5, 5, 1))
+        self.assertEqual(self.builder.open_bar('SPY', 300).trades, 5)
+        bars = self.builder.bars('SPY', 60)
+        self.assertEqual(list(bars.close), [11])
+        self.assertEqual(list(bars.volume), [10])
+
+    def test_last_bars_are_views_of_the_ring_buffer(self):
+        for minute in range(7):
+            self.builder.update(events.trade('SPY', _at(minute * 60), 100 + minute))
+        bars = self.builder.bars('SPY', 60)
+        self.assertEqual(list(bars.close), [102, 103, 104, 105])
+        self.assertEqual(list(bars.start), [START + m * 60_000 for m in range(2, 6)])
+        self.assertEqual(list(self.builder.bars('SPY', 60, n=2).open), [104, 105])
+        self.assertIsNotNone(bars.close.base)
+        self.assertEqual(len(self.builder.bars('QQQ', 60).close), 0)
+        with self.assertRaises(InvalidArgument):
+            self.builder.bars('SPY', 15)
+
+    def test_close_due_and_late_trades(self):
+        self.builder.update(events.trade('SPY', _at(0), 10))
+        self.builder.update(events.trade('QQQ', _at(30), 20))
+        self.assertEqual(self.builder.close_due(START + 59_999), [])
+        closed = self.builder.close_due(START + 60_000)
+        self.assertEqual([(b.symbol, b.interval_seconds) for b in closed], [('SPY', 60), ('QQQ', 60)])
+        self.builder.update(events.trade('SPY', _at(120), 10))
+        self.builder.update(events.trade('SPY', _at(61), 10))
+        self.assertEqual(self.builder.late_trades, 1)
+        self.assertEqual(self.builder.open_bar('SPY', 300).trades, 3)
+
+    def test_memory_is_preallocated(self):
+        builder = BarBuilder(intervals_seconds=(1,), capacity=100)
+        builder.update(events.trade('SPY', _at(0), 10))
+        buffer = builder.bars('SPY', 1).close.base
+        for second in range(1, 1000):
+            builder.update(events.trade('SPY', _at(second), 10 + second % 7))
+        bars = builder.bars('SPY', 1)
+        self.assertIs(bars.close.base, buffer)
+        self.assertEqual(len(bars.close), 100)
+        self.assertTrue(np.array_equal(bars.start, START + np.arange(899, 999) * 1000))
@@ -0,0 +1,60 @@
+import importlib.util
+from unittest import TestCase, skipUnless
+
+import ujson
+
+try:
+    import numpy as np
+
+    from tastytrade_sdk.market_data.batches import SymbolIds
+    from tastytrade_sdk.market_data.dxlink import DxLinkProtocol
+    from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+except ImportError:
+    pass
+
+
+@skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+class BatchesTest(TestCase):
+    def setUp(self) -> None:
+        self.protocol = DxLinkProtocol(StreamerSymbolTranslations([('SPY', 'SPY'), ('/ESU3', '/ESU23:XCME')]), [],
+                                       batch_event_types=['Quote'])
+
+    def test_compact_frame_becomes_one_structured_array(self):
+        _, events, batches = self.protocol.handle(ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': [
+            'Quote', ['Quote', 'SPY', 1.5, 10, 'Q', 1.6, 20, 'Z',
+                      'Quote', '/ESU23:XCME', 4300.25, 1, None, 'NaN', 2, 'X']
+        ]}))
+        self.assertEqual(events, [])
+        [(event_type, batch)] = batches
+        self.assertEqual(event_type, 'Quote')
+        self.assertEqual(list(self.protocol.symbol_ids.symbols[batch['symbol_id']]), ['SPY', '/ESU3'])
+        np.testing.assert_array_equal(batch['bid_price'], [1.5, 4300.25])
+        self.assertTrue(np.isnan(batch['ask_price'][1]))
+        self.assertEqual(list(batch['bid_exchange_code']), ['Q', ''])
+
+    def test_full_frame(self):
+        _, _, batches = self.protocol.handle(ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': [
+            {'eventType': 'Quote', 'eventSymbol': 'SPY', 'bidPrice': 1.5, 'bidSize': 10, 'bidExchangeCode': 'Q',
+             'askPrice': 1.6, 'askSize': 20, 'askExchangeCode': 'Z'}
+        ]}))
+        [(_, batch)] = batches
+        self.assertEqual(batch['ask_size'][0], 20)
+
+    def test_batches_and_events_for_the_same_type(self):
+        protocol = DxLinkProtocol(StreamerSymbolTranslations([('SPY', 'SPY')]), ['Trade'],
+                                  batch_event_types=['Trade'])
+        _, events, batches = protocol.handle(ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': [
+            'Trade', ['Trade', 'SPY', 1688140800000, 1, 'Q', 440.0, 'NaN', 100, False, 19538, 1000, None]
+        ]}))
+        self.assertEqual(len(events), 1)
+        [(_, batch)] = batches
+        self.assertEqual(batch['time'][0], 1688140800000)
+        self.assertTrue(np.isnan(batch['dayTurnover'][0]))
+
+
+@skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+class SymbolIdsTest(TestCase):
+    def test_ids_are_stable(self):
+        symbol_ids = SymbolIds()
+        self.assertEqual([symbol_ids.id(s) for s in ('SPY', 'AAPL', 'SPY')], [0, 1, 0])
+        self.assertEqual(symbol_ids.symbol(1), 'AAPL')
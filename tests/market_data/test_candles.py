@@ -0,0 +1,118 @@
+import importlib.util
+import tempfile
+import threading
+from typing import List
+from unittest import TestCase, skipUnless
+
+import ujson
+
+from tastytrade_sdk.market_data.dxlink import DxLinkProtocol
+from tastytrade_sdk.market_data.models import REMOVE_EVENT, SNAPSHOT_BEGIN, SNAPSHOT_END, SNAPSHOT_SNIP
+from tastytrade_sdk.market_data.recording import FrameRecorder
+from tastytrade_sdk.market_data.replay import IdentityTranslations, ReplaySubscription
+from tastytrade_sdk.market_data.subscription import BatchHandlers, CandleConfig
+
+try:
+    from tastytrade_sdk.market_data.candles import CandleHistory
+except ImportError:
+    pass
+
+MINUTE = 60_000
+START = 1_700_000_040_000
+
+
+def _values(symbol: str, minute: int, close: float, flags: int = 0) -> list:
+    time = START + minute * MINUTE
+    # The index packs the candle's time in seconds into the upper 32 bits
+    return ['Candle', f'{symbol}{{=1m}}', flags, (time // 1000) << 32, time, 10, close - 1, close + 1, close - 2,
+            close, 100, close, 'NaN', 'NaN']
+
+
+def _frame(*candles: list) -> str:
+    return ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': ['Candle', [v for c in candles for v in c]]})
+
+
+def _snapshot(symbol: str, minutes: int, end_flag: int = SNAPSHOT_END) -> List[list]:
+    """A snapshot of `minutes` candles, newest first, the way the streamer sends it"""
+    candles = [_values(symbol, m, 100 + m) for m in reversed(range(minutes))]
+    candles[0][2] |= SNAPSHOT_BEGIN
+    candles[-1][2] |= end_flag
+    return candles
+
+
+@skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+class CandleHistoryTest(TestCase):
+    def setUp(self) -> None:
+        self.protocol = DxLinkProtocol(IdentityTranslations(), [], batch_event_types=['Candle'])
+        self.snapshots = []
+        self.history = CandleHistory(self.protocol.symbol_ids, lambda s, c: self.snapshots.append((s, c.close.copy())))
+
+    def __receive(self, raw: str) -> None:
+        for _, batch in self.protocol.handle(raw)[2]:
+            self.history.update(batch)
+
+    def test_collects_snapshot_across_frames(self):
+        snapshot = _snapshot('SPY', 1000)
+        self.__receive(_frame(*snapshot[:400]))
+        self.assertFalse(self.history.snapshot_complete('SPY'))
+        self.assertEqual(len(self.history.candles('SPY').close), 0)
+        self.__receive(_frame(*snapshot[400:]))
+        self.assertTrue(self.history.snapshot_complete('SPY'))
+        candles = self.history.candles('SPY')
+        self.assertEqual(list(candles.close), [100 + m for m in range(1000)])
+        self.assertEqual(candles.time[0], START)
+        self.assertEqual(len(self.snapshots), 1)
+
+    def test_live_updates_after_snapshot(self):
+        self.__receive(_frame(*_snapshot('SPY', 3), _values('SPY', 2, 110), _values('SPY', 3, 111)))
+        self.__receive(_frame(_values('SPY', 1, 0, REMOVE_EVENT)))
+        candles = self.history.candles('SPY')
+        self.assertEqual(list(candles.close), [100, 110, 111])
+        self.assertEqual(list(candles.time), [START, START + 2 * MINUTE, START + 3 * MINUTE])
+
+    def test_symbols_in_one_frame(self):
+        self.__receive(_frame(*_snapshot('SPY', 2), *_snapshot('QQQ', 3, SNAPSHOT_SNIP)))
+        self.assertEqual(list(self.history.candles('SPY').close), [100, 101])
+        self.assertEqual(list(self.history.candles('QQQ').close), [100, 101, 102])
+        self.assertEqual(sorted(s for s, _ in self.snapshots), ['QQQ', 'SPY'])
+
+    def test_interleaved_symbols(self):
+        self.__receive(_frame(*_snapshot('SPY', 2), *_snapshot('QQQ', 3)))
+        self.__receive(_frame(_values('SPY', 2, 110), _values('QQQ', 5, 99), _values('SPY', 3, 111)))
+        self.assertEqual(list(self.history.candles('SPY').close), [100, 101, 110, 111])
+        self.assertEqual(list(self.history.candles('QQQ').close), [100, 101, 102, 99])
+
+    def test_new_snapshot_replaces_history(self):
+        self.__receive(_frame(*_snapshot('SPY', 5)))
+        self.__receive(_frame(*_snapshot('SPY', 2)))
+        self.assertEqual(list(self.history.candles('SPY').close), [100, 101])
+        empty = _values('SPY', 0, 0, SNAPSHOT_BEGIN | SNAPSHOT_END | REMOVE_EVENT)
+        self.__receive(_frame(empty))
+        self.assertTrue(self.history.snapshot_complete('SPY'))
+        self.assertEqual(len(self.history.candles('SPY').close), 0)
+
+    def test_wait_for_snapshot(self):
+        self.assertFalse(self.history.wait_for_snapshot(['SPY'], timeout=0.01))
+        threading.Timer(0.01, lambda: self.__receive(_frame(*_snapshot('SPY', 2)))).start()
+        self.assertTrue(self.history.wait_for_snapshot(['SPY'], timeout=5))
+
+
+@skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+class CandleSubscriptionTest(TestCase):
+    def test_replayed_snapshot_and_live_candles(self):
+        directory = tempfile.mkdtemp()
+        snapshot = _snapshot('SPY', 500)
+        with FrameRecorder(directory) as recorder:
+            recorder.record(ujson.dumps({'type': 'SETUP', 'keepaliveTimeout': 60}), received_at_ns=0)
+            recorder.record(_frame(*snapshot[:250]), received_at_ns=1)
+            recorder.record(_frame(*snapshot[250:]), received_at_ns=2)
+            recorder.record(_frame(_values('SPY', 500, 99)), received_at_ns=3)
+        batches = []
+        subscription = ReplaySubscription(directory, speed=None, batch_handlers=BatchHandlers(candle=batches.append),
+                                          candles=CandleConfig(history=True)).open()
+        self.assertTrue(subscription.wait(5))
+        subscription.close()
+        candles = subscription.candle_history.candles('SPY')
+        self.assertEqual(len(candles.close), 501)
+        self.assertEqual(candles.close[-1], 99)
+        self.assertEqual(len(batches), 3)
@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+import ujson
+
+from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.codec import CODECS, available, get_codec
+from tastytrade_sdk.market_data.dxlink import DxLinkProtocol
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+
+FEED_DATA = ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': [
+    'Quote', ['Quote', 'SPY', 1.5, 10, 'Q', 1.6, 20, 'Z', 'Quote', 'SPY', 1.25, 1, 'X', 'NaN', 2, 'X'],
+    'Trade', ['Trade', 'SPY', 1700000000123, 42, 'Q', 1.5, 0.1, 100, False, 19000, 12345, 'NaN']
+]})
+
+
+class CodecTest(TestCase):
+    def test_ujson_and_json_are_always_available(self):
+        self.assertTrue(available('ujson'))
+        self.assertTrue(available('json'))
+
+    def test_default_is_first_available(self):
+        self.assertEqual(get_codec().name, next(name for name in CODECS if available(name)))
+
+    def test_unknown(self):
+        with self.assertRaises(InvalidArgument):
+            get_codec('yaml')
+
+    def test_round_trip(self):
+        message = {'type': 'FEED_SUBSCRIPTION', 'channel': 1, 'add': [{'symbol': 'SPY', 'type': 'Quote'}]}
+        for name in filter(available, CODECS):
+            codec = get_codec(name)
+            encoded = codec.dumps(message)
+            self.assertIsInstance(encoded, str)
+            self.assertEqual(codec.loads(encoded), message)
+            self.assertEqual(codec.loads(encoded.encode()), message)
+
+    def test_codecs_decode_the_same_events(self):
+        translations = StreamerSymbolTranslations([('SPY', 'SPY')])
+        decoded = {name: DxLinkProtocol(translations, ['Quote', 'Trade'], codec=get_codec(name)).handle(FEED_DATA)[1]
+                   for name in filter(available, CODECS)}
+        expected = decoded.pop('ujson')
+        self.assertEqual(len(expected), 3)
+        for name, events in decoded.items():
+            self.assertEqual(events, expected, name)
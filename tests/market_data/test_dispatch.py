@@ -0,0 +1,93 @@
+import threading
+from unittest import TestCase
+
+from tastytrade_sdk import DispatchConfig, OverflowPolicy
+from tastytrade_sdk.market_data.dispatch import Dispatcher
+
+
+class DispatcherTest(TestCase):
+    def __blocked_dispatcher(self, config: DispatchConfig):
+        # The first event blocks its worker until released, so that everything after it stays queued
+        release = threading.Event()
+        handled = []
+        dispatcher = Dispatcher(config)
+        started = threading.Event()
+
+        def block(_):
+            started.set()
+            release.wait()
+
+        dispatcher.submit(None, None, block, None)
+        started.wait()
+        return dispatcher, release, handled
+
+    def test_handles_events_in_order(self):
+        handled = []
+        dispatcher = Dispatcher(DispatchConfig())
+        for i in range(100):
+            dispatcher.submit(('Quote', 'SPY'), 'SPY', handled.append, i)
+        dispatcher.stop()
+        self.assertEqual(handled, list(range(100)))
+        self.assertEqual(dispatcher.stats().dispatched, 100)
+
+    def test_drop_oldest(self):
+        dispatcher, release, handled = self.__blocked_dispatcher(
+            DispatchConfig(max_queue_size=2, overflow_policy=OverflowPolicy.DROP_OLDEST))
+        for i in range(5):
+            dispatcher.submit(None, 'SPY', handled.append, i)
+        self.assertEqual(dispatcher.stats().depths, [2])
+        release.set()
+        dispatcher.stop()
+        self.assertEqual(handled, [3, 4])
+        self.assertEqual(dispatcher.stats().dropped, 3)
+
+    def test_conflate(self):
+        dispatcher, release, handled = self.__blocked_dispatcher(
+            DispatchConfig(max_queue_size=10, overflow_policy=OverflowPolicy.CONFLATE))
+        for i in range(5):
+            dispatcher.submit(('Quote', 'SPY'), 'SPY', handled.append, ('SPY', i))
+            dispatcher.submit(('Quote', 'QQQ'), 'QQQ', handled.append, ('QQQ', i))
+        release.set()
+        dispatcher.stop()
+        self.assertEqual(handled, [('SPY', 4), ('QQQ', 4)])
+        self.assertEqual(dispatcher.stats().conflated, 8)
+
+    def test_conflate_keeps_the_earlier_position(self):
+        dispatcher, release, handled = self.__blocked_dispatcher(
+            DispatchConfig(max_queue_size=10, overflow_policy=OverflowPolicy.CONFLATE))
+        dispatcher.submit(('Quote', 'SPY'), 'SPY', handled.append, 'SPY quote 1')
+        dispatcher.submit(('Trade', 'SPY'), 'SPY', handled.append, 'SPY trade')
+        dispatcher.submit(('Quote', 'SPY'), 'SPY', handled.append, 'SPY quote 2')
+        release.set()
+        dispatcher.stop()
+        self.assertEqual(handled, ['SPY quote 2', 'SPY trade'])
+
+    def test_block_waits_for_room(self):
+        dispatcher, release, handled = self.__blocked_dispatcher(DispatchConfig(max_queue_size=1))
+        dispatcher.submit(None, 'SPY', handled.append, 0)
+        submitted = threading.Event()
+        threading.Thread(target=lambda: (dispatcher.submit(None, 'SPY', handled.append, 1), submitted.set())).start()
+        self.assertFalse(submitted.wait(0.05))
+        release.set()
+        self.assertTrue(submitted.wait(1))
+        dispatcher.stop()
+        self.assertEqual(handled, [0, 1])
+
+    def test_partitions_keep_per_symbol_order(self):
+        handled = {'SPY': [], 'QQQ': [], 'IWM': []}
+        dispatcher = Dispatcher(DispatchConfig(workers=3))
+        for i in range(100):
+            for symbol, events in handled.items():
+                dispatcher.submit(None, symbol, events.append, i)
+        dispatcher.stop()
+        for events in handled.values():
+            self.assertEqual(events, list(range(100)))
+
+    def test_failing_handler_does_not_stop_worker(self):
+        handled = []
+        dispatcher = Dispatcher(DispatchConfig())
+        with self.assertLogs(level='ERROR'):
+            dispatcher.submit(None, None, lambda _: 1 / 0, None)
+            dispatcher.submit(None, None, handled.append, 1)
+            dispatcher.stop()
+        self.assertEqual(handled, [1])
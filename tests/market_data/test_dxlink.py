@@ -0,0 +1,125 @@
+import datetime as dt
+from unittest import TestCase
+
+import ujson
+
+from tastytrade_sdk import Quote
+from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.dxlink import DxLinkProtocol, StreamerException, SETUP
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+
+
+class DxLinkProtocolTest(TestCase):
+    def setUp(self) -> None:
+        self.protocol = DxLinkProtocol(StreamerSymbolTranslations([('SPY', 'SPY'), ('/ESU3', '/ESU23:XCME')]),
+                                       ['Quote', 'Trade'])
+
+    def test_feed_setup_requests_compact_fields(self):
+        message = ujson.loads(self.protocol.feed_setup())
+        self.assertEqual(message['acceptDataFormat'], 'COMPACT')
+        self.assertEqual(message['acceptEventFields']['Quote'], [
+            'eventType', 'eventSymbol', 'bidPrice', 'bidSize', 'bidExchangeCode', 'askPrice', 'askSize',
+            'askExchangeCode'
+        ])
+        self.assertEqual(set(message['acceptEventFields']), {'Quote', 'Trade'})
+
+    def test_setup_sets_keepalive_interval(self):
+        state, events, _ = self.protocol.handle(ujson.dumps({'type': 'SETUP', 'keepaliveTimeout': 60}))
+        self.assertEqual(state, SETUP)
+        self.assertEqual(events, [])
+        self.assertEqual(self.protocol.keepalive_interval, 30)
+
+    def test_error(self):
+        with self.assertRaises(StreamerException):
+            self.protocol.handle(ujson.dumps({'type': 'ERROR', 'error': 'TIMEOUT', 'message': 'too slow'}))
+
+    def test_compact_feed_data(self):
+        _, events, _ = self.protocol.handle(ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': [
+            'Quote', ['Quote', 'SPY', 1.5, 10, 'Q', 1.6, 20, 'Z',
+                      'Quote', '/ESU23:XCME', 4300.25, 1, 'X', 'NaN', 2, 'X']
+        ]}))
+        self.assertEqual(events, [
+            ('Quote', Quote('SPY', 1.5, 10, 'Q', 1.6, 20, 'Z')),
+            ('Quote', Quote('/ESU3', 4300.25, 1, 'X', None, 2, 'X'))
+        ])
+
+    def test_compact_feed_data_uses_feed_config_field_order(self):
+        self.protocol.handle(ujson.dumps({'type': 'FEED_CONFIG', 'channel': 1, 'dataFormat': 'COMPACT', 'eventFields': {
+            'Quote': ['eventType', 'eventSymbol', 'askPrice', 'bidPrice']
+        }}))
+        _, events, _ = self.protocol.handle(ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': [
+            'Quote', ['Quote', 'SPY', 1.6, 1.5]
+        ]}))
+        self.assertEqual(events, [('Quote', Quote('SPY', 1.5, None, None, 1.6, None, None))])
+
+    def test_full_feed_data(self):
+        _, events, _ = self.protocol.handle(ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': [{
+            'eventType': 'Trade', 'eventSymbol': 'SPY', 'time': 1688140800000, 'sequence': 1, 'exchangeCode': 'Q',
+            'price': 440.0, 'change': 1.25, 'size': 100, 'extendedTradingHours': False, 'dayId': 19538,
+            'dayVolume': 1000, 'dayTurnover': 440000.0
+        }]}))
+        [(event_type, trade)] = events
+        self.assertEqual(event_type, 'Trade')
+        self.assertEqual(trade.time, dt.datetime(2023, 6, 30, 16))
+        self.assertEqual(trade.price, 440.0)
+
+    def test_ignores_unsubscribed_event_types(self):
+        _, events, _ = self.protocol.handle(ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': [
+            'Greeks', ['Greeks', 'SPY', 0, 1, 2, 3, 4, 5, 6, 7]
+        ]}))
+        self.assertEqual(events, [])
+
+
+class DxLinkProtocolSubscriptionsTest(TestCase):
+    def setUp(self) -> None:
+        self.protocol = DxLinkProtocol(StreamerSymbolTranslations([('SPY', 'SPY')]), ['Quote', 'Greeks'])
+
+    def test_initial_subscriptions(self):
+        message = ujson.loads(self.protocol.feed_subscription())
+        self.assertEqual(message['add'], [{'symbol': 'SPY', 'type': 'Quote'}, {'symbol': 'SPY', 'type': 'Greeks'}])
+
+    def test_chunked_subscriptions(self):
+        self.protocol.add_subscriptions(['AAPL', 'QQQ'])
+        messages = [ujson.loads(m) for m in self.protocol.feed_subscriptions(4)]
+        self.assertEqual([len(m['add']) for m in messages], [4, 2])
+        self.assertEqual([(a['symbol'], a['type']) for m in messages for a in m['add']], self.protocol.subscriptions)
+
+    def test_add_subscriptions_sends_only_new_pairs(self):
+        message = ujson.loads(self.protocol.add_subscriptions(['SPY', 'AAPL'], ['Quote']))
+        self.assertEqual(message['add'], [{'symbol': 'AAPL', 'type': 'Quote'}])
+        self.assertIsNone(self.protocol.add_subscriptions(['AAPL'], ['Quote']))
+        self.assertIn(('AAPL', 'Quote'), self.protocol.subscriptions)
+
+    def test_remove_subscriptions(self):
+        message = ujson.loads(self.protocol.remove_subscriptions(['SPY', 'AAPL']))
+        self.assertEqual(message['remove'], [{'symbol': 'SPY', 'type': 'Quote'}, {'symbol': 'SPY', 'type': 'Greeks'}])
+        self.assertEqual(self.protocol.subscriptions, [])
+        self.assertIsNone(self.protocol.remove_subscriptions(['SPY']))
+
+    def test_rejects_event_types_without_handlers(self):
+        with self.assertRaises(InvalidArgument):
+            self.protocol.add_subscriptions(['SPY'], ['Trade'])
+
+
+class DxLinkProtocolCandlesTest(TestCase):
+    def setUp(self) -> None:
+        self.protocol = DxLinkProtocol(StreamerSymbolTranslations([('/ESU3', '/ESU23:XCME')]), ['Candle'],
+                                       candle_period='5m', candle_from_time=dt.datetime(2023, 6, 30))
+
+    def test_subscribes_to_candle_symbols_from_time(self):
+        message = ujson.loads(self.protocol.feed_subscription())
+        self.assertEqual(message['add'], [{'symbol': '/ESU23:XCME{=5m}', 'type': 'Candle', 'fromTime': 1688083200000}])
+        message = ujson.loads(self.protocol.remove_subscriptions(['/ESU23:XCME']))
+        self.assertEqual(message['remove'], [{'symbol': '/ESU23:XCME{=5m}', 'type': 'Candle'}])
+
+    def test_translates_candle_symbols(self):
+        _, events, _ = self.protocol.handle(ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': [
+            'Candle', ['Candle', '/ESU23:XCME{=5m}', 4, 1, 1688083200000, 10, 4300, 4310.5, 4299, 4305, 1200,
+                       4304.2, 'NaN', 'NaN']
+        ]}))
+        [(event_type, candle)] = events
+        self.assertEqual(event_type, 'Candle')
+        self.assertEqual((candle.symbol, candle.eventSymbol), ('/ESU3', '/ESU23:XCME{=5m}'))
+        self.assertEqual((candle.time, candle.open, candle.close, candle.impVolatility),
+                         (1688083200000, 4300, 4305, None))
+        self.assertFalse(candle.snapshot_end)
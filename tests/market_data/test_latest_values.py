@@ -0,0 +1,39 @@
+import threading
+from unittest import TestCase
+
+from tastytrade_sdk import LatestValues
+from tests.market_data import events
+
+
+class LatestValuesTest(TestCase):
+    def test_keeps_latest_event_per_symbol_and_type(self):
+        latest = LatestValues()
+        latest.update([('Quote', events.quote('SPY', 1.0)), ('Quote', events.quote('SPY', 2.0)),
+                       ('Greeks', events.greeks('SPY', 0.5))])
+        self.assertEqual(latest.get('SPY', 'Quote').bid_price, 2.0)
+        self.assertEqual(set(latest.get_all('SPY')), {'Quote', 'Greeks'})
+        self.assertIsNone(latest.get('QQQ', 'Quote'))
+        self.assertEqual(latest.version, 3)
+        self.assertEqual(latest.version_of('SPY'), 3)
+
+    def test_snapshot_is_consistent(self):
+        latest = LatestValues()
+        latest.update([('Quote', events.quote('SPY', 1.0)), ('Quote', events.quote('QQQ', 2.0))])
+        snapshot = latest.snapshot()
+        latest.update([('Quote', events.quote('SPY', 3.0))])
+        self.assertEqual(snapshot.version, 2)
+        self.assertEqual(snapshot.events['SPY']['Quote'].bid_price, 1.0)
+        self.assertEqual(set(latest.snapshot(['QQQ', 'FOO']).events), {'QQQ'})
+
+    def test_wait_for_update(self):
+        latest = LatestValues()
+        latest.update([('Quote', events.quote('SPY', 1.0))])
+        version = latest.version
+        threading.Timer(0.01, lambda: latest.update([('Quote', events.quote('QQQ', 1.0))])).start()
+        self.assertEqual(latest.wait_for_update(['QQQ'], timeout=1, since=version), ['QQQ'])
+        self.assertEqual(latest.wait_for_update(since=0), ['SPY', 'QQQ'])
+
+    def test_wait_for_update_times_out(self):
+        latest = LatestValues()
+        latest.update([('Quote', events.quote('SPY', 1.0))])
+        self.assertEqual(latest.wait_for_update(['QQQ'], timeout=0.01, since=0), [])
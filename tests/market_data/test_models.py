@@ -0,0 +1,74 @@
+import datetime as dt
+import pickle
+from unittest import TestCase
+
+from tastytrade_sdk.market_data.models import Quote, Trade, Greeks, FrozenQuote, FrozenTrade
+from tests.market_data import events
+
+
+def _trade(cls=Trade, time=1688140800000) -> Trade:
+    """A trade with numbers the way the streamer sends them"""
+    return events.trade(time=time, price='440.25', size=100, sequence=1, change='NaN', day_id=19538, day_volume=1000,
+                        day_turnover=float('nan'), cls=cls)
+
+
+class ModelsTest(TestCase):
+    def test_parses_numeric_strings_and_nan(self):
+        quote = Quote('SPY', '1.25', '10', 'Q', 'NaN', float('nan'), 'Z')
+        self.assertEqual(quote.bid_price, 1.25)
+        self.assertEqual(quote.bid_size, 10.0)
+        self.assertIsNone(quote.ask_price)
+        self.assertIsNone(quote.ask_size)
+        self.assertIsNone(Quote('SPY', 'foo', None, None, None, None, None).bid_price)
+
+    def test_slotted(self):
+        quote = Quote('SPY', 1.0, 1.0, 'Q', 1.0, 1.0, 'Q')
+        self.assertFalse(hasattr(quote, '__dict__'))
+        with self.assertRaises(AttributeError):
+            setattr(quote, 'foo', 1)
+
+    def test_equality_and_repr(self):
+        self.assertEqual(Quote('SPY', 1.0, 2.0, 'Q', 3.0, 4.0, 'Z'), Quote('SPY', 1.0, 2.0, 'Q', 3.0, 4.0, 'Z'))
+        self.assertNotEqual(Quote('SPY', 1.0, 2.0, 'Q', 3.0, 4.0, 'Z'), Quote('QQQ', 1.0, 2.0, 'Q', 3.0, 4.0, 'Z'))
+        self.assertEqual(repr(Greeks('SPY', 0, None, None, None, None, None, None, None)),
+                         'Greeks(symbol=\'SPY\', time=0, price=None, volatility=None, delta=None, gamma=None, '
+                         'theta=None, rho=None, vega=None)')
+
+    def test_trade_time_is_lazy(self):
+        trade = _trade()
+        self.assertEqual(trade.timestamp, 1688140800000)
+        self.assertEqual(trade.time, dt.datetime(2023, 6, 30, 16))
+        self.assertEqual(trade.price, 440.25)
+        self.assertIsNone(trade.change)
+        self.assertIsNone(trade.dayTurnover)
+
+    def test_trade_accepts_datetime(self):
+        trade = _trade(time=dt.datetime(2023, 6, 30, 16))
+        self.assertEqual(trade.timestamp, 1688140800000)
+        self.assertEqual(trade, _trade())
+
+    def test_frozen(self):
+        quote = FrozenQuote('SPY', '1.25', 10, 'Q', 1.5, 20, 'Z')
+        self.assertIsInstance(quote, Quote)
+        self.assertEqual(quote, Quote('SPY', 1.25, 10, 'Q', 1.5, 20, 'Z'))
+        self.assertEqual(repr(quote), repr(Quote('SPY', 1.25, 10, 'Q', 1.5, 20, 'Z')))
+        with self.assertRaises(AttributeError):
+            quote.bid_price = 1.0
+        self.assertEqual(len({quote, FrozenQuote('SPY', 1.25, 10, 'Q', 1.5, 20, 'Z')}), 1)
+        self.assertEqual(_trade(FrozenTrade).time, dt.datetime(2023, 6, 30, 16))
+
+    def test_as_dict_and_replace(self):
+        quote = Quote('SPY', 1.0, 2.0, 'Q', 3.0, 4.0, 'Z')
+        self.assertEqual(quote.as_dict(), {'symbol': 'SPY', 'bid_price': 1.0, 'bid_size': 2.0, 'bid_exchange_code': 'Q',
+                                           'ask_price': 3.0, 'ask_size': 4.0, 'ask_exchange_code': 'Z'})
+        self.assertEqual(quote.replace(bid_price='1.5'), Quote('SPY', 1.5, 2.0, 'Q', 3.0, 4.0, 'Z'))
+        frozen = _trade(FrozenTrade).replace(price=441)
+        self.assertIs(type(frozen), FrozenTrade)
+        self.assertEqual((frozen.price, frozen.timestamp), (441, 1688140800000))
+
+    def test_pickle(self):
+        for event in (Quote('SPY', 1.0, 2.0, 'Q', 3.0, 4.0, 'Z'), FrozenQuote('SPY', 1.0, 2.0, 'Q', 3.0, 4.0, 'Z'),
+                      _trade(), _trade(FrozenTrade)):
+            copy = pickle.loads(pickle.dumps(event))
+            self.assertIs(type(copy), type(event))
+            self.assertEqual(copy, event)
@@ -0,0 +1,85 @@
+import datetime as dt
+import importlib.util
+from random import Random
+from unittest import TestCase, skipUnless
+
+try:
+    from tastytrade_sdk.market_data.portfolio_greeks import PortfolioGreeks
+except ImportError:
+    pass
+
+from tests.market_data import events
+
+CALL = 'SPY   230818C00450000'
+PUT = 'SPY   230915P00440000'
+
+
+@skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+class PortfolioGreeksTest(TestCase):
+    def test_position_weighted_totals(self):
+        portfolio = PortfolioGreeks()
+        portfolio.add_position(CALL, 2, 'SPY')
+        portfolio.add_position(PUT, -1, 'SPY')
+        portfolio.add_position('SPY', -50, 'SPY', multiplier=1)
+        portfolio.update(events.greeks(CALL, 0.5, 0.01, -0.2, 0.3, 0.1))
+        portfolio.update(events.greeks(PUT, -0.4, 0.02, -0.1, 0.25, -0.05))
+        total = portfolio.total()
+        self.assertAlmostEqual(total['delta'], 2 * 100 * 0.5 + 100 * 0.4 - 50)
+        self.assertAlmostEqual(total['gamma'], 200 * 0.01 - 100 * 0.02)
+        self.assertAlmostEqual(total['vega'], 200 * 0.3 - 100 * 0.25)
+        self.assertAlmostEqual(portfolio.by_underlying()['SPY']['delta'], total['delta'])
+        by_expiration = portfolio.by_expiration()
+        self.assertAlmostEqual(by_expiration[('SPY', dt.date(2023, 8, 18))]['delta'], 100)
+        self.assertAlmostEqual(by_expiration[('SPY', dt.date(2023, 9, 15))]['delta'], 40)
+        self.assertAlmostEqual(by_expiration[('SPY', None)]['delta'], -50)
+
+    def test_updates_replace_previous_greeks(self):
+        portfolio = PortfolioGreeks()
+        portfolio.add_position(CALL, 1, 'SPY')
+        portfolio.update(events.greeks(CALL, 0.5, 0.01))
+        portfolio.update(events.greeks(CALL, 0.6))
+        total = portfolio.total()
+        self.assertAlmostEqual(total['delta'], 60)
+        self.assertAlmostEqual(total['gamma'], 1)
+
+    def test_resizing_and_adding_positions_reuse_known_greeks(self):
+        portfolio = PortfolioGreeks()
+        portfolio.add_position(CALL, 1, 'SPY')
+        portfolio.update(events.greeks(CALL, 0.5))
+        portfolio.set_quantity(CALL, 3)
+        self.assertAlmostEqual(portfolio.total()['delta'], 150)
+        portfolio.add_position(CALL, -1, 'SPY')
+        self.assertAlmostEqual(portfolio.total()['delta'], 100)
+        portfolio.update(events.greeks('QQQ', 0.5))
+        self.assertAlmostEqual(portfolio.total()['delta'], 100)
+
+    def test_resizing_keeps_the_multiplier(self):
+        portfolio = PortfolioGreeks()
+        portfolio.add_position('/ESU3', 1, '/ES', multiplier=50)
+        portfolio.update(events.greeks('/ESU3', 1))
+        portfolio.set_quantity('/ESU3', 2)
+        self.assertAlmostEqual(portfolio.total()['delta'], 100)
+
+    def test_api_positions(self):
+        portfolio = PortfolioGreeks()
+        portfolio.add_api_position({'symbol': CALL, 'underlying-symbol': 'SPY', 'quantity': '2',
+                                    'quantity-direction': 'Short', 'multiplier': 100})
+        portfolio.update(events.greeks(CALL, 0.5))
+        self.assertAlmostEqual(portfolio.total()['delta'], -100)
+        self.assertEqual(portfolio.symbols, [CALL])
+
+    def test_incremental_totals_match_recomputed_totals(self):
+        random = Random(1)
+        portfolio = PortfolioGreeks(resync_every=1000)
+        symbols = [f'SPY   2308{18 + i % 3:02}C{i:08}' for i in range(5000)]
+        quantities = [random.randint(-10, 9) for _ in symbols]
+        for symbol, quantity in zip(symbols, quantities):
+            portfolio.add_position(symbol, quantity, 'SPY')
+        deltas = {}
+        for _ in range(20_000):
+            symbol = random.choice(symbols)
+            deltas[symbol] = random.random()
+            portfolio.update(events.greeks(symbol, deltas[symbol]))
+        expected = sum(100 * q * deltas.get(s, 0.0) for s, q in zip(symbols, quantities))
+        self.assertAlmostEqual(portfolio.total()['delta'], expected, places=6)
+        self.assertEqual(len(portfolio.by_expiration()), 3)
@@ -0,0 +1,42 @@
+import gzip
+import os
+import tempfile
+from unittest import TestCase
+
+from tastytrade_sdk.market_data.recording import FrameRecorder, read_frames
+
+
+class FrameRecorderTest(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def test_records_frames_in_order_across_segments(self):
+        with FrameRecorder(self.directory, segment_max_bytes=50) as recorder:
+            for i in range(10):
+                recorder.record(f'{{"type": "KEEPALIVE", "n": {i}}}', received_at_ns=i)
+        self.assertGreater(len(os.listdir(self.directory)), 1)
+        self.assertEqual(list(read_frames(self.directory)),
+                         [(i, f'{{"type": "KEEPALIVE", "n": {i}}}') for i in range(10)])
+
+    def test_keeps_one_frame_per_line(self):
+        with FrameRecorder(self.directory) as recorder:
+            recorder.record(b'{"type":\n"KEEPALIVE"}', received_at_ns=1)
+        self.assertEqual(list(read_frames(self.directory)), [(1, '{"type": "KEEPALIVE"}')])
+
+    def test_reads_a_single_segment(self):
+        with FrameRecorder(self.directory) as recorder:
+            recorder.record('{}', received_at_ns=1)
+        [segment] = os.listdir(self.directory)
+        self.assertEqual(list(read_frames(os.path.join(self.directory, segment))), [(1, '{}')])
+
+    def test_skips_truncated_tail(self):
+        path = os.path.join(self.directory, 'frames-1.log.gz')
+        with gzip.open(path, 'wb') as file:
+            file.write(b'1\t{}\n2\t{}\n' * 1000)
+        with open(path, 'rb') as file:
+            data = file.read()
+        with open(path, 'wb') as file:
+            file.write(data[:-20])
+        with self.assertLogs(level='WARNING'):
+            frames = list(read_frames(self.directory))
+        self.assertTrue(0 < len(frames) < 2000)
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from tastytrade_sdk import ReconnectPolicy, Gap
+from tastytrade_sdk.market_data.recovery import TradeGapDetector
+from tests.market_data import events
+
+
+class ReconnectPolicyTest(TestCase):
+    def test_delays_back_off_exponentially_up_to_max(self):
+        policy = ReconnectPolicy(initial_delay_seconds=1, max_delay_seconds=5, jitter=0, max_attempts=5)
+        self.assertEqual(list(policy.delays()), [1, 2, 4, 5, 5])
+
+    def test_jitter(self):
+        policy = ReconnectPolicy(initial_delay_seconds=1, jitter=0.1, max_attempts=20)
+        for delay in policy.delays():
+            self.assertTrue(0.9 <= delay <= 1.1 * policy.max_delay_seconds)
+
+    def test_retries_forever_by_default(self):
+        delays = ReconnectPolicy().delays()
+        for _ in range(1000):
+            next(delays)
+
+
+class TradeGapDetectorTest(TestCase):
+    def test_detects_sequence_jump_within_same_time(self):
+        detector = TradeGapDetector()
+        self.assertIsNone(detector.check(events.trade('SPY', 1000, sequence=0)))
+        self.assertIsNone(detector.check(events.trade('SPY', 1000, sequence=1)))
+        self.assertEqual(detector.check(events.trade('SPY', 1000, sequence=4)), Gap('SPY', 1000, 2, 4))
+
+    def test_ignores_new_time_and_other_symbols(self):
+        detector = TradeGapDetector()
+        detector.check(events.trade('SPY', 1000, sequence=1))
+        self.assertIsNone(detector.check(events.trade('QQQ', 1000, sequence=5)))
+        self.assertIsNone(detector.check(events.trade('SPY', 1001, sequence=5)))
+        self.assertIsNone(detector.check(events.trade('SPY', 1001, sequence=5)))
@@ -0,0 +1,51 @@
+import tempfile
+import time
+from unittest import TestCase
+
+import ujson
+
+from tastytrade_sdk import Quote
+from tastytrade_sdk.market_data.recording import FrameRecorder
+from tastytrade_sdk.market_data.replay import ReplaySubscription
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+
+
+def _feed_data(streamer_symbol: str, bid_price: float) -> str:
+    return ujson.dumps({'type': 'FEED_DATA', 'channel': 1, 'data': [
+        'Quote', ['Quote', streamer_symbol, bid_price, 1, 'Q', bid_price + 1, 1, 'Q']
+    ]})
+
+
+class ReplaySubscriptionTest(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        with FrameRecorder(self.directory) as recorder:
+            recorder.record(ujson.dumps({'type': 'SETUP', 'keepaliveTimeout': 60}), received_at_ns=0)
+            recorder.record(_feed_data('/ESU23:XCME', 1.0), received_at_ns=1_000_000_000)
+            recorder.record(_feed_data('SPY', 2.0), received_at_ns=1_200_000_000)
+
+    def __replay(self, **kwargs) -> list:
+        quotes = []
+        subscription = ReplaySubscription(self.directory, on_quote=quotes.append, **kwargs).open()
+        self.assertTrue(subscription.wait(5))
+        subscription.close()
+        return quotes
+
+    def test_replays_through_handlers(self):
+        self.assertEqual(self.__replay(speed=None), [
+            Quote('/ESU23:XCME', 1.0, 1, 'Q', 2.0, 1, 'Q'),
+            Quote('SPY', 2.0, 1, 'Q', 3.0, 1, 'Q')
+        ])
+
+    def test_translates_streamer_symbols(self):
+        translations = StreamerSymbolTranslations([('/ESU3', '/ESU23:XCME'), ('SPY', 'SPY')])
+        quotes = self.__replay(speed=None, streamer_symbol_translations=translations)
+        self.assertEqual([q.symbol for q in quotes], ['/ESU3', 'SPY'])
+
+    def test_paces_by_receive_time(self):
+        started_at = time.monotonic()
+        self.__replay(speed=1)
+        self.assertGreaterEqual(time.monotonic() - started_at, 1.2)
+        started_at = time.monotonic()
+        self.__replay(speed=10)
+        self.assertLess(time.monotonic() - started_at, 1)
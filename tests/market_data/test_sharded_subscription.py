@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+from tastytrade_sdk import ShardedSubscription, SubscriptionConfig
+from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.sharded_subscription import shard_of
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+
+
+class ShardOfTest(TestCase):
+    def test_stable_and_in_range(self):
+        self.assertEqual(shard_of('SPY', 8), shard_of('SPY', 8))
+        self.assertEqual(shard_of('SPY', 8), 7)
+        self.assertTrue(all(0 <= shard_of(f'S{i}', 3) < 3 for i in range(100)))
+
+    def test_spreads_symbols_evenly(self):
+        counts = [0] * 4
+        for i in range(4000):
+            counts[shard_of(f'S{i}', 4)] += 1
+        self.assertTrue(all(900 < c < 1100 for c in counts))
+
+
+class ShardedSubscriptionTest(TestCase):
+    def setUp(self) -> None:
+        self.translations = StreamerSymbolTranslations([(f'S{i}', f'S{i}') for i in range(100)])
+
+    def test_partitions_symbols_across_shards(self):
+        subscription = ShardedSubscription('url', 'token', self.translations, 3, {'Quote': print})
+        health = subscription.health()
+        self.assertEqual([h.shard for h in health], [0, 1, 2])
+        self.assertEqual(sum(h.symbols for h in health), 100)
+        self.assertFalse(any(h.connected for h in health))
+
+    def test_requires_a_shard(self):
+        with self.assertRaises(InvalidArgument):
+            ShardedSubscription('url', 'token', self.translations, 0, {'Quote': print})
+
+    def test_requires_at_least_one_event_handler(self):
+        with self.assertRaises(InvalidArgument):
+            ShardedSubscription('url', 'token', self.translations, 2, {})
+
+    def test_rejects_unsupported_options(self):
+        with self.assertRaises(InvalidArgument):
+            ShardedSubscription('url', 'token', self.translations, 2, {'Quote': print},
+                                config=SubscriptionConfig(on_gap=print))
+
+    def test_rejects_unknown_symbols_and_event_types(self):
+        subscription = ShardedSubscription('url', 'token', self.translations, 2, {'Quote': print})
+        with self.assertRaises(InvalidArgument):
+            subscription.add_symbols(['UNKNOWN'])
+        with self.assertRaises(InvalidArgument):
+            subscription.remove_symbols(['S1'], ['Greeks'])
@@ -0,0 +1,59 @@
+import time
+from unittest import TestCase
+
+from tastytrade_sdk.market_data.stats import SubscriptionStats
+from tests.market_data import events
+
+
+class SubscriptionStatsTest(TestCase):
+    def test_counts_events_and_feed_lag(self):
+        stats = SubscriptionStats()
+        stats.opened()
+        stats.decoded(0.0001)
+        stats.received([('Trade', events.trade('SPY', int(time.time() * 1000) - 2000)), ('Quote', events.quote('SPY'))])
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['frames'], 1)
+        self.assertEqual(snapshot['events'], {'Trade': 1, 'Quote': 1})
+        self.assertEqual(snapshot['decode_seconds']['count'], 1)
+        self.assertEqual(snapshot['feed_lag_seconds']['count'], 1)
+        self.assertGreaterEqual(snapshot['feed_lag_seconds']['max'], 2)
+
+    def test_handler_times_and_slowest_symbols(self):
+        stats = SubscriptionStats(slowest_symbols=1)
+        handled = []
+        handler = stats.timed('Quote', handled.append)
+        handler(events.quote('SPY'))
+        slow = stats.timed('Quote', lambda _: time.sleep(0.01))
+        slow(events.quote('AAPL'))
+        snapshot = stats.snapshot()
+        self.assertEqual(len(handled), 1)
+        self.assertEqual(snapshot['handler_seconds']['Quote']['count'], 2)
+        self.assertEqual(snapshot['handler_seconds']['Trade']['count'], 0)
+        self.assertEqual([symbol for symbol, _ in snapshot['slowest_symbols']], ['AAPL'])
+
+    def test_times_failing_handlers(self):
+        stats = SubscriptionStats()
+
+        def fail(_):
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            stats.timed('Quote', fail)(events.quote('SPY'))
+        self.assertEqual(stats.snapshot()['handler_seconds']['Quote']['count'], 1)
+
+    def test_stale_symbols(self):
+        stats = SubscriptionStats(stale_after_seconds=0.01)
+        self.assertEqual(stats.snapshot(['SPY'])['stale_symbols'], [])
+        stats.opened()
+        stats.received([('Quote', events.quote('SPY'))])
+        self.assertEqual(stats.snapshot(['SPY', 'AAPL'])['stale_symbols'], [])
+        time.sleep(0.02)
+        stats.received([('Quote', events.quote('SPY'))])
+        self.assertEqual(stats.snapshot(['SPY', 'AAPL'])['stale_symbols'], ['AAPL'])
+
+    def test_connection_counters(self):
+        stats = SubscriptionStats()
+        stats.disconnected()
+        stats.reconnected()
+        snapshot = stats.snapshot()
+        self.assertEqual((snapshot['disconnects'], snapshot['reconnects']), (1, 1))
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from tastytrade_sdk.config import Config
+from tastytrade_sdk.market_data.streamer_symbol_cache import StreamerSymbolCache
+
+
+def _cache(**kwargs) -> StreamerSymbolCache:
+    return StreamerSymbolCache(Config(api_base_url='api.cert.tastyworks.com', **kwargs))
+
+
+class StreamerSymbolCacheTest(TestCase):
+    def test_get_many_returns_only_hits(self):
+        cache = _cache()
+        cache.put_many([('SPY', 'SPY'), ('/ESU3', '/ESU23:XCME')])
+        self.assertEqual(cache.get_many(['SPY', '/ESU3', 'FOO']), {'SPY': 'SPY', '/ESU3': '/ESU23:XCME'})
+
+    def test_entries_expire(self):
+        cache = _cache(streamer_symbol_cache_ttl_seconds=0.01)
+        cache.put_many([('SPY', 'SPY')])
+        time.sleep(0.02)
+        self.assertEqual(cache.get_many(['SPY']), {})
+
+    def test_evicts_least_recently_used(self):
+        cache = _cache(streamer_symbol_cache_max_size=2)
+        cache.put_many([('SPY', 'SPY'), ('AAPL', 'AAPL')])
+        cache.get_many(['SPY'])
+        cache.put_many([('QQQ', 'QQQ')])
+        self.assertEqual(set(cache.get_many(['SPY', 'AAPL', 'QQQ'])), {'SPY', 'QQQ'})
+
+    def test_sqlite_store_is_shared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'symbols.sqlite')
+            _cache(streamer_symbol_cache_path=path).put_many([('SPY', 'SPY')])
+            self.assertEqual(_cache(streamer_symbol_cache_path=path).get_many(['SPY', 'FOO']), {'SPY': 'SPY'})
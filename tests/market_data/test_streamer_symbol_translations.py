@@ -1,6 +1,11 @@
 from unittest import TestCase, skip
+from unittest.mock import Mock
+from urllib.parse import unquote
 
-from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslationsFactory
+from tastytrade_sdk.config import Config
+from tastytrade_sdk.market_data.streamer_symbol_cache import StreamerSymbolCache
+from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations, \
+    StreamerSymbolTranslationsFactory, instrument_path_key, LOOKUP_CHUNK_SIZE
 from tests.utils import get_tasty
 
 
@@ -8,7 +13,7 @@ class StreamerSymbolTranslationsFactoryTest(TestCase):
 
     @classmethod
     def setUpClass(cls) -> None:
-        cls.__factory = StreamerSymbolTranslationsFactory(get_tasty().api)
+        cls.__factory = StreamerSymbolTranslationsFactory(get_tasty().api, _cache())
 
     def test_equities(self):
         translations = self.__factory.create(['SPY', 'AAPL', 'FOO'])
@@ -54,3 +59,86 @@ class StreamerSymbolTranslationsFactoryTest(TestCase):
         self.assertIsNotNone(translations.get_streamer_symbol('SPY   230630C00255000'))
         self.assertIsNotNone(translations.get_streamer_symbol('./ESU3 EW2N3 230714C4310'))
         self.assertIsNotNone(translations.get_streamer_symbol('BTC/USD'))
+
+
+def _cache() -> StreamerSymbolCache:
+    return StreamerSymbolCache(Config(api_base_url='api.cert.tastyworks.com'))
+
+
+def _api(streamer_symbols: dict) -> Mock:
+    def get(path, params):
+        symbols = [unquote(v) for k, v in params if k == 'symbol[]']
+        items = [{'symbol': s, 'streamer-symbol': streamer_symbols[s]} for s in symbols
+                 if s in streamer_symbols and path == f'/instruments/{instrument_path_key(s)}']
+        return {'data': {'items': items}}
+    return Mock(get=Mock(side_effect=get))
+
+
+class StreamerSymbolTranslationsFactoryOfflineTest(TestCase):
+    def test_only_looks_up_unknown_symbols(self):
+        api = _api({'AAPL': 'AAPL'})
+        translations = StreamerSymbolTranslations([('SPY', 'SPY')])
+        streamer_symbols = StreamerSymbolTranslationsFactory(api, _cache()).extend(translations, ['SPY', 'AAPL', 'FOO'])
+        self.assertEqual(streamer_symbols, ['SPY', 'AAPL'])
+        self.assertEqual(translations.get_original_symbol('AAPL'), 'AAPL')
+        looked_up = {v for call in api.get.call_args_list for k, v in call.kwargs['params'] if k == 'symbol[]'}
+        self.assertEqual(looked_up, {'AAPL', 'FOO'})
+
+    def test_no_lookup_when_all_known(self):
+        api = _api({})
+        StreamerSymbolTranslationsFactory(api, _cache()).extend(StreamerSymbolTranslations([('SPY', 'SPY')]), ['SPY'])
+        api.get.assert_not_called()
+
+    def test_cached_symbols_skip_lookup(self):
+        api = _api({'SPY': 'SPY'})
+        cache = _cache()
+        StreamerSymbolTranslationsFactory(api, cache).create(['SPY'])
+        api.get.reset_mock()
+        translations = StreamerSymbolTranslationsFactory(api, cache).create(['SPY'])
+        self.assertEqual(translations.get_streamer_symbol('SPY'), 'SPY')
+        api.get.assert_not_called()
+
+    def test_caches_symbols_as_requested(self):
+        api = _api({'SPY': 'SPY'})
+        cache = _cache()
+        translations = StreamerSymbolTranslationsFactory(api, cache).create(['spy'])
+        self.assertEqual(translations.get_streamer_symbol('spy'), 'SPY')
+        api.get.reset_mock()
+        StreamerSymbolTranslationsFactory(api, cache).create(['spy', 'SPY'])
+        api.get.assert_not_called()
+
+    def test_routes_symbols_to_one_endpoint_each(self):
+        api = _api({'SPY': 'SPY', '/ESU3': '/ESU23:XCME', 'BTC/USD': 'BTC/USD:CXTALP'})
+        translations = StreamerSymbolTranslationsFactory(api, _cache()).create(['SPY', '/ESU3', 'BTC/USD'])
+        self.assertEqual(translations.get_streamer_symbol('/ESU3'), '/ESU23:XCME')
+        self.assertEqual(translations.get_streamer_symbol('BTC/USD'), 'BTC/USD:CXTALP')
+        self.assertEqual(sorted(call.args[0] for call in api.get.call_args_list),
+                         ['/instruments/cryptocurrencies', '/instruments/equities', '/instruments/futures'])
+
+    def test_logs_symbols_without_streamer_symbols(self):
+        api = _api({'SPY': 'SPY'})
+        with self.assertLogs(level='WARNING') as logs:
+            translations = StreamerSymbolTranslationsFactory(api, _cache()).create(['SPY', 'FOO', 'BAR/USD'])
+        self.assertEqual(translations.items(), [('SPY', 'SPY')])
+        self.assertEqual(sorted(logs.output), [
+            'WARNING:root:No streamer symbols found at /instruments/cryptocurrencies for: BAR/USD',
+            'WARNING:root:No streamer symbols found at /instruments/equities for: FOO'
+        ])
+
+    def test_chunks_large_symbol_lists(self):
+        symbols = [f'SPY   230630C{i:08d}' for i in range(LOOKUP_CHUNK_SIZE * 2 + 1)]
+        api = _api({s: '.' + s for s in symbols})
+        translations = StreamerSymbolTranslationsFactory(api, _cache()).create(symbols)
+        self.assertEqual(len(translations.streamer_symbols), len(symbols))
+        self.assertEqual(api.get.call_count, 3)
+
+
+class InstrumentPathKeyTest(TestCase):
+    def test_instrument_path_key(self):
+        self.assertEqual(instrument_path_key('SPY'), 'equities')
+        self.assertEqual(instrument_path_key('BRK/B'), 'equities')
+        self.assertEqual(instrument_path_key('/ESU3'), 'futures')
+        self.assertEqual(instrument_path_key('SPY   230630C00255000'), 'equity-options')
+        self.assertEqual(instrument_path_key('BRK/B 230630P00300000'), 'equity-options')
+        self.assertEqual(instrument_path_key('./ESU3 EW2N3 230714C4310'), 'future-options')
+        self.assertEqual(instrument_path_key('BTC/USD'), 'cryptocurrencies')
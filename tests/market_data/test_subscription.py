@@ -1,11 +1,171 @@
+import gzip
+import os
+import tempfile
+import threading
+import time
+from typing import Callable
 from unittest import TestCase
 
-from tastytrade_sdk import Subscription
+from tastytrade_sdk import Subscription, ShardedSubscription, ReconnectPolicy, SubscriptionConfig, FrameRecorder
 from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.stats import SubscriptionStats
 from tastytrade_sdk.market_data.streamer_symbol_translation import StreamerSymbolTranslations
+from tastytrade_sdk.market_data.subscription import Handshake, LoopThread, StreamerDisconnected, StreamerException, \
+    StreamerTimeout
+from tests.market_data.dxlink_server import DxLinkServer
 
 
 class SubscriptionTest(TestCase):
     def test_requires_at_least_one_event_handler(self):
         with self.assertRaises(InvalidArgument):
-            Subscription('url', 'token', StreamerSymbolTranslations([]))
+            Subscription('url', 'token', StreamerSymbolTranslations([]), {})
+
+    def test_event_types_without_handlers(self):
+        subscription = Subscription('url', 'token', StreamerSymbolTranslations([]), {}, event_types=['Quote'],
+                                    config=SubscriptionConfig(latest_values=True))
+        self.assertIsNotNone(subscription.latest_values)
+
+
+class LoopThreadTest(TestCase):
+    def test_stop_interrupts_pause(self):
+        ticks = []
+        thread = LoopThread(lambda: ticks.append(1), timeout_seconds=60)
+        thread.stop()
+        thread.join(timeout=1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(ticks), 1)
+
+    def test_shared_stop_event(self):
+        stop_event = threading.Event()
+        thread = LoopThread(lambda: None, timeout_seconds=60, stop_event=stop_event)
+        stop_event.set()
+        thread.join(timeout=1)
+        self.assertFalse(thread.is_alive())
+
+
+class HandshakeTest(TestCase):
+    def test_wait_for_reached_state(self):
+        handshake = Handshake()
+        threading.Timer(0.01, lambda: handshake.reach(Handshake.AUTHORIZED)).start()
+        handshake.wait_for(Handshake.AUTHORIZED, 1)
+
+    def test_wait_for_times_out(self):
+        handshake = Handshake()
+        handshake.reach(Handshake.SETUP)
+        with self.assertRaises(StreamerTimeout):
+            handshake.wait_for(Handshake.CHANNEL_OPENED, 0.01)
+
+    def test_failure_after_reached_state(self):
+        handshake = Handshake()
+        handshake.reach(Handshake.CHANNEL_OPENED)
+        handshake.fail(StreamerDisconnected('done'))
+        handshake.wait_for(Handshake.CHANNEL_OPENED, 1)
+
+    def test_wait_for_raises_streamer_error(self):
+        handshake = Handshake()
+        handshake.fail(StreamerException('UNAUTHORIZED', 'bad token'))
+        with self.assertRaises(StreamerException):
+            handshake.wait_for(Handshake.AUTHORIZED, 1)
+
+
+class SubscriptionEndToEndTest(TestCase):
+    def setUp(self) -> None:
+        self.server = DxLinkServer(rate=2000).start()
+        self.translations = StreamerSymbolTranslations([('SPY', 'SPY'), ('/ESU3', '/ESU23:XCME')])
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def __wait_for(self, condition: Callable[[], bool]) -> None:
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, 'Timed out')
+            time.sleep(0.01)
+
+    def test_streams_events(self):
+        quotes = []
+        subscription = Subscription(self.server.url, 'token', self.translations, {'Quote': quotes.append},
+                                    config=SubscriptionConfig(latest_values=True)).open()
+        self.__wait_for(lambda: {q.symbol for q in quotes} == {'SPY', '/ESU3'})
+        subscription.close()
+        self.assertIsNotNone(subscription.latest_values.get('/ESU3', 'Quote'))
+
+    def test_add_and_remove_symbols(self):
+        trades = []
+        subscription = Subscription(self.server.url, 'token', self.translations, {'Trade': trades.append}).open()
+        subscription.remove_symbols(['SPY', '/ESU3'])
+        subscription.add_symbols(['/ESU3'])
+        count = len(trades)
+        self.__wait_for(lambda: len(trades) > count + 50)
+        subscription.close()
+        self.assertEqual({t.symbol for t in trades[-10:]}, {'/ESU3'})
+        subscriptions = [m for m in self.server.received if m['type'] == 'FEED_SUBSCRIPTION']
+        self.assertEqual(subscriptions[-2]['remove'], [{'symbol': 'SPY', 'type': 'Trade'},
+                                                       {'symbol': '/ESU23:XCME', 'type': 'Trade'}])
+        self.assertEqual(subscriptions[-1]['add'], [{'symbol': '/ESU23:XCME', 'type': 'Trade'}])
+
+    def test_reconnects_and_resubscribes(self):
+        quotes = []
+        resyncs = []
+        config = SubscriptionConfig(reconnect=ReconnectPolicy(initial_delay_seconds=0.01),
+                                    on_resync=lambda: resyncs.append(1))
+        subscription = Subscription(self.server.url, 'token', self.translations, {'Quote': quotes.append},
+                                    config=config).open()
+        self.__wait_for(lambda: quotes)
+        self.server.drop_connections()
+        self.__wait_for(lambda: resyncs)
+        self.assertTrue(subscription.connected)
+        count = len(quotes)
+        self.__wait_for(lambda: len(quotes) > count)
+        subscription.close()
+        self.assertEqual(len([m for m in self.server.received if m['type'] == 'AUTH']), 2)
+
+    def test_stats(self):
+        exported = []
+        config = SubscriptionConfig(on_stats=exported.append, reconnect=ReconnectPolicy(initial_delay_seconds=0.01))
+        subscription = Subscription(self.server.url, 'token', self.translations, {'Quote': lambda _: None},
+                                    config=config, stats=SubscriptionStats()).open()
+        self.__wait_for(lambda: subscription.stats()['events'].get('Quote', 0) > 10)
+        self.server.drop_connections()
+        self.__wait_for(lambda: subscription.stats()['reconnects'] == 1)
+        subscription.close()
+        stats = subscription.stats()
+        self.assertEqual(stats['disconnects'], 1)
+        self.assertGreater(stats['frames'], 0)
+        self.assertEqual(stats['decode_seconds']['count'], stats['frames'])
+        self.assertEqual(stats['handler_seconds']['Quote']['count'], stats['events']['Quote'])
+        self.assertEqual(stats['stale_symbols'], [])
+        self.assertEqual(len(exported), 1)
+
+    def test_close_completes_the_recording(self):
+        directory = tempfile.mkdtemp()
+        quotes = []
+        subscription = Subscription(self.server.url, 'token', self.translations, {'Quote': quotes.append},
+                                    config=SubscriptionConfig(recorder=FrameRecorder(directory))).open()
+        self.__wait_for(lambda: quotes)
+        subscription.close()
+        [segment] = os.listdir(directory)
+        with gzip.open(os.path.join(directory, segment), 'rt') as file:
+            self.assertIn('FEED_DATA', file.read())
+
+    def test_unauthorized(self):
+        self.server.token = 'other'
+        with self.assertRaises(StreamerTimeout):
+            Subscription(self.server.url, 'token', self.translations, {'Quote': print}).open(timeout_seconds=0.1)
+
+    def test_closed_during_handshake(self):
+        self.server.close_on_setup = 'go away'
+        started_at = time.monotonic()
+        with self.assertRaises(StreamerDisconnected) as context:
+            Subscription(self.server.url, 'token', self.translations, {'Quote': print}).open(timeout_seconds=5)
+        self.assertIn('go away', context.exception.message)
+        self.assertLess(time.monotonic() - started_at, 1)
+
+    def test_sharded(self):
+        translations = StreamerSymbolTranslations([(f'S{i}', f'S{i}') for i in range(20)])
+        symbols = set()
+        subscription = ShardedSubscription(self.server.url, 'token', translations, 3,
+                                           {'Greeks': lambda g: symbols.add(g.symbol)}).open()
+        self.__wait_for(lambda: len(symbols) == 20)
+        self.assertTrue(all(h.connected and h.events for h in subscription.health()))
+        subscription.close()
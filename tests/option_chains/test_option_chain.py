@@ -0,0 +1,121 @@
+import datetime as dt
+import importlib.util
+from unittest import TestCase, skipUnless
+
+from injector import Injector
+
+from tastytrade_sdk.config import Config
+from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.streamer_symbol_cache import StreamerSymbolCache
+
+try:
+    from tastytrade_sdk.option_chains.option_chain import OptionChain, OptionContract, CALL, PUT
+    from tastytrade_sdk.option_chains.option_chains import OptionChains
+except ImportError:
+    pass
+
+from tests.api_server import ApiServer
+from tests.market_data import events
+
+
+def _strike(expiration: str, strike: int, call: bool = True, put: bool = True) -> dict:
+    date = expiration.replace('-', '')[2:]
+    result = {'strike-price': f'{strike}.0'}
+    if call:
+        result.update({'call': f'SPY   {date}C{strike * 1000:08d}', 'call-streamer-symbol': f'.SPY{date}C{strike}'})
+    if put:
+        result.update({'put': f'SPY   {date}P{strike * 1000:08d}', 'put-streamer-symbol': f'.SPY{date}P{strike}'})
+    return result
+
+
+NESTED = {
+    'underlying-symbol': 'SPY', 'root-symbol': 'SPY', 'option-chain-type': 'Standard', 'shares-per-contract': 100,
+    'expirations': [
+        {'expiration-type': 'Regular', 'expiration-date': '2023-09-15', 'days-to-expiration': 60,
+         'settlement-type': 'PM', 'strikes': [_strike('2023-09-15', s) for s in (460, 440, 450)]},
+        {'expiration-type': 'Weekly', 'expiration-date': '2023-07-21', 'days-to-expiration': 4,
+         'settlement-type': 'PM', 'strikes': [_strike('2023-07-21', s) for s in range(430, 471, 5)]
+                                             + [_strike('2023-07-21', 475, put=False)]}
+    ]
+}
+JULY = dt.date(2023, 7, 21)
+SEPTEMBER = dt.date(2023, 9, 15)
+
+
+@skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+class OptionChainTest(TestCase):
+    def setUp(self) -> None:
+        self.chain = OptionChain.from_nested(NESTED)
+
+    def test_sorted_expirations_and_strikes(self):
+        self.assertEqual(self.chain.expirations, [JULY, SEPTEMBER])
+        self.assertEqual(list(self.chain.days_to_expiration), [4, 60])
+        self.assertEqual(list(self.chain.strikes(SEPTEMBER)), [440, 450, 460])
+        self.assertEqual(len(self.chain), 10 * 2 - 1 + 6)
+
+    def test_contract_lookups(self):
+        contract = self.chain.contract(SEPTEMBER, 450, PUT)
+        self.assertEqual(contract, OptionContract('SPY   230915P00450000', '.SPY230915P450', SEPTEMBER, 450.0, PUT))
+        self.assertEqual(self.chain.contract_of('SPY   230915P00450000'), contract)
+        self.assertIsNone(self.chain.contract(JULY, 475, PUT))
+        self.assertIsNone(self.chain.contract(JULY, 451, CALL))
+        with self.assertRaises(InvalidArgument):
+            self.chain.strikes(dt.date(2023, 7, 28))
+
+    def test_nearest_strike(self):
+        self.assertEqual(self.chain.nearest_strike(SEPTEMBER, 447), 450)
+        self.assertEqual(self.chain.nearest_strike(SEPTEMBER, 444), 440)
+        self.assertEqual(self.chain.nearest_strike(SEPTEMBER, 445), 440)
+        self.assertEqual(self.chain.nearest_strike(SEPTEMBER, 1000), 460)
+        self.assertEqual(self.chain.nearest_strike(SEPTEMBER, 1), 440)
+
+    def test_deltas(self):
+        self.assertIsNone(self.chain.nearest_delta(JULY, 0.25, CALL))
+        for strike, delta in ((440, 0.8), (445, 0.6), (450, 0.5), (455, 0.3), (460, 0.2)):
+            self.chain.update_greeks(events.greeks(self.chain.contract(JULY, strike, CALL).symbol, delta))
+        self.chain.update_greeks(events.greeks('AAPL  230721C00100000', 0.5))
+        self.assertEqual(self.chain.nearest_delta(JULY, 0.25, CALL).strike, 455)
+        self.assertEqual([c.strike for c in self.chain.delta_bucket(JULY, 0.2, 0.5, CALL)], [455, 460])
+        self.assertEqual(self.chain.delta_bucket(JULY, -0.5, 0, PUT), [])
+
+    def test_filter(self):
+        chain = self.chain.filter(max_days_to_expiration=30, price=451, strikes_around=2)
+        self.assertEqual(chain.expirations, [JULY])
+        self.assertEqual(list(chain.strikes(JULY)), [445, 450, 455, 460])
+        self.assertEqual(len(chain.symbols()), 8)
+        self.assertEqual(self.chain.filter(min_days_to_expiration=30).expirations, [SEPTEMBER])
+        # Filtered chains share their arrays with the chain they came from
+        chain.update_greeks(events.greeks(chain.contract(JULY, 450, CALL).symbol, 0.5))
+        self.assertEqual(self.chain.nearest_delta(JULY, 0.5, CALL).strike, 450)
+        with self.assertRaises(InvalidArgument):
+            self.chain.filter(price=450)
+
+    def test_streamer_symbol_translations(self):
+        translations = dict(self.chain.filter(min_days_to_expiration=30).streamer_symbol_translations())
+        self.assertEqual(translations['SPY   230915C00440000'], '.SPY230915C440')
+        self.assertEqual(len(translations), 6)
+
+
+@skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+class OptionChainsTest(TestCase):
+    def setUp(self) -> None:
+        self.server = ApiServer()
+        config = Config(api_base_url=self.server.url)
+        self.container = Injector(lambda binder: binder.bind(Config, to=config))
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_get_primes_streamer_symbol_cache(self):
+        weekly = {**NESTED, 'root-symbol': 'SPYW', 'expirations': []}
+        self.server.replies = [(200, {}, {'data': {'items': [weekly, NESTED]}})]
+        chain = self.container.get(OptionChains).get('SPY')
+        self.assertEqual(chain.root_symbol, 'SPY')
+        self.assertEqual(self.server.requests[0][1], '/option-chains/SPY/nested')
+        cached = self.container.get(StreamerSymbolCache).get_many(chain.symbols())
+        self.assertEqual(len(cached), len(chain))
+
+    def test_get_by_root_symbol(self):
+        self.server.replies = [(200, {}, {'data': {'items': [NESTED]}})]
+        with self.assertRaises(InvalidArgument):
+            self.container.get(OptionChains).get('SPY', root_symbol='SPYW')
@@ -0,0 +1,102 @@
+import datetime as dt
+import importlib.util
+import math
+from unittest import TestCase, skipUnless
+
+from tastytrade_sdk import Greeks, Quote
+from tastytrade_sdk.exceptions import InvalidArgument
+from tastytrade_sdk.market_data.models import Trade
+
+try:
+    from tastytrade_sdk.option_chains.option_chain import OptionChain
+    from tastytrade_sdk.option_chains.pricing import BLACK_76, ChainPricer, price_options
+except ImportError:
+    pass
+
+from tests.option_chains.test_option_chain import NESTED
+
+CALL_SYMBOL = 'SPY   230915C00450000'
+PUT_SYMBOL = 'SPY   230915P00450000'
+# 4 PM New York time, 30 days before the September expiration
+NOW = dt.datetime(2023, 8, 16, 20, 0, tzinfo=dt.timezone.utc)
+
+
+def _assert_matches(test: TestCase, prices: dict, greeks: Greeks, places: int = 4) -> None:
+    test.assertAlmostEqual(prices['delta'], greeks.delta, places)
+    test.assertAlmostEqual(prices['gamma'], greeks.gamma, places)
+    test.assertAlmostEqual(prices['theta'], greeks.theta, places)
+    test.assertAlmostEqual(prices['vega'], greeks.vega, places)
+    test.assertAlmostEqual(prices['rho'], greeks.rho, places)
+
+
+def _first(prices) -> dict:
+    return {field: float(values.flat[0]) for field, values in zip(prices._fields, prices)}
+
+
+@skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+class PriceOptionsTest(TestCase):
+    def test_black_scholes(self):
+        call, put = price_options(100, 100, 1, 0.2, [True, False], rate=0.05).price
+        self.assertAlmostEqual(call, 10.4506, 4)
+        self.assertAlmostEqual(put, 5.5735, 4)
+        prices = _first(price_options(100, 100, 1, 0.2, True, rate=0.05))
+        _assert_matches(self, prices, Greeks('X', 0, 10.4506, 0.2, 0.6368, 0.018762, -6.414028 / 365, 0.532325,
+                                             0.375240))
+
+    def test_black_scholes_put_greeks(self):
+        prices = _first(price_options(49, 50, 0.3846, 0.2, False, rate=0.05))
+        self.assertAlmostEqual(prices['price'], 2.4005 - 49 + 50 * math.exp(-0.05 * 0.3846), 4)
+        self.assertAlmostEqual(prices['delta'], 0.5216 - 1, 4)
+        self.assertAlmostEqual(prices['gamma'], 0.0655, 4)
+        self.assertAlmostEqual(prices['vega'], 0.121, 3)
+
+    def test_black_76(self):
+        prices = _first(price_options(20, 20, 4 / 12, 0.25, False, rate=0.09, model=BLACK_76))
+        self.assertAlmostEqual(prices['price'], 1.1166, 4)
+        self.assertAlmostEqual(prices['rho'], -4 / 12 * prices['price'] / 100)
+
+    def test_nan_volatility(self):
+        prices = price_options(100, [90, 100], 1, [0.2, math.nan], True)
+        self.assertFalse(math.isnan(prices.price[0]))
+        self.assertTrue(math.isnan(prices.price[1]))
+        with self.assertRaises(InvalidArgument):
+            price_options(100, 100, 1, 0.2, True, model='binomial')
+
+
+@skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+class ChainPricerTest(TestCase):
+    def setUp(self) -> None:
+        self.repriced = []
+        self.pricer = ChainPricer(OptionChain.from_nested(NESTED), rate=0.05, on_prices=self.repriced.append)
+
+    def test_reprices_from_seeded_volatilities(self):
+        greeks = Greeks(CALL_SYMBOL, 0, 8.0, 0.15, 0.5, 0.02, -0.1, 0.2, 0.5)
+        self.pricer.update_greeks(greeks)
+        self.pricer.update_greeks(Greeks('QQQ', 0, 1.0, 0.5, 0.5, 0.0, 0.0, 0.0, 0.0))
+        prices = self.pricer.reprice(450, NOW)
+        self.assertEqual(len(prices.price), len(self.pricer.symbols))
+        self.assertEqual(sum(not math.isnan(p) for p in prices.price), 1)
+        expected = _first(price_options(450, 450, 30 / 365, 0.15, True, rate=0.05))
+        self.assertEqual(self.pricer.greeks(CALL_SYMBOL), expected)
+        self.assertEqual(len(self.repriced), 1)
+
+    def test_matches_greeks_events(self):
+        # Greeks of S=452, K=450, T=30/365, r=0.05 and σ=0.18, as the feed would send them
+        events = [Greeks(CALL_SYMBOL, 0, 11.3142, 0.18, 0.575883, 0.016793, -0.186383, 0.204645, 0.507586),
+                  Greeks(PUT_SYMBOL, 0, 7.4687, 0.18, -0.424117, 0.016793, -0.124992, -0.163701, 0.507586)]
+        for greeks in events:
+            self.pricer.update_greeks(greeks)
+        self.pricer.reprice(452, NOW)
+        for greeks in events:
+            prices = self.pricer.greeks(greeks.symbol)
+            self.assertAlmostEqual(prices['price'], greeks.price, 3)
+            _assert_matches(self, prices, greeks)
+
+    def test_underlying_events(self):
+        self.pricer.update_quote(Quote('QQQ', 370.0, 1.0, 'Q', 370.1, 1.0, 'Q'))
+        self.assertIsNone(self.pricer.prices())
+        self.pricer.update_quote(Quote('SPY', 449.9, 1.0, 'Q', 450.1, 1.0, 'Q'))
+        self.assertAlmostEqual(self.pricer.underlying_price, 450.0)
+        self.pricer.update_trade(Trade('SPY', 'SPY', 0, 0, 'Q', 451.0, 0.0, 1, False, 0, 0, 0.0))
+        self.assertEqual(self.pricer.underlying_price, 451.0)
+        self.assertEqual(len(self.repriced), 2)
@@ -0,0 +1,204 @@
+import time
+from typing import List
+from unittest import TestCase
+
+from injector import Injector
+
+from tastytrade_sdk import CachePolicy, HttpConfig
+from tastytrade_sdk.api import Api, BadRequest, RequestsSession, ServerError, TooManyRequests
+from tastytrade_sdk.config import Config
+from tests.api_server import ApiServer, Reply
+
+
+class RequestsSessionTest(TestCase):
+    def setUp(self) -> None:
+        self.server = ApiServer()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def session(self, **http) -> RequestsSession:
+        config = Config(api_base_url=self.server.url, http=HttpConfig(backoff_seconds=0.001, **http))
+        return Injector(lambda binder: binder.bind(Config, to=config)).get(RequestsSession)
+
+    def test_retries_idempotent_requests_on_server_errors(self):
+        self.server.replies = [(503, {}, {}), (502, {}, {})]
+        self.assertEqual(self.session().request('GET', '/accounts'), {'data': {}})
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_does_not_retry_posts_on_server_errors(self):
+        self.server.replies = [(503, {}, {})]
+        with self.assertRaises(ServerError):
+            self.session().request('POST', '/orders', data={})
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_gives_up_after_max_retries(self):
+        self.server.replies = [(503, {}, {})] * 3
+        with self.assertRaises(ServerError):
+            self.session(max_retries=2).request('GET', '/accounts')
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_waits_for_retry_after(self):
+        self.server.replies = [(429, {'Retry-After': '1'}, {})]
+        started_at = time.monotonic()
+        self.session().request('POST', '/orders', data={})
+        self.assertGreaterEqual(time.monotonic() - started_at, 1)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_gives_up_on_long_retry_after(self):
+        self.server.replies = [(429, {'Retry-After': '120'}, {})]
+        with self.assertRaises(TooManyRequests):
+            self.session().request('GET', '/accounts')
+
+    def test_sessions_are_per_instance(self):
+        first, second = self.session(), self.session()
+        self.server.replies = [(201, {}, {'data': {'session-token': 'first', 'remember-token': 'r'}}),
+                               (201, {}, {'data': {'session-token': 'second', 'remember-token': 'r'}})]
+        first.login('first', 'password')
+        second.login('second', 'password')
+        first.request('GET', '/accounts')
+        second.request('GET', '/accounts')
+        self.assertEqual([r[2].get('Authorization') for r in self.server.requests[2:]], ['first', 'second'])
+
+    def test_records_every_attempt(self):
+        self.server.replies = [(503, {}, {})]
+        session = self.session()
+        session.request('GET', '/accounts')
+        self.assertEqual({status: h['count'] for status, h in session.stats()['GET /accounts'].items()},
+                         {'503': 1, '200': 1})
+
+
+def _page(items: List[int], page_offset: int, total_pages: int) -> Reply:
+    return 200, {}, {'data': {'items': items},
+                     'pagination': {'per-page': 2, 'page-offset': page_offset, 'total-pages': total_pages}}
+
+
+class PaginateTest(TestCase):
+    def setUp(self) -> None:
+        self.server = ApiServer()
+        config = Config(api_base_url=self.server.url)
+        self.api = Injector(lambda binder: binder.bind(Config, to=config)).get(Api)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_yields_items_across_pages(self):
+        self.server.replies = [_page([1, 2], 0, 3), _page([3, 4], 1, 3), _page([5], 2, 3)]
+        items = list(self.api.paginate('/transactions', {'per-page': 10, 'type': 'Trade'}, per_page=2))
+        self.assertEqual(items, [1, 2, 3, 4, 5])
+        self.assertEqual([path for _, path, _ in self.server.requests], [
+            f'/transactions?type=Trade&per-page=2&page-offset={i}' for i in range(3)
+        ])
+
+    def test_prefetches_next_page(self):
+        self.server.replies = [_page([1, 2], 0, 2), _page([3], 1, 2)]
+        items = self.api.paginate('/transactions', per_page=2)
+        self.assertEqual(next(items), 1)
+        deadline = time.monotonic() + 5
+        while len(self.server.requests) < 2:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.assertEqual(list(items), [2, 3])
+
+    def test_without_prefetch(self):
+        self.server.replies = [_page([1, 2], 0, 2), _page([3], 1, 2)]
+        items = self.api.paginate('/transactions', per_page=2, prefetch=False)
+        self.assertEqual(next(items), 1)
+        time.sleep(0.05)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(list(items), [2, 3])
+
+    def test_stops_fetching_when_closed(self):
+        self.server.replies = [_page([1, 2], 0, 5), _page([3, 4], 1, 5), _page([5, 6], 2, 5)]
+        items = self.api.paginate('/transactions', per_page=2)
+        self.assertEqual([next(items), next(items), next(items)], [1, 2, 3])
+        items.close()
+        self.assertLessEqual(len(self.server.requests), 3)
+
+    def test_unpaginated_response(self):
+        self.server.replies = [(200, {}, {'data': {'items': [1, 2]}})]
+        self.assertEqual(list(self.api.paginate('/accounts')), [1, 2])
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.server = ApiServer()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def api(self, *policies: CachePolicy) -> Api:
+        config = Config(api_base_url=self.server.url, response_cache=list(policies))
+        return Injector(lambda binder: binder.bind(Config, to=config)).get(Api)
+
+    def test_caches_matching_paths(self):
+        api = self.api(CachePolicy('/instruments/*'))
+        self.server.replies = [(200, {}, {'data': {'symbol': 'SPY'}})]
+        first = api.get('/instruments/equities/SPY')
+        first['data']['symbol'] = 'modified'
+        self.assertEqual(api.get('/instruments/equities/SPY'), {'data': {'symbol': 'SPY'}})
+        api.get('/instruments/equities', [('symbol[]', 'SPY')])
+        api.get('/accounts')
+        api.get('/accounts')
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(api.cache_stats()['/instruments/*'],
+                         {'hits': 1, 'misses': 2, 'revalidations': 0, 'evictions': 0, 'entries': 2})
+
+    def test_expires(self):
+        api = self.api(CachePolicy('/instruments/*', ttl_seconds=0.01, revalidate=False))
+        api.get('/instruments/equities/SPY')
+        time.sleep(0.02)
+        api.get('/instruments/equities/SPY')
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_evicts_least_recently_used(self):
+        api = self.api(CachePolicy('/instruments/*', max_entries=2))
+        for symbol in ('SPY', 'AAPL', 'SPY', 'QQQ', 'SPY', 'AAPL'):
+            api.get(f'/instruments/equities/{symbol}')
+        self.assertEqual([path for _, path, _ in self.server.requests], [
+            '/instruments/equities/SPY', '/instruments/equities/AAPL', '/instruments/equities/QQQ',
+            '/instruments/equities/AAPL'
+        ])
+        self.assertEqual(api.cache_stats()['/instruments/*']['evictions'], 2)
+
+    def test_revalidates_with_etag(self):
+        api = self.api(CachePolicy('/option-chains/*', ttl_seconds=0.01))
+        self.server.replies = [(200, {'ETag': '"v1"'}, {'data': {'items': [1]}}), (304, {}, None)]
+        api.get('/option-chains/SPY/nested')
+        time.sleep(0.02)
+        self.assertEqual(api.get('/option-chains/SPY/nested'), {'data': {'items': [1]}})
+        self.assertEqual(self.server.requests[1][2]['If-None-Match'], '"v1"')
+        self.assertEqual(api.cache_stats()['/option-chains/*']['revalidations'], 1)
+        api.get('/option-chains/SPY/nested')
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_writes_invalidate(self):
+        api = self.api(CachePolicy('/accounts/*'))
+        api.get('/accounts/1/orders')
+        api.get('/accounts/1/orders/2')
+        api.get('/accounts/1/positions')
+        api.post('/accounts/1/orders', data={})
+        for path in ('/accounts/1/orders', '/accounts/1/orders/2', '/accounts/1/positions'):
+            api.get(path)
+        self.assertEqual(len(self.server.requests), 6)
+
+    def test_does_not_cache_errors(self):
+        api = self.api(CachePolicy('/instruments/*'))
+        self.server.replies = [(400, {}, {})]
+        with self.assertRaises(BadRequest):
+            api.get('/instruments/equities/SPY')
+        api.get('/instruments/equities/SPY')
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_cleared_when_the_session_changes(self):
+        config = Config(api_base_url=self.server.url, response_cache=[CachePolicy('/instruments/*')])
+        container = Injector(lambda binder: binder.bind(Config, to=config))
+        session, api = container.get(RequestsSession), container.get(Api)
+        api.get('/instruments/equities/SPY')
+        self.server.replies = [(201, {}, {'data': {'session-token': 'token'}})]
+        session.login('trader', 'password', remember_me=False)
+        api.get('/instruments/equities/SPY')
+        session.logout()
+        api.get('/instruments/equities/SPY')
+        self.assertEqual([path for _, path, _ in self.server.requests if path.startswith('/instruments')],
+                         ['/instruments/equities/SPY'] * 3)
@@ -0,0 +1,67 @@
+import asyncio
+import importlib.util
+import time
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from injector import Injector
+
+from tastytrade_sdk import AsyncApi, HttpConfig
+from tastytrade_sdk.api import BadRequest, RequestsSession, ServerError
+from tastytrade_sdk.config import Config
+from tests.api_server import ApiServer
+
+
+@skipUnless(importlib.util.find_spec('httpx'), 'requires httpx')
+class AsyncApiTest(TestCase):
+    def setUp(self) -> None:
+        self.server = ApiServer()
+        config = Config(api_base_url=self.server.url, http=HttpConfig(backoff_seconds=0.001, max_concurrent_requests=4))
+        container = Injector(lambda binder: binder.bind(Config, to=config))
+        self.session = container.get(RequestsSession)
+        self.api = container.get(AsyncApi)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def run_async(self, coroutine):
+        async def run():
+            async with self.api:
+                return await coroutine()
+        return asyncio.run(run())
+
+    def test_gather(self):
+        results = self.run_async(lambda: asyncio.gather(*[self.api.get(f'/accounts/{i}/balances') for i in range(20)]))
+        self.assertEqual(results, [{'data': {}}] * 20)
+        self.assertEqual(sorted(path for _, path, _ in self.server.requests),
+                         sorted(f'/accounts/{i}/balances' for i in range(20)))
+
+    def test_params_and_login(self):
+        self.server.replies = [(201, {}, {'data': {'session-token': 'token', 'remember-token': 'r'}})]
+        self.session.login('trader', 'password')
+        self.run_async(lambda: self.api.get('/instruments/equities', [('symbol[]', 'SPY'), ('symbol[]', 'AAPL')]))
+        _, path, headers = self.server.requests[-1]
+        self.assertEqual(path, '/instruments/equities?symbol[]=SPY&symbol[]=AAPL')
+        self.assertEqual(headers['Authorization'], 'token')
+
+    def test_error_mapping_and_retries(self):
+        self.server.replies = [(503, {}, {}), (400, {}, {})]
+        with self.assertRaises(BadRequest):
+            self.run_async(lambda: self.api.get('/accounts'))
+        self.server.replies = [(500, {}, {})]
+        with self.assertRaises(ServerError):
+            self.run_async(lambda: self.api.post('/orders', data={}))
+
+    def test_rate_limit_holds_off_requests(self):
+        self.server.replies = [(429, {'Retry-After': '1'}, {})]
+        started_at = time.monotonic()
+        self.run_async(lambda: asyncio.gather(self.api.get('/a'), self.api.get('/b')))
+        self.assertGreaterEqual(time.monotonic() - started_at, 1)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_closes_the_client_of_an_earlier_loop(self):
+        with patch('httpx.AsyncClient.aclose', autospec=True) as aclose:
+            asyncio.run(self.api.get('/a'))
+            asyncio.run(self.api.get('/b'))
+            aclose.assert_called_once()
+        asyncio.run(self.api.aclose())
@@ -0,0 +1,93 @@
+import threading
+from unittest import TestCase
+
+from tastytrade_sdk.instrumentation import Histogram, RequestStats, Exporter, route
+
+
+class HistogramTest(TestCase):
+    def test_empty(self):
+        snapshot = Histogram().snapshot()
+        self.assertEqual(snapshot['count'], 0)
+        self.assertIsNone(snapshot['p50'])
+        self.assertIsNone(snapshot['mean'])
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for _ in range(90):
+            histogram.observe(0.000_003)
+        for _ in range(10):
+            histogram.observe(0.5)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 100)
+        self.assertEqual(snapshot['max'], 0.5)
+        self.assertAlmostEqual(snapshot['mean'], (90 * 0.000_003 + 10 * 0.5) / 100)
+        self.assertEqual(snapshot['p50'], 0.000_004)
+        self.assertEqual(snapshot['p90'], 0.000_004)
+        self.assertEqual(snapshot['p99'], 0.5)
+        self.assertEqual(sum(snapshot['buckets'].values()), 100)
+
+    def test_beyond_last_bound(self):
+        histogram = Histogram()
+        histogram.observe(100)
+        self.assertEqual(histogram.snapshot()['p99'], 100)
+
+
+class RequestStatsTest(TestCase):
+    def test_per_endpoint_and_status(self):
+        stats = RequestStats()
+        stats.observe('GET', '/accounts', '200', 0.1)
+        stats.observe('GET', '/accounts', '200', 0.2)
+        stats.observe('GET', '/accounts', '429', 0.1)
+        stats.observe('POST', '/sessions', 'error', 1)
+        snapshot = stats.snapshot()
+        self.assertEqual(set(snapshot), {'GET /accounts', 'POST /sessions'})
+        self.assertEqual(snapshot['GET /accounts']['200']['count'], 2)
+        self.assertEqual(snapshot['GET /accounts']['429']['count'], 1)
+        self.assertEqual(snapshot['POST /sessions']['error']['max'], 1)
+
+    def test_keyed_by_route(self):
+        stats = RequestStats()
+        stats.observe('GET', '/accounts/5WX01234/orders/987', '200', 0.1)
+        stats.observe('GET', '/accounts/5WX05678/orders/654', '200', 0.1)
+        self.assertEqual(set(stats.snapshot()), {'GET /accounts/{id}/orders/{id}'})
+
+
+class RouteTest(TestCase):
+    def test_replaces_ids_and_symbols(self):
+        self.assertEqual(route('/instruments/equities/AAPL'), '/instruments/equities/{id}')
+        self.assertEqual(route('/instruments/cryptocurrencies/BTC%2FUSD'), '/instruments/cryptocurrencies/{id}')
+        self.assertEqual(route('/option-chains/SPY/nested'), '/option-chains/{id}/nested')
+        self.assertEqual(route('/market-metrics?symbols=SPY,QQQ'), '/market-metrics')
+        self.assertEqual(route('/customers/me/accounts'), '/customers/me/accounts')
+
+    def test_replaces_names(self):
+        self.assertEqual(route('/watchlists/tech'), '/watchlists/{id}')
+        self.assertEqual(route('/symbols/search/spy'), '/symbols/search/{id}')
+
+
+class ExporterTest(TestCase):
+    def test_exports_periodically_and_on_stop(self):
+        exported = []
+        exported_twice = threading.Event()
+
+        def hook(stats):
+            exported.append(stats)
+            if len(exported) == 2:
+                exported_twice.set()
+
+        exporter = Exporter(lambda: {'n': len(exported)}, hook, 0.01).start()
+        self.assertTrue(exported_twice.wait(1))
+        exporter.stop()
+        count = len(exported)
+        self.assertEqual(exported[-1], {'n': count - 1})
+
+    def test_survives_failing_hook(self):
+        calls = []
+
+        def hook(stats):
+            calls.append(stats)
+            raise ValueError()
+
+        exporter = Exporter(dict, hook, 60).start()
+        exporter.stop()
+        self.assertEqual(calls, [{}])